@@ -0,0 +1,95 @@
+"""
+Async authentication routes, served instead of app.api.auth when DATABASE_ASYNC is set.
+"""
+from fastapi import APIRouter, Depends, HTTPException, status
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.db.database import get_async_db
+from app.schemas.user import UserCreate, UserResponse, UserLogin, Token
+from app.services.user_service import AsyncUserService
+from app.core.security import create_access_token, create_refresh_token, decode_token
+
+router = APIRouter(prefix="/auth", tags=["Authentication"])
+
+
+@router.post("/register", response_model=UserResponse, status_code=status.HTTP_201_CREATED)
+async def register(user_data: UserCreate, db: AsyncSession = Depends(get_async_db)):
+    """
+    Register a new user.
+
+    - **email**: Valid email address (unique)
+    - **username**: Username (unique, 3-50 characters)
+    - **password**: Password (minimum 8 characters)
+    """
+    return await AsyncUserService.create_user(db, user_data)
+
+
+@router.post("/login", response_model=Token)
+async def login(user_data: UserLogin, db: AsyncSession = Depends(get_async_db)):
+    """
+    Authenticate user and return access and refresh tokens.
+
+    - **username**: User's username
+    - **password**: User's password
+
+    Returns JWT access token (expires in 30 minutes) and refresh token (expires in 7 days).
+    """
+    user = await AsyncUserService.authenticate_user(db, user_data.username, user_data.password)
+
+    access_token = create_access_token(data={"sub": user.id})
+    refresh_token = create_refresh_token(data={"sub": user.id})
+
+    return {
+        "access_token": access_token,
+        "refresh_token": refresh_token,
+        "token_type": "bearer",
+    }
+
+
+@router.post("/refresh", response_model=Token)
+async def refresh_token(refresh_token: str, db: AsyncSession = Depends(get_async_db)):
+    """
+    Refresh access token using a valid refresh token.
+
+    - **refresh_token**: Valid refresh token
+
+    Returns a new access token and refresh token.
+    """
+    payload = decode_token(refresh_token)
+    if payload is None or payload.get("type") != "refresh":
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid refresh token",
+        )
+
+    user_id_str = payload.get("sub")
+    if user_id_str is None:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid refresh token",
+        )
+
+    # Convert sub from string to int (JWT spec requires string)
+    try:
+        user_id = int(user_id_str)
+    except (ValueError, TypeError):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid user ID in token",
+        )
+
+    user = await AsyncUserService.get_user_by_id(db, user_id)
+
+    if not user.is_active:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Inactive user",
+        )
+
+    new_access_token = create_access_token(data={"sub": user.id})
+    new_refresh_token = create_refresh_token(data={"sub": user.id})
+
+    return {
+        "access_token": new_access_token,
+        "refresh_token": new_refresh_token,
+        "token_type": "bearer",
+    }
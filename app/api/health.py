@@ -2,6 +2,13 @@ from fastapi import APIRouter, Depends
 from sqlalchemy.orm import Session
 from app.db.database import get_db
 from sqlalchemy import text
+from app.core.hashing import password_hasher
+from app.core.compression import compression_stats
+from app.core.fast_json import photo_fragment_cache
+from app.core.response_cache import photo_response_cache
+from app.core.security import token_cache
+from app.core.user_cache import user_cache
+from app.services.count_service import CountService
 
 router = APIRouter(prefix="/health", tags=["Health"])
 
@@ -28,3 +35,21 @@ def database_health_check(db: Session = Depends(get_db)):
         return {"status": "healthy", "database": "connected"}
     except Exception as e:
         return {"status": "unhealthy", "database": "disconnected", "error": str(e)}
+
+
+@router.get("/metrics")
+def metrics():
+    """
+    In-process cache metrics.
+
+    Returns size and hit/miss counters for this worker's caches.
+    """
+    return {
+        "token_cache": token_cache.stats(),
+        "user_cache": user_cache.stats(),
+        "password_hasher": password_hasher.stats(),
+        "total_count_cache": CountService.stats(),
+        "photo_response_cache": photo_response_cache.stats(),
+        "photo_fragment_cache": photo_fragment_cache.stats(),
+        "compression": compression_stats.stats(),
+    }
@@ -0,0 +1,76 @@
+from fastapi import APIRouter, Depends, Query
+from typing import Optional
+from app.api.sessions import DatabaseSession, RequestSessions
+from app.schemas.photographer import PhotographerList, PhotographerResponse
+from app.services.photographer_service import PhotographerService
+from app.core.user_cache import AuthenticatedUser
+from app.core.config import settings
+
+
+def build_router(sessions: RequestSessions) -> APIRouter:
+    """Photographer routes served over the given sync or async request sessions."""
+    router = APIRouter(prefix="/photographers", tags=["Photographers"])
+
+    @router.get("/", response_model=PhotographerList)
+    async def list_photographers(
+        page: int = Query(1, ge=1, description="Page number"),
+        page_size: int = Query(
+            settings.DEFAULT_PAGE_SIZE,
+            ge=1,
+            le=settings.MAX_PAGE_SIZE,
+            description="Number of items per page",
+        ),
+        sort: str = Query(
+            "photo_count",
+            pattern="^(photo_count|latest|name)$",
+            description="Sort order: most photos, most recent photo, or name",
+        ),
+        name: Optional[str] = Query(None, description="Filter by photographer name"),
+        db: DatabaseSession = Depends(sessions.get_db),
+        current_user: AuthenticatedUser = Depends(sessions.get_current_user),
+    ):
+        """
+        List photographers with photo counts and dimension stats.
+
+        - **page**: Page number (default: 1)
+        - **page_size**: Number of items per page (default: 20, max: 100)
+        - **sort**: `photo_count` (default, most photos first), `latest` (most
+          recent photo first) or `name`
+        - **name**: Filter by photographer name
+
+        Served from the photographer_stats summary table, which photo writes
+        keep up to date, so no query scans the photos table.
+
+        Requires authentication.
+        """
+        photographers, total = await sessions.run(
+            db,
+            PhotographerService.list_photographers,
+            skip=(page - 1) * page_size,
+            limit=page_size,
+            sort=sort,
+            name=name,
+        )
+        return {
+            "total": total,
+            "page": page,
+            "page_size": page_size,
+            "photographers": photographers,
+        }
+
+    @router.get("/{photographer_id}", response_model=PhotographerResponse)
+    async def get_photographer(
+        photographer_id: int,
+        db: DatabaseSession = Depends(sessions.get_db),
+        current_user: AuthenticatedUser = Depends(sessions.get_current_user),
+    ):
+        """
+        Get a photographer's photo count, latest photo time and dimension stats.
+
+        - **photographer_id**: Photographer ID
+
+        Requires authentication.
+        """
+        return await sessions.run(db, PhotographerService.get_photographer, photographer_id)
+
+    return router
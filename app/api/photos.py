@@ -1,178 +1,484 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+"""
+Photo routes, built once for both the sync and the async request path.
+
+main.py builds the router over app.api.sessions.SYNC_SESSIONS, or over
+ASYNC_SESSIONS when DATABASE_ASYNC is set.
+"""
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status, Query
+from fastapi.responses import JSONResponse, StreamingResponse
+from pydantic_core import to_json
 from sqlalchemy.orm import Session
-from typing import Optional
-from app.db.database import get_db
-from app.schemas.photo import PhotoCreate, PhotoResponse, PhotoUpdate, PhotoList, PhotoFilter
-from app.services.photo_service import PhotoService
-from app.core.dependencies import get_current_user, get_current_admin_user
-from app.models.user import User
+from typing import List, Optional, Tuple
+from app.api.sessions import DatabaseSession, RequestSessions
+from app.schemas.photo import (
+    PhotoBatch,
+    PhotoBulkCreate,
+    PhotoBulkDelete,
+    PhotoBulkResult,
+    PhotoBulkUpdate,
+    PhotoCreate,
+    PhotoFilter,
+    PhotoList,
+    PhotoResponse,
+    PhotoSimilarColor,
+    PhotoUpdate,
+)
+from app.services.photo_service import PhotoService, BulkOutcome
+from app.services.export_service import EXPORT_MEDIA_TYPES
+from app.core.dependencies import (
+    get_photo_fields,
+    get_photo_filters,
+    get_photo_ids,
+)
+from app.core.user_cache import AuthenticatedUser
 from app.core.config import settings
+from app.core.fast_json import fast_json_enabled
+from app.core.http_cache import cache_headers, conditional_response, photo_etag
+from app.core.projection import project, render_photo_batch
+from app.core.response_cache import (
+    CachedResponse,
+    cached_response,
+    photo_response_cache,
+    render_color_matches,
+    render_photo_list,
+)
 
-router = APIRouter(prefix="/photos", tags=["Photos"])
+# Serve list and batch bodies from cached per-photo JSON fragments
+FAST_JSON = fast_json_enabled("photos")
 
 
-@router.post(
-    "/",
-    response_model=PhotoResponse,
-    status_code=status.HTTP_201_CREATED,
-    dependencies=[Depends(get_current_admin_user)],
-)
-def create_photo(photo_data: PhotoCreate, db: Session = Depends(get_db)):
-    """
-    Create a new photo (Admin only).
-
-    Requires admin authentication.
-    """
-    return PhotoService.create_photo(db, photo_data)
-
-
-@router.get("/", response_model=PhotoList)
-def list_photos(
-    page: int = Query(1, ge=1, description="Page number"),
-    page_size: int = Query(
-        settings.DEFAULT_PAGE_SIZE,
-        ge=1,
-        le=settings.MAX_PAGE_SIZE,
-        description="Number of items per page",
-    ),
-    photographer: Optional[str] = Query(None, description="Filter by photographer name"),
-    min_width: Optional[int] = Query(None, ge=0, description="Minimum width"),
-    max_width: Optional[int] = Query(None, ge=0, description="Maximum width"),
-    min_height: Optional[int] = Query(None, ge=0, description="Minimum height"),
-    max_height: Optional[int] = Query(None, ge=0, description="Maximum height"),
-    search: Optional[str] = Query(None, description="Search in alt text and photographer"),
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
-):
-    """
-    List all photos with pagination and optional filtering.
-
-    - **page**: Page number (default: 1)
-    - **page_size**: Number of items per page (default: 20, max: 100)
-    - **photographer**: Filter by photographer name
-    - **min_width**: Filter by minimum width
-    - **max_width**: Filter by maximum width
-    - **min_height**: Filter by minimum height
-    - **max_height**: Filter by maximum height
-    - **search**: Search in alt text and photographer name
-
-    Requires authentication.
-    """
-    skip = (page - 1) * page_size
-
-    filters = PhotoFilter(
-        photographer=photographer,
-        min_width=min_width,
-        max_width=max_width,
-        min_height=min_height,
-        max_height=max_height,
-        search=search,
+def _bulk_response(outcome: BulkOutcome):
+    """Return bulk results, as 409 when an atomic request was not applied."""
+    if not outcome.applied:
+        return JSONResponse(status_code=status.HTTP_409_CONFLICT, content=outcome.as_response())
+    return outcome.as_response()
+
+
+def build_router(sessions: RequestSessions) -> APIRouter:
+    """Photo routes served over the given sync or async request sessions."""
+    router = APIRouter(prefix="/photos", tags=["Photos"])
+
+    @router.post(
+        "/",
+        response_model=PhotoResponse,
+        status_code=status.HTTP_201_CREATED,
+        dependencies=[Depends(sessions.get_current_admin_user)],
     )
+    async def create_photo(
+        photo_data: PhotoCreate, db: DatabaseSession = Depends(sessions.get_db)
+    ):
+        """
+        Create a new photo (Admin only).
 
-    photos, total = PhotoService.get_photos(db, skip=skip, limit=page_size, filters=filters)
+        Requires admin authentication.
+        """
+        return await sessions.run(db, PhotoService.create_photo, photo_data)
 
-    return {
-        "total": total,
-        "page": page,
-        "page_size": page_size,
-        "photos": photos,
-    }
+    @router.get("/", response_model=PhotoList)
+    async def list_photos(
+        request: Request,
+        page: int = Query(1, ge=1, description="Page number"),
+        page_size: int = Query(
+            settings.DEFAULT_PAGE_SIZE,
+            ge=1,
+            le=settings.MAX_PAGE_SIZE,
+            description="Number of items per page",
+        ),
+        filters: PhotoFilter = Depends(get_photo_filters),
+        cursor: Optional[str] = Query(
+            None, description="Opaque cursor from a previous response (overrides page)"
+        ),
+        include_total: bool = Query(True, description="Compute the total number of matches"),
+        sort: str = Query(
+            "created_at",
+            pattern="^(created_at|id|width|height|megapixels|relevance)$",
+            description="Sort column, or search relevance",
+        ),
+        order: str = Query("desc", pattern="^(asc|desc)$", description="Sort direction"),
+        fields: Optional[Tuple[str, ...]] = Depends(get_photo_fields),
+        db: DatabaseSession = Depends(sessions.get_db),
+        current_user: AuthenticatedUser = Depends(sessions.get_current_user),
+    ):
+        """
+        List all photos with pagination and optional filtering.
 
+        - **page**: Page number (default: 1)
+        - **page_size**: Number of items per page (default: 20, max: 100)
+        - **photographer**: Filter by photographer name
+        - **min_width**: Filter by minimum width
+        - **max_width**: Filter by maximum width
+        - **min_height**: Filter by minimum height
+        - **max_height**: Filter by maximum height
+        - **search**: Search in alt text and photographer name
+        - **orientation**: `landscape`, `portrait` or `square`
+        - **aspect_ratio**: Width to height ratio as `W:H` or a number, e.g. `16:9`
+          (matched within 1%)
+        - **min_ratio** / **max_ratio**: Filter by width / height
+        - **min_megapixels** / **max_megapixels**: Filter by image size
+        - **color**: Only photos whose average colour is close to this hex colour,
+          e.g. `#3A5F8B`
+        - **tolerance**: Largest RGB distance from `color` (0-442, default: 40)
+        - **cursor**: `next_cursor` from a previous response; fetches the following
+          page without an OFFSET scan (page is ignored)
+        - **include_total**: Set to false to skip computing `total`
+        - **sort**: `created_at` (default), `id`, `width`, `height`, `megapixels`,
+          or `relevance` (requires `search`, page-based pagination only)
+        - **order**: `desc` (default) or `asc`; relevance is always best first.
+          Cursors only continue the sort and order they were issued for
+        - **fields**: Comma-separated fields to return, e.g. `id,src_medium,alt`
+          (default: all; `id` is always included)
 
-@router.get("/{photo_id}", response_model=PhotoResponse)
-def get_photo(
-    photo_id: int,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
-):
-    """
-    Get a specific photo by ID.
+        Responses carry an ETag derived from the query and the rows on the page;
+        send it back in If-None-Match to get 304 Not Modified. Rendered pages are
+        cached briefly and dropped whenever a photo is created, updated or deleted.
 
-    - **photo_id**: Photo ID
+        Requires authentication.
+        """
+        skip = (page - 1) * page_size
+        page_number = None if cursor else page
+        key = (
+            "photos",
+            filters.cache_key(),
+            sort,
+            order,
+            cursor,
+            page_number,
+            page_size,
+            include_total,
+            fields,
+        )
 
-    Requires authentication.
-    """
-    return PhotoService.get_photo_by_id(db, photo_id)
+        def compute(session: Session) -> CachedResponse:
+            result = PhotoService.get_photos(
+                session,
+                skip=skip,
+                limit=page_size,
+                filters=filters,
+                cursor=cursor,
+                include_total=include_total,
+                sort=sort,
+                order=order,
+                fields=fields,
+            )
+            return render_photo_list(key, result, page_number, page_size, fields, FAST_JSON)
 
+        cached = await photo_response_cache.get_or_compute_async(
+            key, lambda: sessions.run(db, compute)
+        )
+        return cached_response(request, cached, settings.CACHE_CONTROL_PHOTO_LIST)
 
-@router.patch(
-    "/{photo_id}",
-    response_model=PhotoResponse,
-    dependencies=[Depends(get_current_admin_user)],
-)
-def update_photo(
-    photo_id: int,
-    photo_data: PhotoUpdate,
-    db: Session = Depends(get_db),
-):
-    """
-    Update a photo (Admin only).
-
-    All fields are optional for partial updates:
-    - **photo_id**: Photo ID
-    - **width**: Photo width in pixels (optional)
-    - **height**: Photo height in pixels (optional)
-    - **url**: Photo page URL (optional)
-    - **photographer**: Photographer name (optional)
-    - **photographer_url**: Photographer profile URL (optional)
-    - **photographer_id**: Photographer ID (optional)
-    - **avg_color**: Average color hex code (optional)
-    - **alt**: Alt text description (optional)
-    - **src_original**: Original image URL (optional)
-    - **src_large2x**: Large 2x image URL (optional)
-    - **src_large**: Large image URL (optional)
-    - **src_medium**: Medium image URL (optional)
-    - **src_small**: Small image URL (optional)
-    - **src_portrait**: Portrait image URL (optional)
-    - **src_landscape**: Landscape image URL (optional)
-    - **src_tiny**: Tiny image URL (optional)
-
-    Requires admin authentication.
-    """
-    return PhotoService.update_photo(db, photo_id, photo_data)
-
-
-@router.delete(
-    "/{photo_id}",
-    status_code=status.HTTP_204_NO_CONTENT,
-    dependencies=[Depends(get_current_admin_user)],
-)
-def delete_photo(photo_id: int, db: Session = Depends(get_db)):
-    """
-    Delete a photo (Admin only).
-
-    - **photo_id**: Photo ID
-
-    Requires admin authentication.
-    """
-    PhotoService.delete_photo(db, photo_id)
-
-
-@router.get("/photographer/{photographer_id}", response_model=PhotoList)
-def get_photos_by_photographer(
-    photographer_id: int,
-    page: int = Query(1, ge=1),
-    page_size: int = Query(settings.DEFAULT_PAGE_SIZE, ge=1, le=settings.MAX_PAGE_SIZE),
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
-):
-    """
-    Get all photos by a specific photographer.
-
-    - **photographer_id**: Photographer ID
-    - **page**: Page number
-    - **page_size**: Number of items per page
-
-    Requires authentication.
-    """
-    skip = (page - 1) * page_size
-    photos, total = PhotoService.get_photos_by_photographer(
-        db, photographer_id, skip=skip, limit=page_size
+    @router.get("/export", response_class=StreamingResponse)
+    async def export_photos(
+        fmt: str = Query("ndjson", alias="format", pattern="^(ndjson|csv)$"),
+        filters: PhotoFilter = Depends(get_photo_filters),
+        db: DatabaseSession = Depends(sessions.get_db),
+        current_user: AuthenticatedUser = Depends(sessions.get_current_user),
+    ):
+        """
+        Export every photo matching the filters as a stream.
+
+        - **format**: `ndjson` (one PhotoResponse object per line, default) or
+          `csv` (the photos.csv column layout)
+        - **photographer**, **search**, dimension, shape and colour filters: same
+          as the list endpoint
+
+        Rows are streamed in id order from a server-side cursor, so memory use
+        does not grow with the size of the export.
+
+        Requires authentication.
+        """
+        return StreamingResponse(
+            sessions.export(db, filters, fmt),
+            media_type=EXPORT_MEDIA_TYPES[fmt],
+            headers={"Content-Disposition": f'attachment; filename="photos.{fmt}"'},
+        )
+
+    @router.get("/similar-color", response_model=PhotoSimilarColor)
+    async def get_similar_color(
+        request: Request,
+        limit: int = Query(
+            settings.DEFAULT_PAGE_SIZE,
+            ge=1,
+            le=settings.MAX_PAGE_SIZE,
+            description="Photos to return",
+        ),
+        filters: PhotoFilter = Depends(get_photo_filters),
+        fields: Optional[Tuple[str, ...]] = Depends(get_photo_fields),
+        db: DatabaseSession = Depends(sessions.get_db),
+        current_user: AuthenticatedUser = Depends(sessions.get_current_user),
+    ):
+        """
+        Get the photos whose average colour is nearest a given colour.
+
+        - **color**: Hex colour to match, e.g. `#3A5F8B` (required)
+        - **tolerance**: Largest RGB distance from `color` (0-442, default: 40)
+        - **limit**: Number of photos to return (default: 20, max: 100)
+        - **photographer**, **search**, dimension and shape filters: same as the
+          list endpoint
+        - **fields**: Comma-separated fields to return (default: all)
+
+        Results are ordered by distance, nearest first.
+
+        Requires authentication.
+        """
+        if not filters.color:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="color is required",
+            )
+
+        key = ("similar-color", filters.cache_key(), limit, fields)
+
+        def compute(session: Session) -> CachedResponse:
+            matches = PhotoService.get_similar_color(
+                session, filters=filters, limit=limit, fields=fields
+            )
+            return render_color_matches(
+                key, filters.color, filters.tolerance, matches, fields, FAST_JSON
+            )
+
+        cached = await photo_response_cache.get_or_compute_async(
+            key, lambda: sessions.run(db, compute)
+        )
+        return cached_response(request, cached, settings.CACHE_CONTROL_PHOTO_LIST)
+
+    @router.get("/batch", response_model=PhotoBatch)
+    async def get_photos_batch(
+        ids: List[int] = Depends(get_photo_ids),
+        db: DatabaseSession = Depends(sessions.get_db),
+        current_user: AuthenticatedUser = Depends(sessions.get_current_user),
+    ):
+        """
+        Get many photos by ID in one request.
+
+        - **ids**: Comma-separated photo IDs, e.g. `ids=3,1,2` (max 100)
+
+        Results are returned in the order requested, one per id; ids that do not
+        exist have `found: false` and no `photo`.
+
+        Requires authentication.
+        """
+        rows = await sessions.run(db, PhotoService.get_photos_by_ids, ids)
+        return Response(
+            content=render_photo_batch(ids, rows, FAST_JSON), media_type="application/json"
+        )
+
+    @router.post(
+        "/bulk",
+        response_model=PhotoBulkResult,
+        responses={409: {"model": PhotoBulkResult}},
+        dependencies=[Depends(sessions.get_current_admin_user)],
     )
+    async def bulk_create_photos(
+        payload: PhotoBulkCreate, db: DatabaseSession = Depends(sessions.get_db)
+    ):
+        """
+        Create or upsert many photos in one transaction (Admin only).
+
+        - **items**: Photos to create; an item with an `id` that already exists
+          is a conflict unless **on_conflict** is `update`
+        - **mode**: `atomic` (default) writes nothing if any item fails and
+          returns 409; `partial` writes every item that can be written
+        - **on_conflict**: `error` (default) or `update`
+
+        Returns one result per item, in request order.
+
+        Requires admin authentication.
+        """
+        outcome = await sessions.run(
+            db,
+            PhotoService.bulk_create,
+            payload.items,
+            atomic=payload.mode == "atomic",
+            on_conflict=payload.on_conflict,
+        )
+        return _bulk_response(outcome)
+
+    @router.patch(
+        "/bulk",
+        response_model=PhotoBulkResult,
+        responses={409: {"model": PhotoBulkResult}},
+        dependencies=[Depends(sessions.get_current_admin_user)],
+    )
+    async def bulk_update_photos(
+        payload: PhotoBulkUpdate, db: DatabaseSession = Depends(sessions.get_db)
+    ):
+        """
+        Apply partial updates to many photos in one transaction (Admin only).
+
+        - **items**: Each has an `id` plus any fields accepted by the single
+          photo update
+        - **mode**: `atomic` (default) or `partial`, as for bulk create
+
+        Requires admin authentication.
+        """
+        outcome = await sessions.run(
+            db, PhotoService.bulk_update, payload.items, atomic=payload.mode == "atomic"
+        )
+        return _bulk_response(outcome)
+
+    @router.delete(
+        "/bulk",
+        response_model=PhotoBulkResult,
+        responses={409: {"model": PhotoBulkResult}},
+        dependencies=[Depends(sessions.get_current_admin_user)],
+    )
+    async def bulk_delete_photos(
+        payload: PhotoBulkDelete, db: DatabaseSession = Depends(sessions.get_db)
+    ):
+        """
+        Delete many photos in one transaction (Admin only).
+
+        - **ids**: Photo IDs to delete
+        - **mode**: `atomic` (default) or `partial`, as for bulk create
+
+        Requires admin authentication.
+        """
+        outcome = await sessions.run(
+            db, PhotoService.bulk_delete, payload.ids, atomic=payload.mode == "atomic"
+        )
+        return _bulk_response(outcome)
+
+    @router.get("/{photo_id}", response_model=PhotoResponse)
+    async def get_photo(
+        request: Request,
+        response: Response,
+        photo_id: int,
+        fields: Optional[Tuple[str, ...]] = Depends(get_photo_fields),
+        db: DatabaseSession = Depends(sessions.get_db),
+        current_user: AuthenticatedUser = Depends(sessions.get_current_user),
+    ):
+        """
+        Get a specific photo by ID.
+
+        - **photo_id**: Photo ID
+        - **fields**: Comma-separated fields to return (default: all)
+
+        Responses carry an ETag and Last-Modified; send them back in
+        If-None-Match / If-Modified-Since to get 304 Not Modified.
+
+        Requires authentication.
+        """
+        photo = await sessions.run(db, PhotoService.get_photo_by_id, photo_id, fields)
+
+        not_modified = conditional_response(
+            request,
+            response,
+            photo_etag(photo),
+            photo.updated_at,
+            settings.CACHE_CONTROL_PHOTO,
+        )
+        if not_modified:
+            return not_modified
+
+        if fields:
+            return Response(
+                content=to_json(project(photo, fields)),
+                media_type="application/json",
+                headers=cache_headers(
+                    photo_etag(photo), photo.updated_at, settings.CACHE_CONTROL_PHOTO
+                ),
+            )
+        return photo
+
+    @router.patch(
+        "/{photo_id}",
+        response_model=PhotoResponse,
+        dependencies=[Depends(sessions.get_current_admin_user)],
+    )
+    async def update_photo(
+        photo_id: int,
+        photo_data: PhotoUpdate,
+        db: DatabaseSession = Depends(sessions.get_db),
+    ):
+        """
+        Update a photo (Admin only).
+
+        All fields are optional for partial updates:
+        - **photo_id**: Photo ID
+        - **width**: Photo width in pixels (optional)
+        - **height**: Photo height in pixels (optional)
+        - **url**: Photo page URL (optional)
+        - **photographer**: Photographer name (optional)
+        - **photographer_url**: Photographer profile URL (optional)
+        - **photographer_id**: Photographer ID (optional)
+        - **avg_color**: Average color hex code (optional)
+        - **alt**: Alt text description (optional)
+        - **src_original**: Original image URL (optional)
+        - **src_large2x**: Large 2x image URL (optional)
+        - **src_large**: Large image URL (optional)
+        - **src_medium**: Medium image URL (optional)
+        - **src_small**: Small image URL (optional)
+        - **src_portrait**: Portrait image URL (optional)
+        - **src_landscape**: Landscape image URL (optional)
+        - **src_tiny**: Tiny image URL (optional)
+
+        Requires admin authentication.
+        """
+        return await sessions.run(db, PhotoService.update_photo, photo_id, photo_data)
+
+    @router.delete(
+        "/{photo_id}",
+        status_code=status.HTTP_204_NO_CONTENT,
+        dependencies=[Depends(sessions.get_current_admin_user)],
+    )
+    async def delete_photo(
+        photo_id: int, db: DatabaseSession = Depends(sessions.get_db)
+    ):
+        """
+        Delete a photo (Admin only).
+
+        - **photo_id**: Photo ID
+
+        Requires admin authentication.
+        """
+        await sessions.run(db, PhotoService.delete_photo, photo_id)
+
+    @router.get("/photographer/{photographer_id}", response_model=PhotoList)
+    async def get_photos_by_photographer(
+        request: Request,
+        photographer_id: int,
+        page: int = Query(1, ge=1),
+        page_size: int = Query(settings.DEFAULT_PAGE_SIZE, ge=1, le=settings.MAX_PAGE_SIZE),
+        cursor: Optional[str] = Query(None),
+        include_total: bool = Query(True),
+        fields: Optional[Tuple[str, ...]] = Depends(get_photo_fields),
+        db: DatabaseSession = Depends(sessions.get_db),
+        current_user: AuthenticatedUser = Depends(sessions.get_current_user),
+    ):
+        """
+        Get all photos by a specific photographer.
+
+        - **photographer_id**: Photographer ID
+        - **page**: Page number
+        - **page_size**: Number of items per page
+        - **cursor**: `next_cursor` from a previous response (page is ignored)
+        - **include_total**: Set to false to skip computing `total`
+        - **fields**: Comma-separated fields to return (default: all)
+
+        Requires authentication.
+        """
+        skip = (page - 1) * page_size
+        page_number = None if cursor else page
+        key = (
+            "photographer", photographer_id, cursor, page_number, page_size, include_total, fields
+        )
+
+        def compute(session: Session) -> CachedResponse:
+            result = PhotoService.get_photos_by_photographer(
+                session,
+                photographer_id,
+                skip=skip,
+                limit=page_size,
+                cursor=cursor,
+                include_total=include_total,
+                fields=fields,
+            )
+            return render_photo_list(key, result, page_number, page_size, fields, FAST_JSON)
+
+        cached = await photo_response_cache.get_or_compute_async(
+            key, lambda: sessions.run(db, compute)
+        )
+        return cached_response(request, cached, settings.CACHE_CONTROL_PHOTO_LIST)
 
-    return {
-        "total": total,
-        "page": page,
-        "page_size": page_size,
-        "photos": photos,
-    }
+    return router
@@ -0,0 +1,68 @@
+"""
+Request plumbing for the sync and async database paths.
+
+The photo and photographer routes are built once, by a router factory, over
+a RequestSessions. It bundles everything that differs between the two paths:
+the session dependency, the authentication dependencies reading users
+through that session, and how service code, which is written against a sync
+Session, reaches the session.
+"""
+from typing import Any, Awaitable, Callable, NamedTuple, Optional, Union
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+from app.core.dependencies import (
+    get_current_admin_user,
+    get_current_admin_user_async,
+    get_current_user,
+    get_current_user_async,
+)
+from app.db.database import get_async_db, get_db
+from app.schemas.photo import PhotoFilter
+from app.services.export_service import ExportService
+
+DatabaseSession = Union[Session, AsyncSession]
+
+
+class RequestSessions(NamedTuple):
+    """
+    What a router needs to serve requests over one kind of session.
+
+    run(db, fn, *args, **kwargs) awaits fn(session, *args, **kwargs) for a
+    sync service function fn; export(db, filters, fmt) returns the chunk
+    iterator of a streamed export.
+    """
+
+    get_db: Callable[..., Any]
+    get_current_user: Callable[..., Any]
+    get_current_admin_user: Callable[..., Any]
+    run: Callable[..., Awaitable[Any]]
+    export: Callable[[DatabaseSession, Optional[PhotoFilter], str], Any]
+
+
+async def _run_in_threadpool(db: Session, fn: Callable[..., Any], *args, **kwargs) -> Any:
+    """Run fn on the threadpool, as FastAPI runs sync routes."""
+    return await run_in_threadpool(fn, db, *args, **kwargs)
+
+
+async def _run_sync(db: AsyncSession, fn: Callable[..., Any], *args, **kwargs) -> Any:
+    """Run fn through AsyncSession.run_sync, so its queries go over the async driver."""
+    return await db.run_sync(fn, *args, **kwargs)
+
+
+SYNC_SESSIONS = RequestSessions(
+    get_db=get_db,
+    get_current_user=get_current_user,
+    get_current_admin_user=get_current_admin_user,
+    run=_run_in_threadpool,
+    export=lambda db, filters, fmt: ExportService.stream(db.get_bind(), filters, fmt),
+)
+
+# Served instead of SYNC_SESSIONS when DATABASE_ASYNC is set
+ASYNC_SESSIONS = RequestSessions(
+    get_db=get_async_db,
+    get_current_user=get_current_user_async,
+    get_current_admin_user=get_current_admin_user_async,
+    run=_run_sync,
+    export=lambda db, filters, fmt: ExportService.stream_async(db.bind, filters, fmt),
+)
@@ -0,0 +1,57 @@
+import heapq
+import math
+import re
+from typing import Dict, List, Optional, Sequence, Tuple
+
+try:
+    import numpy
+except ImportError:  # pragma: no cover - numpy is optional
+    numpy = None
+
+RGB = Tuple[int, int, int]
+
+# Photo columns holding the components of avg_color, in RGB order
+COLOR_COLUMNS = ("color_r", "color_g", "color_b")
+
+# Largest Euclidean distance between two RGB colours, rounded up
+MAX_COLOR_DISTANCE = 442
+
+_HEX_COLOR = re.compile(r"#?([0-9a-fA-F]{6})")
+
+
+def parse_hex_color(value: Optional[str]) -> Optional[RGB]:
+    """Parse "#RRGGBB" (the # is optional) into RGB components, or None if it is not one."""
+    match = _HEX_COLOR.fullmatch(value or "")
+    if match is None:
+        return None
+    digits = match.group(1)
+    return int(digits[0:2], 16), int(digits[2:4], 16), int(digits[4:6], 16)
+
+
+def color_components(avg_color: Optional[str]) -> Dict[str, Optional[int]]:
+    """COLOR_COLUMNS values to store alongside avg_color (all None if it does not parse)."""
+    rgb = parse_hex_color(avg_color)
+    return dict(zip(COLOR_COLUMNS, rgb or (None, None, None)))
+
+
+def rank_by_distance(
+    candidates: Sequence[Tuple[int, int, int, int]], rgb: RGB, limit: int
+) -> List[Tuple[int, float]]:
+    """
+    The limit candidates nearest to rgb, nearest first, ties by id.
+
+    candidates are (id, r, g, b) rows; returns (id, distance) pairs. Uses
+    vectorized NumPy arithmetic when numpy is installed.
+    """
+    if not candidates:
+        return []
+    if numpy is not None:
+        data = numpy.asarray(candidates, dtype=numpy.int64)
+        distances = numpy.sqrt(((data[:, 1:] - numpy.asarray(rgb)) ** 2).sum(axis=1))
+        order = numpy.lexsort((data[:, 0], distances))[:limit]
+        return [(int(data[i, 0]), float(distances[i])) for i in order]
+
+    nearest = heapq.nsmallest(
+        limit, ((math.dist(row[1:], rgb), row[0]) for row in candidates)
+    )
+    return [(photo_id, distance) for distance, photo_id in nearest]
@@ -0,0 +1,273 @@
+import threading
+import time
+import zlib
+from typing import Callable, Dict, Optional, Sequence
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+from app.core.config import settings
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - brotli is optional
+    brotli = None
+
+try:
+    import zstandard
+except ImportError:  # pragma: no cover - zstandard is optional
+    zstandard = None
+
+
+class GzipCompressor:
+    """Incremental gzip stream."""
+
+    def __init__(self, level: int):
+        self._compressor = zlib.compressobj(level, zlib.DEFLATED, zlib.MAX_WBITS | 16)
+
+    def compress(self, data: bytes, final: bool) -> bytes:
+        """Compress data; a non-final call flushes so the client can decode it now."""
+        flush = zlib.Z_FINISH if final else zlib.Z_SYNC_FLUSH
+        return self._compressor.compress(data) + self._compressor.flush(flush)
+
+
+class BrotliCompressor:
+    """Incremental brotli stream (requires the optional `brotli` package)."""
+
+    def __init__(self, quality: int):
+        self._compressor = brotli.Compressor(quality=quality)
+
+    def compress(self, data: bytes, final: bool) -> bytes:
+        """Compress data; a non-final call flushes so the client can decode it now."""
+        out = self._compressor.process(data)
+        return out + (self._compressor.finish() if final else self._compressor.flush())
+
+
+class ZstdCompressor:
+    """Incremental zstd stream (requires the optional `zstandard` package)."""
+
+    def __init__(self, level: int):
+        self._compressor = zstandard.ZstdCompressor(level=level).compressobj()
+
+    def compress(self, data: bytes, final: bool) -> bytes:
+        """Compress data; a non-final call flushes so the client can decode it now."""
+        flush = (
+            zstandard.COMPRESSOBJ_FLUSH_FINISH if final else zstandard.COMPRESSOBJ_FLUSH_BLOCK
+        )
+        return self._compressor.compress(data) + self._compressor.flush(flush)
+
+
+def available_compressors() -> Dict[str, Callable[[], object]]:
+    """Factories for the configured encodings whose libraries are installed."""
+    factories = {"gzip": lambda: GzipCompressor(settings.COMPRESSION_GZIP_LEVEL)}
+    if brotli is not None:
+        factories["br"] = lambda: BrotliCompressor(settings.COMPRESSION_BROTLI_QUALITY)
+    if zstandard is not None:
+        factories["zstd"] = lambda: ZstdCompressor(settings.COMPRESSION_ZSTD_LEVEL)
+    return factories
+
+
+def negotiate(accept_encoding: str, preferred: Sequence[str]) -> Optional[str]:
+    """
+    Pick an encoding for an Accept-Encoding header.
+
+    Returns the first of preferred (in server order) that the client accepts
+    with a non-zero q-value, or None to send the response unencoded.
+    """
+    accepted: Dict[str, float] = {}
+    for part in accept_encoding.split(","):
+        name, _, params = part.partition(";")
+        name = name.strip().lower()
+        if not name:
+            continue
+        q = 1.0
+        for param in params.split(";"):
+            key, _, value = param.partition("=")
+            if key.strip().lower() == "q":
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        accepted[name] = q
+
+    for name in preferred:
+        if accepted.get(name, accepted.get("*", 0.0)) > 0:
+            return name
+    return None
+
+
+class CompressionStats:
+    """Per-encoding counters of compressed bytes and CPU time spent compressing."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._encodings: Dict[str, Dict[str, float]] = {}
+        self.skipped_small = 0
+
+    def _counters(self, encoding: str) -> Dict[str, float]:
+        return self._encodings.setdefault(
+            encoding, {"responses": 0, "bytes_in": 0, "bytes_out": 0, "cpu_seconds": 0.0}
+        )
+
+    def count_response(self, encoding: str) -> None:
+        with self._lock:
+            self._counters(encoding)["responses"] += 1
+
+    def record(self, encoding: str, bytes_in: int, bytes_out: int, cpu_seconds: float) -> None:
+        with self._lock:
+            counters = self._counters(encoding)
+            counters["bytes_in"] += bytes_in
+            counters["bytes_out"] += bytes_out
+            counters["cpu_seconds"] += cpu_seconds
+
+    def count_small(self) -> None:
+        with self._lock:
+            self.skipped_small += 1
+
+    def clear(self) -> None:
+        """Reset every counter."""
+        with self._lock:
+            self._encodings.clear()
+            self.skipped_small = 0
+
+    def stats(self) -> dict:
+        """Return ratio, CPU cost and byte counters per encoding."""
+        with self._lock:
+            encodings = {}
+            for name, c in self._encodings.items():
+                megabytes = c["bytes_in"] / 2**20
+                encodings[name] = {
+                    "responses": c["responses"],
+                    "bytes_in": c["bytes_in"],
+                    "bytes_out": c["bytes_out"],
+                    "ratio": round(c["bytes_in"] / c["bytes_out"], 2) if c["bytes_out"] else 0.0,
+                    "cpu_ms": round(c["cpu_seconds"] * 1000, 3),
+                    "cpu_ms_per_mb": round(c["cpu_seconds"] * 1000 / megabytes, 3)
+                    if megabytes
+                    else 0.0,
+                }
+            return {
+                "enabled": settings.COMPRESSION_ENABLED,
+                "skipped_small": self.skipped_small,
+                "encodings": encodings,
+            }
+
+
+compression_stats = CompressionStats()
+
+
+class CompressionMiddleware:
+    """
+    ASGI middleware compressing responses for clients that accept it.
+
+    Encodings are tried in the configured order (br and zstd only when their
+    packages are installed). Only successful (2xx) responses whose content
+    type is in the allowlist are compressed; error responses, bodies under
+    min_size, HEAD requests, 304s and responses that already carry a
+    Content-Encoding pass through.
+    Streaming responses are compressed chunk by chunk, with a flush after
+    each chunk so clients can decode data as it arrives.
+
+    Whenever an encoding was negotiated, ETags are sent as weak validators
+    (as for a compressed representation), including on 304s, so revalidation
+    keeps matching.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        encodings: Optional[Sequence[str]] = None,
+        min_size: Optional[int] = None,
+        content_types: Optional[Sequence[str]] = None,
+        stats: Optional[CompressionStats] = None,
+    ):
+        self.app = app
+        factories = available_compressors()
+        preferred = encodings if encodings is not None else settings.COMPRESSION_ENCODINGS
+        self.factories = {name: factories[name] for name in preferred if name in factories}
+        self.min_size = settings.COMPRESSION_MIN_SIZE if min_size is None else min_size
+        self.content_types = tuple(
+            content_types if content_types is not None else settings.COMPRESSION_CONTENT_TYPES
+        )
+        self.stats = stats or compression_stats
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["method"] == "HEAD":
+            await self.app(scope, receive, send)
+            return
+
+        accept_encoding = Headers(scope=scope).get("accept-encoding", "")
+        encoding = negotiate(accept_encoding, list(self.factories))
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        responder = _CompressionResponder(self, encoding, send)
+        await self.app(scope, receive, responder.send)
+
+
+class _CompressionResponder:
+    """Compresses one response; the start message is held until the first body chunk."""
+
+    def __init__(self, middleware: CompressionMiddleware, encoding: str, send: Send):
+        self.middleware = middleware
+        self.encoding = encoding
+        self._send = send
+        self._start: Optional[Message] = None
+        self._compressor = None
+
+    async def send(self, message: Message) -> None:
+        if message["type"] == "http.response.start":
+            headers = MutableHeaders(raw=list(message.get("headers", [])))
+            etag = headers.get("etag")
+            if etag and not etag.startswith("W/"):
+                headers["etag"] = f"W/{etag}"
+            self._start = {**message, "headers": headers.raw}
+            return
+
+        if message["type"] != "http.response.body":
+            await self._send(message)
+            return
+
+        body = message.get("body", b"")
+        more_body = message.get("more_body", False)
+
+        if self._start is not None:
+            start, self._start = self._start, None
+            headers = MutableHeaders(raw=start["headers"])
+            if self._compressible(start["status"], headers):
+                headers.add_vary_header("Accept-Encoding")
+                # Streaming bodies are only known to be small if they declare a length
+                size = headers.get("content-length") if more_body else len(body)
+                if size is not None and int(size) < self.middleware.min_size:
+                    self.middleware.stats.count_small()
+                else:
+                    self._compressor = self.middleware.factories[self.encoding]()
+                    self.middleware.stats.count_response(self.encoding)
+                    body = self._compress(body, final=not more_body)
+                    headers["content-encoding"] = self.encoding
+                    if more_body:
+                        del headers["content-length"]
+                    else:
+                        headers["content-length"] = str(len(body))
+            await self._send(start)
+            await self._send({"type": "http.response.body", "body": body, "more_body": more_body})
+            return
+
+        if self._compressor is not None:
+            body = self._compress(body, final=not more_body)
+        await self._send({"type": "http.response.body", "body": body, "more_body": more_body})
+
+    def _compressible(self, status: int, headers: MutableHeaders) -> bool:
+        """Whether the response status, encoding and content type allow compression."""
+        if not 200 <= status < 300 or status == 204 or "content-encoding" in headers:
+            return False
+        content_type = headers.get("content-type", "").split(";")[0].strip().lower()
+        return content_type in self.middleware.content_types
+
+    def _compress(self, data: bytes, final: bool) -> bytes:
+        """Compress data and record the bytes and thread CPU time it took."""
+        started = time.thread_time()
+        out = self._compressor.compress(data, final)
+        self.middleware.stats.record(
+            self.encoding, len(data), len(out), time.thread_time() - started
+        )
+        return out
@@ -1,5 +1,5 @@
 from pydantic_settings import BaseSettings
-from typing import List
+from typing import List, Optional
 
 
 class Settings(BaseSettings):
@@ -19,6 +19,10 @@ class Settings(BaseSettings):
     DATABASE_URL: str
     DATABASE_POOL_SIZE: int = 10
     DATABASE_MAX_OVERFLOW: int = 20
+    # Serve auth and photo routes with an async engine (asyncpg) and AsyncSession
+    DATABASE_ASYNC: bool = False
+    # Defaults to DATABASE_URL with its driver swapped for asyncpg/aiosqlite
+    ASYNC_DATABASE_URL: Optional[str] = None
 
     # Security
     SECRET_KEY: str
@@ -26,16 +30,110 @@ class Settings(BaseSettings):
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
     REFRESH_TOKEN_EXPIRE_DAYS: int = 7
 
+    # Password hashing
+    # Stored hashes made with a different cost are rehashed on the next login
+    BCRYPT_ROUNDS: int = 12
+    # "thread" (bcrypt releases the GIL) or "process"
+    PASSWORD_HASH_EXECUTOR: str = "thread"
+    PASSWORD_HASH_WORKERS: int = 2
+    PASSWORD_HASH_MAX_QUEUE: int = 32
+    PASSWORD_HASH_RETRY_AFTER_SECONDS: int = 1
+
+    # Verified token cache (entries never outlive the token's exp)
+    TOKEN_CACHE_ENABLED: bool = True
+    TOKEN_CACHE_TTL_SECONDS: int = 300
+    TOKEN_CACHE_MAX_SIZE: int = 10_000
+
+    # Authenticated user cache. SQLAlchemy writes to users invalidate it in
+    # this process; raw SQL and other workers' writes wait out the TTL.
+    USER_CACHE_ENABLED: bool = True
+    USER_CACHE_TTL_SECONDS: int = 30
+    USER_CACHE_MAX_SIZE: int = 10_000
+
     # CORS
     CORS_ORIGINS: List[str] = ["http://localhost:3000"]
 
     # Rate Limiting
+    RATE_LIMIT_ENABLED: bool = True
     RATE_LIMIT_PER_MINUTE: int = 60
+    # "memory" (per worker) or "redis" (shared, requires the redis package)
+    RATE_LIMIT_BACKEND: str = "memory"
+    RATE_LIMIT_REDIS_URL: Optional[str] = None
+    RATE_LIMIT_MAX_KEYS: int = 100_000
+    RATE_LIMIT_EXEMPT_PATHS: List[str] = ["/health", "/api/docs", "/api/redoc", "/api/openapi.json"]
 
     # Pagination
     DEFAULT_PAGE_SIZE: int = 20
     MAX_PAGE_SIZE: int = 100
 
+    # Maximum ids accepted by GET /photos/batch
+    MAX_BATCH_IDS: int = 100
+
+    # Maximum items per bulk create/update/delete request
+    MAX_BULK_ITEMS: int = 10_000
+
+    # Relative tolerance of ?aspect_ratio= (0.01 matches 16:9 from 1.760 to 1.796)
+    ASPECT_RATIO_TOLERANCE: float = 0.01
+
+    # Colour similarity (?color= and GET /photos/similar-color)
+    # Tolerance is the Euclidean distance in RGB space (0-442) used when a
+    # request does not give one.
+    COLOR_TOLERANCE_DEFAULT: int = 40
+
+    # Rows fetched per server-side cursor batch by GET /photos/export
+    EXPORT_BATCH_SIZE: int = 1000
+
+    # HTTP caching (Cache-Control sent with photo responses)
+    CACHE_CONTROL_PHOTO: str = "private, max-age=60"
+    CACHE_CONTROL_PHOTO_LIST: str = "private, no-cache"
+
+    # List totals
+    # "exact" always runs COUNT(*); "estimate" uses PostgreSQL planner estimates;
+    # "auto" uses the estimate only when it exceeds TOTAL_COUNT_ESTIMATE_THRESHOLD.
+    TOTAL_COUNT_STRATEGY: str = "auto"
+    TOTAL_COUNT_ESTIMATE_THRESHOLD: int = 100_000
+    TOTAL_COUNT_CACHE_SIZE: int = 1024
+    TOTAL_COUNT_CACHE_TTL_SECONDS: int = 60
+
+    # List response cache
+    # Rendered list responses are kept in-process; set RESPONSE_CACHE_REDIS_URL
+    # to add a tier shared by every worker (requires the `redis` package).
+    # Without it, writes invalidate only the worker that made them; the other
+    # workers, and every worker after an ingest script, serve stale pages for
+    # up to RESPONSE_CACHE_TTL_SECONDS.
+    RESPONSE_CACHE_ENABLED: bool = True
+    RESPONSE_CACHE_TTL_SECONDS: int = 30
+    RESPONSE_CACHE_MAX_ENTRIES: int = 2048
+    RESPONSE_CACHE_REDIS_URL: Optional[str] = None
+    RESPONSE_CACHE_GENERATION_REFRESH_SECONDS: float = 1.0
+
+    # Fast JSON responses
+    # orjson encoding (pydantic_core when orjson is not installed) for every
+    # router, or only the routers named in FAST_JSON_ROUTERS (auth, photos,
+    # photographers, health). Photo routes then also reuse cached per-photo
+    # JSON fragments.
+    FAST_JSON_ENABLED: bool = False
+    FAST_JSON_ROUTERS: List[str] = []
+    PHOTO_FRAGMENT_CACHE_SIZE: int = 50_000
+    PHOTO_FRAGMENT_CACHE_TTL_SECONDS: int = 3600
+
+    # Response compression
+    # Encodings in preference order; br and zstd are used only when the
+    # `brotli` / `zstandard` packages are installed.
+    COMPRESSION_ENABLED: bool = True
+    COMPRESSION_ENCODINGS: List[str] = ["br", "zstd", "gzip"]
+    COMPRESSION_MIN_SIZE: int = 1024
+    COMPRESSION_CONTENT_TYPES: List[str] = [
+        "application/json",
+        "application/x-ndjson",
+        "text/csv",
+        "text/plain",
+        "text/html",
+    ]
+    COMPRESSION_GZIP_LEVEL: int = 6
+    COMPRESSION_BROTLI_QUALITY: int = 4
+    COMPRESSION_ZSTD_LEVEL: int = 3
+
     class Config:
         env_file = ".env"
         case_sensitive = True
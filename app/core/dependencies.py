@@ -1,19 +1,23 @@
-from fastapi import Depends, HTTPException, status
+from fastapi import Depends, HTTPException, Query, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
+from typing import List, Optional, Tuple
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from app.db.database import get_db
+from app.db.database import get_db, get_async_db
 from app.models.user import User
+from app.schemas.photo import PhotoFilter
+from app.core.color import MAX_COLOR_DISTANCE, parse_hex_color
+from app.core.config import settings
+from app.core.projection import PHOTO_FIELDS, parse_fields
 from app.core.security import decode_token
+from app.core.user_cache import AuthenticatedUser, get_cached_user, cache_user
 
 security = HTTPBearer()
 
 
-async def get_current_user(
-    credentials: HTTPAuthorizationCredentials = Depends(security),
-    db: Session = Depends(get_db),
-) -> User:
-    """Get the current authenticated user."""
-    token = credentials.credentials
+def get_user_id_from_token(token: str) -> int:
+    """Validate an access token and return the user ID it was issued for."""
     payload = decode_token(token)
 
     if payload is None:
@@ -40,7 +44,7 @@ async def get_current_user(
 
     # Convert sub from string to int (JWT spec requires string)
     try:
-        user_id: int = int(user_id_str)
+        return int(user_id_str)
     except (ValueError, TypeError):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -48,7 +52,9 @@ async def get_current_user(
             headers={"WWW-Authenticate": "Bearer"},
         )
 
-    user = db.query(User).filter(User.id == user_id).first()
+
+def check_user_is_active(user: Optional[AuthenticatedUser]) -> AuthenticatedUser:
+    """Reject users that no longer exist or have been deactivated."""
     if user is None:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -64,13 +70,185 @@ async def get_current_user(
     return user
 
 
-async def get_current_admin_user(
-    current_user: User = Depends(get_current_user),
-) -> User:
-    """Get the current authenticated admin user."""
-    if not current_user.is_admin:
+def _select_authenticated_user(user_id: int):
+    """Select only the user columns needed for authorization."""
+    return select(User.id, User.is_active, User.is_admin).where(User.id == user_id)
+
+
+def get_current_user(
+    credentials: HTTPAuthorizationCredentials = Depends(security),
+    db: Session = Depends(get_db),
+) -> AuthenticatedUser:
+    """
+    Get the current authenticated user.
+
+    The users lookup is served from an in-process cache for up to
+    USER_CACHE_TTL_SECONDS; ORM changes to a user invalidate its entry.
+    """
+    user_id = get_user_id_from_token(credentials.credentials)
+    user = get_cached_user(user_id)
+    if user is None:
+        row = db.execute(_select_authenticated_user(user_id)).first()
+        if row is not None:
+            user = cache_user(AuthenticatedUser(*row))
+    return check_user_is_active(user)
+
+
+async def get_current_user_async(
+    credentials: HTTPAuthorizationCredentials = Depends(security),
+    db: AsyncSession = Depends(get_async_db),
+) -> AuthenticatedUser:
+    """Get the current authenticated user without blocking the event loop."""
+    user_id = get_user_id_from_token(credentials.credentials)
+    user = get_cached_user(user_id)
+    if user is None:
+        row = (await db.execute(_select_authenticated_user(user_id))).first()
+        if row is not None:
+            user = cache_user(AuthenticatedUser(*row))
+    return check_user_is_active(user)
+
+
+def require_admin(user: AuthenticatedUser) -> AuthenticatedUser:
+    """Reject users without admin rights."""
+    if not user.is_admin:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Not enough permissions",
         )
-    return current_user
+    return user
+
+
+async def get_current_admin_user(
+    current_user: AuthenticatedUser = Depends(get_current_user),
+) -> AuthenticatedUser:
+    """Get the current authenticated admin user."""
+    return require_admin(current_user)
+
+
+async def get_current_admin_user_async(
+    current_user: AuthenticatedUser = Depends(get_current_user_async),
+) -> AuthenticatedUser:
+    """Get the current authenticated admin user on the async request path."""
+    return require_admin(current_user)
+
+
+async def get_photo_filters(
+    photographer: Optional[str] = Query(None, description="Filter by photographer name"),
+    min_width: Optional[int] = Query(None, ge=0, description="Minimum width"),
+    max_width: Optional[int] = Query(None, ge=0, description="Maximum width"),
+    min_height: Optional[int] = Query(None, ge=0, description="Minimum height"),
+    max_height: Optional[int] = Query(None, ge=0, description="Maximum height"),
+    search: Optional[str] = Query(None, description="Search in alt text and photographer"),
+    orientation: Optional[str] = Query(
+        None, pattern="^(landscape|portrait|square)$", description="Photo orientation"
+    ),
+    aspect_ratio: Optional[str] = Query(
+        None, description="Aspect ratio as W:H or a number, e.g. 16:9 or 1.78"
+    ),
+    min_ratio: Optional[float] = Query(None, gt=0, description="Minimum width / height"),
+    max_ratio: Optional[float] = Query(None, gt=0, description="Maximum width / height"),
+    min_megapixels: Optional[float] = Query(None, ge=0, description="Minimum megapixels"),
+    max_megapixels: Optional[float] = Query(None, ge=0, description="Maximum megapixels"),
+    color: Optional[str] = Query(
+        None, description="Only photos whose average colour is close to this hex colour"
+    ),
+    tolerance: Optional[int] = Query(
+        None,
+        ge=0,
+        le=MAX_COLOR_DISTANCE,
+        description="Largest RGB distance from color "
+        f"(default: {settings.COLOR_TOLERANCE_DEFAULT})",
+    ),
+) -> PhotoFilter:
+    """
+    Collect the photo filter query parameters shared by list endpoints.
+
+    aspect_ratio is converted to a number, color is normalized to lowercase
+    "#rrggbb" and tolerance is only kept (with its default filled in) when a
+    color is given, so equivalent queries share cache keys.
+    """
+    if color is not None:
+        rgb = parse_hex_color(color)
+        if rgb is None:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="color must be a hex colour like #3A5F8B",
+            )
+        color = "#%02x%02x%02x" % rgb
+        if tolerance is None:
+            tolerance = settings.COLOR_TOLERANCE_DEFAULT
+    else:
+        tolerance = None
+
+    return PhotoFilter(
+        photographer=photographer,
+        min_width=min_width,
+        max_width=max_width,
+        min_height=min_height,
+        max_height=max_height,
+        search=search,
+        orientation=orientation,
+        aspect_ratio=parse_aspect_ratio(aspect_ratio) if aspect_ratio is not None else None,
+        min_ratio=min_ratio,
+        max_ratio=max_ratio,
+        min_megapixels=min_megapixels,
+        max_megapixels=max_megapixels,
+        color=color,
+        tolerance=tolerance,
+    )
+
+
+def parse_aspect_ratio(value: str) -> float:
+    """Parse an aspect ratio given as "W:H" or as a number; rejects anything else with 400."""
+    try:
+        if ":" in value:
+            width, height = value.split(":")
+            ratio = float(width) / float(height)
+        else:
+            ratio = float(value)
+    except (ValueError, ZeroDivisionError):
+        ratio = 0.0
+    if not 0 < ratio < float("inf"):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="aspect_ratio must be W:H or a positive number, e.g. 16:9 or 1.78",
+        )
+    return ratio
+
+
+async def get_photo_ids(
+    ids: str = Query(..., description="Comma-separated photo IDs"),
+) -> List[int]:
+    """Parse the comma-separated ids of a batch lookup, preserving order."""
+    try:
+        photo_ids = [int(part) for part in ids.split(",") if part.strip()]
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="ids must be a comma-separated list of integers",
+        )
+
+    if not photo_ids:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="At least one id is required",
+        )
+
+    if len(photo_ids) > settings.MAX_BATCH_IDS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"At most {settings.MAX_BATCH_IDS} ids may be requested at once",
+        )
+
+    return photo_ids
+
+
+async def get_photo_fields(
+    fields: Optional[str] = Query(
+        None,
+        description=f"Comma-separated fields to return (id is always included): "
+        f"{', '.join(PHOTO_FIELDS)}",
+    ),
+) -> Optional[Tuple[str, ...]]:
+    """Parse the ?fields= projection shared by photo read endpoints."""
+    return parse_fields(fields)
@@ -0,0 +1,74 @@
+from typing import Any, Callable, Hashable, Type
+from fastapi.responses import JSONResponse
+from pydantic_core import to_json, to_jsonable_python
+from app.core.cache import TTLCache
+from app.core.config import settings
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson is optional
+    orjson = None
+
+
+def dumps(content: Any) -> bytes:
+    """
+    Encode content as compact JSON.
+
+    Uses orjson when it is installed and pydantic_core otherwise; both emit
+    the same bytes as the default encoder for API payloads.
+    """
+    if orjson is not None:
+        return orjson.dumps(content, default=to_jsonable_python)
+    return to_json(content)
+
+
+class FastJSONResponse(JSONResponse):
+    """JSONResponse rendered with dumps instead of json.dumps."""
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
+
+
+def fast_json_enabled(router: str) -> bool:
+    """Whether the named router (auth, photos, photographers, health) serves fast JSON."""
+    return settings.FAST_JSON_ENABLED or router in settings.FAST_JSON_ROUTERS
+
+
+def json_response_class(router: str) -> Type[JSONResponse]:
+    """Default response class to include the named router with."""
+    return FastJSONResponse if fast_json_enabled(router) else JSONResponse
+
+
+class FragmentCache:
+    """
+    Cache of pre-encoded JSON fragments.
+
+    Keys must change whenever the encoded value would, e.g. by including
+    the row's updated_at, so entries never need invalidating; the TTL only
+    bounds how long fragments of deleted rows linger.
+    """
+
+    def __init__(self, maxsize: int, ttl: float):
+        self._cache = TTLCache(maxsize=maxsize, ttl=ttl)
+
+    def get_or_encode(self, key: Hashable, build: Callable[[], Any]) -> bytes:
+        """Return the fragment for key, encoding build() on a miss."""
+        fragment = self._cache.get(key)
+        if fragment is None:
+            fragment = dumps(build())
+            self._cache.set(key, fragment)
+        return fragment
+
+    def clear(self) -> None:
+        """Drop every fragment."""
+        self._cache.clear()
+
+    def stats(self) -> dict:
+        """Return hit/miss counters and current size."""
+        return self._cache.stats()
+
+
+photo_fragment_cache = FragmentCache(
+    maxsize=settings.PHOTO_FRAGMENT_CACHE_SIZE,
+    ttl=settings.PHOTO_FRAGMENT_CACHE_TTL_SECONDS,
+)
@@ -0,0 +1,156 @@
+import asyncio
+import threading
+import time
+from concurrent.futures import Executor, Future, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional, Tuple
+from fastapi import HTTPException, status
+from app.core.config import settings
+from app.core.security import pwd_context
+
+
+def _timed(fn: Callable, *args) -> Tuple[Any, float, float]:
+    """Run fn and return its result with start/end timestamps."""
+    # time.time() so timestamps are comparable across worker processes
+    started = time.time()
+    result = fn(*args)
+    return result, started, time.time()
+
+
+def _hash(password: str) -> str:
+    return pwd_context.hash(password)
+
+
+def _verify_and_update(password: str, hashed_password: str) -> Tuple[bool, Optional[str]]:
+    return pwd_context.verify_and_update(password, hashed_password)
+
+
+class PasswordHasher:
+    """
+    Runs bcrypt on a dedicated, bounded worker pool.
+
+    At most `workers + max_queue` hashes are admitted at once; anything beyond
+    that is rejected with 503 and Retry-After instead of piling up behind the
+    pool and stalling every other endpoint.
+    """
+
+    def __init__(self, workers: int, max_queue: int, use_processes: bool = False):
+        self.workers = workers
+        self.max_queue = max_queue
+        self.use_processes = use_processes
+        self._executor: Optional[Executor] = None
+        self._slots = threading.BoundedSemaphore(workers + max_queue)
+        self._lock = threading.Lock()
+        self._in_flight = 0
+        self._completed = 0
+        self._rejected = 0
+        self._queue_wait_total = 0.0
+        self._hash_time_total = 0.0
+
+    def _get_executor(self) -> Executor:
+        # Created lazily so importing the app does not spawn workers
+        with self._lock:
+            if self._executor is None:
+                if self.use_processes:
+                    self._executor = ProcessPoolExecutor(max_workers=self.workers)
+                else:
+                    self._executor = ThreadPoolExecutor(
+                        max_workers=self.workers, thread_name_prefix="password-hash"
+                    )
+            return self._executor
+
+    def _submit(self, fn: Callable, *args) -> Future:
+        """Submit fn to the pool, or raise 503 if the queue is full."""
+        if not self._slots.acquire(blocking=False):
+            with self._lock:
+                self._rejected += 1
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Authentication is temporarily overloaded, please retry",
+                headers={"Retry-After": str(settings.PASSWORD_HASH_RETRY_AFTER_SECONDS)},
+            )
+
+        with self._lock:
+            self._in_flight += 1
+        submitted = time.time()
+
+        try:
+            timed = self._get_executor().submit(_timed, fn, *args)
+        except Exception:
+            self._release()
+            raise
+
+        result: Future = Future()
+
+        def _done(f: Future) -> None:
+            self._release()
+            try:
+                value, started, finished = f.result()
+            except BaseException as e:
+                result.set_exception(e)
+                return
+            with self._lock:
+                self._completed += 1
+                self._queue_wait_total += max(started - submitted, 0.0)
+                self._hash_time_total += finished - started
+            result.set_result(value)
+
+        timed.add_done_callback(_done)
+        return result
+
+    def _release(self) -> None:
+        with self._lock:
+            self._in_flight -= 1
+        self._slots.release()
+
+    def hash(self, password: str) -> str:
+        """Hash a password, blocking the calling thread until it is done."""
+        return self._submit(_hash, password).result()
+
+    def verify_and_update(
+        self, password: str, hashed_password: str
+    ) -> Tuple[bool, Optional[str]]:
+        """
+        Verify a password, blocking the calling thread until it is done.
+
+        Returns (valid, new_hash); new_hash is set when the stored hash was made
+        with a different bcrypt cost than BCRYPT_ROUNDS and should be replaced.
+        """
+        return self._submit(_verify_and_update, password, hashed_password).result()
+
+    async def hash_async(self, password: str) -> str:
+        """Hash a password without blocking the event loop."""
+        return await asyncio.wrap_future(self._submit(_hash, password))
+
+    async def verify_and_update_async(
+        self, password: str, hashed_password: str
+    ) -> Tuple[bool, Optional[str]]:
+        """Verify a password without blocking the event loop (see verify_and_update)."""
+        return await asyncio.wrap_future(
+            self._submit(_verify_and_update, password, hashed_password)
+        )
+
+    def stats(self) -> Dict[str, Any]:
+        """Return queue depth, rejections and average queue wait vs hash time."""
+        with self._lock:
+            completed = self._completed
+            return {
+                "workers": self.workers,
+                "max_queue": self.max_queue,
+                "executor": "process" if self.use_processes else "thread",
+                "in_flight": self._in_flight,
+                "completed": completed,
+                "rejected": self._rejected,
+                "avg_queue_wait_ms": (
+                    round(self._queue_wait_total / completed * 1000, 2) if completed else 0.0
+                ),
+                "avg_hash_time_ms": (
+                    round(self._hash_time_total / completed * 1000, 2) if completed else 0.0
+                ),
+            }
+
+
+password_hasher = PasswordHasher(
+    workers=settings.PASSWORD_HASH_WORKERS,
+    max_queue=settings.PASSWORD_HASH_MAX_QUEUE,
+    use_processes=settings.PASSWORD_HASH_EXECUTOR == "process",
+)
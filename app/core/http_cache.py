@@ -0,0 +1,95 @@
+import hashlib
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Dict, Hashable, Iterable, Optional
+from fastapi import Request, Response, status
+from app.models.photo import Photo
+
+
+def _etag(*parts) -> str:
+    """Build a strong ETag from the given parts."""
+    digest = hashlib.sha1("\x1f".join(str(p) for p in parts).encode("utf-8")).hexdigest()
+    return f'"{digest}"'
+
+
+def photo_etag(photo: Photo) -> str:
+    """ETag of a single photo; changes whenever the row is updated."""
+    return _etag(photo.id, photo.updated_at.isoformat() if photo.updated_at else "")
+
+
+def photo_list_etag(
+    key: Hashable,
+    photos: Iterable[Photo],
+    total: Optional[int],
+    total_is_estimate: bool = False,
+) -> str:
+    """
+    ETag of a list response.
+
+    Derived from the normalized query key (filter and page), the total
+    and the (id, updated_at) of every row on the page, so additions, deletions
+    and edits all produce a new tag.
+    """
+    rows = ",".join(
+        f"{p.id}@{p.updated_at.isoformat() if p.updated_at else ''}" for p in photos
+    )
+    return _etag(key, total, total_is_estimate, rows)
+
+
+def cache_headers(
+    etag: str, modified: Optional[datetime], cache_control: str
+) -> Dict[str, str]:
+    """Headers sent with both full and 304 responses."""
+    headers = {"ETag": etag, "Cache-Control": cache_control}
+    if modified is not None:
+        # Timestamps are stored as naive UTC
+        headers["Last-Modified"] = format_datetime(
+            modified.replace(microsecond=0, tzinfo=timezone.utc), usegmt=True
+        )
+    return headers
+
+
+def is_not_modified(request: Request, etag: str, modified: Optional[datetime]) -> bool:
+    """
+    Evaluate If-None-Match / If-Modified-Since for a GET request.
+
+    If-None-Match takes precedence and uses weak comparison, as RFC 9110
+    requires for GET.
+    """
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        if if_none_match.strip() == "*":
+            return True
+        candidates = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+        return etag in candidates
+
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since and modified is not None:
+        try:
+            since = parsedate_to_datetime(if_modified_since)
+        except (TypeError, ValueError):
+            return False
+        if since.tzinfo is not None:
+            since = since.astimezone(timezone.utc).replace(tzinfo=None)
+        return modified.replace(microsecond=0) <= since
+
+    return False
+
+
+def conditional_response(
+    request: Request,
+    response: Response,
+    etag: str,
+    modified: Optional[datetime],
+    cache_control: str,
+) -> Optional[Response]:
+    """
+    Apply cache headers to response, or return a 304 if the client copy is current.
+
+    Handlers return the 304 as-is and otherwise continue building the body.
+    """
+    headers = cache_headers(etag, modified, cache_control)
+    if is_not_modified(request, etag, modified):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    response.headers.update(headers)
+    return None
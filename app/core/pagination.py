@@ -0,0 +1,47 @@
+import base64
+import binascii
+import json
+from datetime import datetime
+from typing import Any, Tuple
+from fastapi import HTTPException, status
+
+
+def encode_cursor(sort: str, order: str, value: Any, photo_id: int) -> str:
+    """Encode the sort and the sort key of the last row on a page into an opaque cursor."""
+    if isinstance(value, datetime):
+        value = value.isoformat()
+    raw = json.dumps([sort, order, value, photo_id], separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str, sort: str, order: str) -> Tuple[Any, int]:
+    """
+    Decode a cursor produced by encode_cursor back into (sort value, id).
+
+    Cursors issued for a different sort or order are rejected with 400, as
+    their sort key means nothing in this ordering.
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        parts = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+        if len(parts) == 2:
+            # Cursors issued before ?sort= existed are newest-first
+            parts = ["created_at", "desc", *parts]
+        cursor_sort, cursor_order, value, photo_id = parts
+        if cursor_sort == "created_at":
+            value = datetime.fromisoformat(value)
+        elif isinstance(value, bool) or not isinstance(value, (int, float)):
+            raise ValueError(value)
+        photo_id = int(photo_id)
+    except (ValueError, TypeError, binascii.Error, UnicodeError):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid cursor",
+        )
+
+    if (cursor_sort, cursor_order) != (sort, order):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Cursor was issued for a different sort order",
+        )
+    return value, photo_id
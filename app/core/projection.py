@@ -0,0 +1,136 @@
+from typing import Any, Dict, Optional, Sequence, Tuple
+from fastapi import HTTPException, status
+from pydantic_core import to_json
+from sqlalchemy import select
+from sqlalchemy.engine import Row
+from sqlalchemy.orm import load_only
+from sqlalchemy.orm.interfaces import LoaderOption
+from sqlalchemy.sql import Select
+from app.core.fast_json import photo_fragment_cache
+from app.models.photo import Photo
+from app.models.photographer import PHOTOGRAPHER_FIELDS, Photographer
+from app.schemas.photo import PhotoResponse
+
+# Fields a client may select with ?fields=, in response order
+PHOTO_FIELDS: Tuple[str, ...] = tuple(PhotoResponse.model_fields)
+
+# Loaded even when not selected: keyset cursors need created_at, and ETag /
+# Last-Modified need id and updated_at
+ALWAYS_LOADED = ("id", "created_at", "updated_at")
+
+
+def parse_fields(fields: Optional[str]) -> Optional[Tuple[str, ...]]:
+    """
+    Parse a comma-separated ?fields= value.
+
+    Returns None when no projection was requested. `id` is always included;
+    unknown names are rejected with 400.
+    """
+    if fields is None:
+        return None
+
+    requested = {name.strip() for name in fields.split(",") if name.strip()}
+    unknown = requested - set(PHOTO_FIELDS)
+    if unknown:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Unknown fields: {', '.join(sorted(unknown))}",
+        )
+
+    requested.add("id")
+    return tuple(name for name in PHOTO_FIELDS if name in requested)
+
+
+def load_only_fields(fields: Tuple[str, ...]) -> LoaderOption:
+    """Loader option restricting the photos SELECT to the projected columns."""
+    columns = dict.fromkeys(ALWAYS_LOADED + fields)
+    return load_only(*(getattr(Photo, name) for name in columns))
+
+
+def project(photo: Photo, fields: Tuple[str, ...]) -> Dict[str, Any]:
+    """Serializable dict with only the projected fields of photo."""
+    return {name: getattr(photo, name) for name in fields}
+
+
+def select_photo_fields(names: Sequence[str]) -> Select:
+    """
+    Core select of exactly the named photo fields, in order.
+
+    Photographer fields are read from photographers through a join, which
+    is only added when one of them is selected.
+    """
+    photos = Photo.__table__
+    columns = [
+        Photographer.__table__.c[PHOTOGRAPHER_FIELDS[name]].label(name)
+        if name in PHOTOGRAPHER_FIELDS
+        else photos.c[name]
+        for name in names
+    ]
+    stmt = select(*columns)
+    if PHOTOGRAPHER_FIELDS.keys() & set(names):
+        stmt = stmt.select_from(
+            photos.join(Photographer.__table__, photos.c.photographer_id == Photographer.id)
+        )
+    return stmt
+
+
+def photo_select(
+    fields: Optional[Tuple[str, ...]] = None, extra: Tuple[str, ...] = ()
+) -> Select:
+    """
+    Core select of the given photo fields (default: all).
+
+    The output fields come first, in response order, followed by any of
+    ALWAYS_LOADED and extra (e.g. a sort column) that were not selected, so
+    row_dict can zip rows against the field names.
+    """
+    fields = fields or PHOTO_FIELDS
+    return select_photo_fields(list(dict.fromkeys(fields + ALWAYS_LOADED + extra)))
+
+
+def row_dict(row: Row, fields: Optional[Tuple[str, ...]] = None) -> Dict[str, Any]:
+    """Response dict of a row selected with photo_select(fields)."""
+    return dict(zip(fields or PHOTO_FIELDS, row))
+
+
+def photo_fragment(row: Row, fields: Optional[Tuple[str, ...]] = None) -> bytes:
+    """Encoded JSON of one photo row, reused until the row's updated_at changes."""
+    return photo_fragment_cache.get_or_encode(
+        (row.id, row.updated_at, fields), lambda: row_dict(row, fields)
+    )
+
+
+def encode_photo_rows(
+    rows: Sequence[Row], fields: Optional[Tuple[str, ...]] = None, fragments: bool = False
+) -> bytes:
+    """JSON array of photo rows, concatenated from cached fragments if fragments is set."""
+    if fragments:
+        return b"[" + b",".join(photo_fragment(row, fields) for row in rows) + b"]"
+    return to_json([row_dict(row, fields) for row in rows])
+
+
+def render_photo_batch(
+    photo_ids: Sequence[int], rows: Sequence[Optional[Row]], fragments: bool = False
+) -> bytes:
+    """Encode a PhotoBatch body straight from Core rows."""
+    if fragments:
+        items = (
+            b'{"id":%d,"found":true,"photo":%s}' % (photo_id, photo_fragment(row))
+            if row is not None
+            else b'{"id":%d,"found":false,"photo":null}' % photo_id
+            for photo_id, row in zip(photo_ids, rows)
+        )
+        return b'{"results":[' + b",".join(items) + b"]}"
+
+    return to_json(
+        {
+            "results": [
+                {
+                    "id": photo_id,
+                    "found": row is not None,
+                    "photo": row_dict(row) if row is not None else None,
+                }
+                for photo_id, row in zip(photo_ids, rows)
+            ]
+        }
+    )
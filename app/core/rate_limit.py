@@ -0,0 +1,204 @@
+import math
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, NamedTuple, Optional, Sequence
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+from app.core.config import settings
+from app.core.security import decode_token
+
+
+class RateLimitResult(NamedTuple):
+    """Outcome of counting one request against a bucket."""
+
+    allowed: bool
+    limit: int
+    remaining: int
+    reset_after: int
+    retry_after: int
+
+
+def _bucket_result(allowed: bool, tokens: float, limit: int, rate: float) -> RateLimitResult:
+    """Describe a token bucket's state after a request was counted."""
+    return RateLimitResult(
+        allowed=allowed,
+        limit=limit,
+        remaining=int(tokens),
+        reset_after=math.ceil((limit - tokens) / rate),
+        retry_after=0 if allowed else math.ceil((1 - tokens) / rate),
+    )
+
+
+class InMemoryRateLimitBackend:
+    """
+    Token buckets kept in this process.
+
+    Limits are per worker, so with N workers a client may get up to N times
+    the configured rate. Least recently used buckets are evicted beyond
+    max_keys.
+    """
+
+    def __init__(self, max_keys: int = 100_000):
+        self.max_keys = max_keys
+        self._buckets: "OrderedDict[str, list]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    async def hit(self, key: str, limit: int, window: int) -> RateLimitResult:
+        """Take one token from key's bucket."""
+        rate = limit / window
+        now = time.monotonic()
+        with self._lock:
+            bucket = self._buckets.get(key)
+            if bucket is None:
+                bucket = self._buckets[key] = [float(limit), now]
+                if len(self._buckets) > self.max_keys:
+                    self._buckets.popitem(last=False)
+            else:
+                self._buckets.move_to_end(key)
+                bucket[0] = min(limit, bucket[0] + (now - bucket[1]) * rate)
+                bucket[1] = now
+
+            allowed = bucket[0] >= 1
+            if allowed:
+                bucket[0] -= 1
+            return _bucket_result(allowed, bucket[0], limit, rate)
+
+    def clear(self) -> None:
+        """Forget every bucket."""
+        with self._lock:
+            self._buckets.clear()
+
+
+class RedisRateLimitBackend:
+    """
+    Token buckets shared by every worker through Redis.
+
+    Requires the optional `redis` package. Each hit is a single atomic script
+    call that uses the Redis server clock.
+    """
+
+    SCRIPT = """
+    local capacity = tonumber(ARGV[1])
+    local rate = tonumber(ARGV[2])
+    local t = redis.call('TIME')
+    local now = tonumber(t[1]) + tonumber(t[2]) / 1000000
+    local bucket = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+    local tokens = tonumber(bucket[1]) or capacity
+    local ts = tonumber(bucket[2]) or now
+    tokens = math.min(capacity, tokens + (now - ts) * rate)
+    local allowed = 0
+    if tokens >= 1 then
+        tokens = tokens - 1
+        allowed = 1
+    end
+    redis.call('HSET', KEYS[1], 'tokens', tostring(tokens), 'ts', tostring(now))
+    redis.call('EXPIRE', KEYS[1], math.ceil(capacity / rate))
+    return {allowed, tostring(tokens)}
+    """
+
+    def __init__(self, url: str, prefix: str = "ratelimit:"):
+        try:
+            import redis.asyncio as redis
+        except ImportError:
+            raise RuntimeError("RATE_LIMIT_BACKEND=redis requires the 'redis' package")
+
+        self.prefix = prefix
+        self._client = redis.from_url(url)
+        self._script = self._client.register_script(self.SCRIPT)
+
+    async def hit(self, key: str, limit: int, window: int) -> RateLimitResult:
+        """Take one token from key's bucket."""
+        rate = limit / window
+        allowed, tokens = await self._script(keys=[self.prefix + key], args=[limit, rate])
+        return _bucket_result(bool(allowed), float(tokens), limit, rate)
+
+
+class RateLimiter:
+    """Applies a per-client limit of `limit` requests per `window` seconds."""
+
+    def __init__(self, backend, limit: int, window: int = 60):
+        self.backend = backend
+        self.limit = limit
+        self.window = window
+
+    async def hit(self, key: str) -> RateLimitResult:
+        """Count one request for key."""
+        return await self.backend.hit(key, self.limit, self.window)
+
+
+def _create_backend():
+    if settings.RATE_LIMIT_BACKEND == "redis":
+        return RedisRateLimitBackend(settings.RATE_LIMIT_REDIS_URL)
+    return InMemoryRateLimitBackend(max_keys=settings.RATE_LIMIT_MAX_KEYS)
+
+
+rate_limiter = RateLimiter(_create_backend(), limit=settings.RATE_LIMIT_PER_MINUTE, window=60)
+
+
+class RateLimitMiddleware:
+    """
+    ASGI middleware enforcing the rate limit per user, or per client IP for
+    unauthenticated requests.
+
+    Every response carries RateLimit-Limit, RateLimit-Remaining and
+    RateLimit-Reset headers; rejected requests get 429 with Retry-After.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        limiter: Optional[RateLimiter] = None,
+        exempt_paths: Sequence[str] = (),
+    ):
+        self.app = app
+        self.limiter = limiter or rate_limiter
+        self.exempt_paths = tuple(exempt_paths)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["path"].startswith(self.exempt_paths):
+            await self.app(scope, receive, send)
+            return
+
+        result = await self.limiter.hit(self._client_key(scope))
+        headers = [
+            (b"ratelimit-limit", str(result.limit).encode()),
+            (b"ratelimit-remaining", str(result.remaining).encode()),
+            (b"ratelimit-reset", str(result.reset_after).encode()),
+        ]
+
+        if not result.allowed:
+            body = b'{"detail":"Rate limit exceeded"}'
+            await send(
+                {
+                    "type": "http.response.start",
+                    "status": 429,
+                    "headers": headers
+                    + [
+                        (b"retry-after", str(result.retry_after).encode()),
+                        (b"content-type", b"application/json"),
+                        (b"content-length", str(len(body)).encode()),
+                    ],
+                }
+            )
+            await send({"type": "http.response.body", "body": body})
+            return
+
+        async def send_with_headers(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                message["headers"] = list(message.get("headers", [])) + headers
+            await send(message)
+
+        await self.app(scope, receive, send_with_headers)
+
+    @staticmethod
+    def _client_key(scope: Scope) -> str:
+        """Key requests by the user in a valid access token, else by client IP."""
+        headers: Dict[bytes, bytes] = dict(scope.get("headers") or [])
+        authorization = headers.get(b"authorization", b"")
+        if authorization[:7].lower() == b"bearer ":
+            payload = decode_token(authorization[7:].decode("latin-1"))
+            if payload and payload.get("type") == "access" and payload.get("sub"):
+                return f"user:{payload['sub']}"
+
+        client = scope.get("client")
+        return f"ip:{client[0] if client else 'unknown'}"
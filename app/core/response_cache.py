@@ -0,0 +1,329 @@
+import asyncio
+import hashlib
+import json
+import threading
+import time
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Awaitable,
+    Callable,
+    Dict,
+    Hashable,
+    List,
+    NamedTuple,
+    Optional,
+    Tuple,
+)
+from sqlalchemy.engine import Row
+from fastapi import Request, Response, status
+from pydantic_core import to_json
+from app.core.cache import TTLCache
+from app.core.config import settings
+from app.core.http_cache import cache_headers, is_not_modified, photo_list_etag
+from app.core.fast_json import dumps
+from app.core.projection import encode_photo_rows, photo_fragment, row_dict
+
+if TYPE_CHECKING:
+    from app.services.photo_service import PhotoPage
+
+
+class CachedResponse(NamedTuple):
+    """
+    A rendered JSON body with the ETag that validates it.
+
+    There is deliberately no Last-Modified: the newest updated_at on a page
+    does not change when a row is deleted or leaves the filter, so
+    If-Modified-Since would answer 304 for a list that has changed.
+    """
+
+    body: bytes
+    etag: str
+
+
+class RedisResponseCacheBackend:
+    """
+    Shared response cache tier in Redis.
+
+    Requires the optional `redis` package. The invalidation generation is a
+    Redis counter so a write on one worker invalidates every worker.
+    """
+
+    def __init__(self, url: str, ttl: int, prefix: str = "photos:response:"):
+        try:
+            import redis
+        except ImportError:
+            raise RuntimeError("RESPONSE_CACHE_REDIS_URL requires the 'redis' package")
+
+        self.ttl = ttl
+        self.prefix = prefix
+        self._client = redis.Redis.from_url(url)
+
+    def _key(self, key: Hashable) -> str:
+        return self.prefix + hashlib.sha1(repr(key).encode("utf-8")).hexdigest()
+
+    def get(self, key: Hashable) -> Optional[CachedResponse]:
+        raw = self._client.get(self._key(key))
+        if raw is None:
+            return None
+        data = json.loads(raw)
+        return CachedResponse(body=data["body"].encode("utf-8"), etag=data["etag"])
+
+    def set(self, key: Hashable, value: CachedResponse) -> None:
+        data = {"body": value.body.decode("utf-8"), "etag": value.etag}
+        self._client.set(self._key(key), json.dumps(data), ex=self.ttl)
+
+    def generation(self) -> int:
+        return int(self._client.get(self.prefix + "generation") or 0)
+
+    def bump_generation(self) -> None:
+        self._client.incr(self.prefix + "generation")
+
+
+class ResponseCache:
+    """
+    Read-through cache of rendered responses.
+
+    Lookups go to an in-process LRU tier, then to the optional shared tier,
+    and only then to the database. Keys are prefixed with a generation number
+    that write paths bump, so invalidation never has to enumerate keys; stale
+    entries simply stop being reachable and age out. Concurrent misses on the
+    same key are coalesced so only one request recomputes it.
+
+    Without the shared tier the generation is per process: a write, or an
+    ingest script run, invalidates only the process that made it, and other
+    workers serve their cached pages until the TTL expires.
+    """
+
+    def __init__(
+        self,
+        maxsize: int,
+        ttl: int,
+        shared: Optional[RedisResponseCacheBackend] = None,
+        generation_refresh_seconds: float = 1.0,
+    ):
+        self.enabled = maxsize > 0
+        self.shared = shared
+        self.generation_refresh_seconds = generation_refresh_seconds
+        self._local = TTLCache(maxsize=maxsize, ttl=ttl)
+        self._generation = 0
+        self._generation_checked_at = 0.0
+        self._lock = threading.Lock()
+        self._inflight: Dict[Hashable, threading.Lock] = {}
+        self._inflight_async: Dict[Hashable, asyncio.Lock] = {}
+        self._local_hits = 0
+        self._shared_hits = 0
+        self._misses = 0
+        self._coalesced = 0
+
+    def _current_generation(self) -> int:
+        """Local generation, refreshed from the shared tier at most once per interval."""
+        if self.shared is not None:
+            now = time.monotonic()
+            if now - self._generation_checked_at >= self.generation_refresh_seconds:
+                self._generation = max(self._generation, self.shared.generation())
+                self._generation_checked_at = now
+        return self._generation
+
+    def _count(self, counter: str) -> None:
+        with self._lock:
+            setattr(self, counter, getattr(self, counter) + 1)
+
+    def _lookup(self, key: Hashable) -> Optional[CachedResponse]:
+        value = self._local.get(key)
+        if value is not None:
+            self._count("_local_hits")
+            return value
+        if self.shared is not None:
+            value = self.shared.get(key)
+            if value is not None:
+                self._local.set(key, value)
+                self._count("_shared_hits")
+                return value
+        return None
+
+    def _store(self, key: Hashable, value: CachedResponse) -> None:
+        self._local.set(key, value)
+        if self.shared is not None:
+            self.shared.set(key, value)
+
+    def get_or_compute(
+        self, key: Hashable, compute: Callable[[], CachedResponse]
+    ) -> CachedResponse:
+        """Return the cached response for key, computing it at most once at a time."""
+        if not self.enabled:
+            return compute()
+
+        full_key = (self._current_generation(), key)
+        value = self._lookup(full_key)
+        if value is not None:
+            return value
+
+        with self._lock:
+            key_lock = self._inflight.setdefault(full_key, threading.Lock())
+        try:
+            with key_lock:
+                value = self._local.get(full_key)
+                if value is not None:
+                    self._count("_coalesced")
+                    return value
+                self._count("_misses")
+                value = compute()
+                self._store(full_key, value)
+                return value
+        finally:
+            with self._lock:
+                self._inflight.pop(full_key, None)
+
+    async def get_or_compute_async(
+        self, key: Hashable, compute: Callable[[], Awaitable[CachedResponse]]
+    ) -> CachedResponse:
+        """Async counterpart of get_or_compute for handlers on the event loop."""
+        if not self.enabled:
+            return await compute()
+
+        if self.shared is not None:
+            full_key = (await asyncio.to_thread(self._current_generation), key)
+            value = await asyncio.to_thread(self._lookup, full_key)
+        else:
+            full_key = (self._current_generation(), key)
+            value = self._lookup(full_key)
+        if value is not None:
+            return value
+
+        key_lock = self._inflight_async.setdefault(full_key, asyncio.Lock())
+        try:
+            async with key_lock:
+                value = self._local.get(full_key)
+                if value is not None:
+                    self._count("_coalesced")
+                    return value
+                self._count("_misses")
+                value = await compute()
+                if self.shared is not None:
+                    await asyncio.to_thread(self._store, full_key, value)
+                else:
+                    self._store(full_key, value)
+                return value
+        finally:
+            self._inflight_async.pop(full_key, None)
+
+    def invalidate(self) -> None:
+        """Make every cached response unreachable after a write."""
+        with self._lock:
+            self._generation += 1
+        if self.shared is not None:
+            self.shared.bump_generation()
+
+    def clear(self) -> None:
+        """Drop every local entry."""
+        self._local.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """Return hit ratio, memory held by the local tier and counters."""
+        with self._lock:
+            hits = self._local_hits + self._shared_hits + self._coalesced
+            lookups = hits + self._misses
+            counters = {
+                "local_hits": self._local_hits,
+                "shared_hits": self._shared_hits,
+                "coalesced": self._coalesced,
+                "misses": self._misses,
+                "hit_ratio": round(hits / lookups, 4) if lookups else 0.0,
+                "generation": self._generation,
+            }
+        values = self._local.values()
+        return {
+            "entries": len(values),
+            "maxsize": self._local.maxsize,
+            "bytes": sum(len(v.body) + len(v.etag) for v in values),
+            "shared_tier": self.shared is not None,
+            **counters,
+        }
+
+
+photo_response_cache = ResponseCache(
+    maxsize=settings.RESPONSE_CACHE_MAX_ENTRIES if settings.RESPONSE_CACHE_ENABLED else 0,
+    ttl=settings.RESPONSE_CACHE_TTL_SECONDS,
+    shared=(
+        RedisResponseCacheBackend(
+            settings.RESPONSE_CACHE_REDIS_URL, ttl=settings.RESPONSE_CACHE_TTL_SECONDS
+        )
+        if settings.RESPONSE_CACHE_ENABLED and settings.RESPONSE_CACHE_REDIS_URL
+        else None
+    ),
+    generation_refresh_seconds=settings.RESPONSE_CACHE_GENERATION_REFRESH_SECONDS,
+)
+
+
+def render_photo_list(
+    key: Hashable,
+    result: "PhotoPage",
+    page: Optional[int],
+    page_size: int,
+    fields: Optional[Tuple[str, ...]] = None,
+    fragments: bool = False,
+) -> CachedResponse:
+    """
+    Serialize one page of photo rows into a cacheable response.
+
+    Rows come from a Core select and are encoded directly, without building
+    ORM objects or validating them through PhotoResponse. With fragments,
+    the photos array is concatenated from cached per-photo JSON.
+    """
+    envelope = dumps(
+        {
+            "total": result.total,
+            "total_is_estimate": result.total_is_estimate,
+            "page": page,
+            "page_size": page_size,
+            "next_cursor": result.next_cursor,
+            "photos": [],
+        }
+    )
+    # photos is the last key, so the envelope ends with `[]}`
+    body = envelope[:-3] + encode_photo_rows(result.photos, fields, fragments) + b"}"
+    return CachedResponse(
+        body=body,
+        etag=photo_list_etag(key, result.photos, result.total, result.total_is_estimate),
+    )
+
+
+def render_color_matches(
+    key: Hashable,
+    color: str,
+    tolerance: int,
+    matches: List[Tuple[float, Row]],
+    fields: Optional[Tuple[str, ...]] = None,
+    fragments: bool = False,
+) -> CachedResponse:
+    """Serialize a PhotoSimilarColor body from (distance, row) pairs, as render_photo_list."""
+    rows = [row for _, row in matches]
+    if fragments:
+        items = b",".join(
+            b'{"distance":%s,"photo":%s}' % (dumps(round(distance, 2)), photo_fragment(row, fields))
+            for distance, row in matches
+        )
+        envelope = dumps({"color": color, "tolerance": tolerance, "results": []})
+        # results is the last key, so the envelope ends with `[]}`
+        body = envelope[:-3] + b"[" + items + b"]}"
+    else:
+        body = to_json(
+            {
+                "color": color,
+                "tolerance": tolerance,
+                "results": [
+                    {"distance": round(distance, 2), "photo": row_dict(row, fields)}
+                    for distance, row in matches
+                ],
+            }
+        )
+    return CachedResponse(body=body, etag=photo_list_etag(key, rows, None))
+
+
+def cached_response(request: Request, cached: CachedResponse, cache_control: str) -> Response:
+    """Serve a cached response, or 304 if the client copy is current."""
+    headers = cache_headers(cached.etag, None, cache_control)
+    if is_not_modified(request, cached.etag, None):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    return Response(content=cached.body, media_type="application/json", headers=headers)
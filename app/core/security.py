@@ -1,10 +1,28 @@
+import hashlib
+import time
 from datetime import datetime, timedelta
 from typing import Optional, Dict
 from jose import JWTError, jwt
 from passlib.context import CryptContext
+from app.core.cache import TTLCache
 from app.core.config import settings
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# Pinning min/max rounds to the configured cost makes verify_and_update flag
+# hashes created with any other cost for rehashing.
+pwd_context = CryptContext(
+    schemes=["bcrypt"],
+    deprecated="auto",
+    bcrypt__default_rounds=settings.BCRYPT_ROUNDS,
+    bcrypt__min_rounds=settings.BCRYPT_ROUNDS,
+    bcrypt__max_rounds=settings.BCRYPT_ROUNDS,
+)
+
+# Verified payloads keyed by a digest of the token, so hot tokens skip the
+# parse + signature check. Only successfully verified tokens are cached.
+token_cache = TTLCache(
+    maxsize=settings.TOKEN_CACHE_MAX_SIZE if settings.TOKEN_CACHE_ENABLED else 0,
+    ttl=settings.TOKEN_CACHE_TTL_SECONDS,
+)
 
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
@@ -49,9 +67,27 @@ def create_refresh_token(data: Dict) -> str:
 
 
 def decode_token(token: str) -> Optional[Dict]:
-    """Decode and verify a JWT token."""
+    """
+    Decode and verify a JWT token.
+
+    Verified payloads are cached until the earlier of the token's exp and
+    TOKEN_CACHE_TTL_SECONDS.
+    """
+    key = hashlib.sha256(token.encode("utf-8")).digest()
+    now = time.time()
+
+    payload = token_cache.get(key)
+    if payload is not None:
+        if payload["exp"] > now:
+            return dict(payload)
+        token_cache.pop(key)
+
     try:
         payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
-        return payload
     except JWTError:
         return None
+
+    exp = payload.get("exp")
+    if isinstance(exp, (int, float)) and exp > now:
+        token_cache.set(key, dict(payload), ttl=min(settings.TOKEN_CACHE_TTL_SECONDS, exp - now))
+    return payload
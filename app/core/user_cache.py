@@ -0,0 +1,83 @@
+"""
+Short-lived cache of the user row read by every authenticated request.
+
+Changes made through SQLAlchemy drop the affected entries as soon as they
+are executed and again at commit: ORM flushes drop the changed user, while
+Core and ORM-enabled UPDATE or DELETE statements on users drop every cached
+user. Writes this process cannot see, raw SQL text or another worker's
+changes, are picked up once USER_CACHE_TTL_SECONDS has passed.
+"""
+from typing import NamedTuple, Optional
+from sqlalchemy import event
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.orm import Session, object_session
+from sqlalchemy.sql.dml import Delete, Update
+from app.core.cache import TTLCache
+from app.core.config import settings
+from app.models.user import User
+
+
+class AuthenticatedUser(NamedTuple):
+    """The user fields needed to authorize a request."""
+
+    id: int
+    is_active: bool
+    is_admin: bool
+
+
+user_cache = TTLCache(
+    maxsize=settings.USER_CACHE_MAX_SIZE if settings.USER_CACHE_ENABLED else 0,
+    ttl=settings.USER_CACHE_TTL_SECONDS,
+)
+
+
+def get_cached_user(user_id: int) -> Optional[AuthenticatedUser]:
+    """Get a cached user snapshot, if one is still fresh."""
+    return user_cache.get(user_id)
+
+
+def cache_user(user: AuthenticatedUser) -> AuthenticatedUser:
+    """Store a user snapshot for at most USER_CACHE_TTL_SECONDS."""
+    user_cache.set(user.id, user)
+    return user
+
+
+def invalidate_user(user_id: int) -> None:
+    """Drop a user's cached snapshot."""
+    user_cache.pop(user_id)
+
+
+@event.listens_for(User, "after_update")
+@event.listens_for(User, "after_delete")
+def _invalidate_changed_user(mapper, connection, target: User) -> None:
+    """Drop cached users changed through the ORM, at flush and again at commit."""
+    invalidate_user(target.id)
+    session = object_session(target)
+    if session is not None:
+        session.info.setdefault("changed_user_ids", set()).add(target.id)
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_committed_users(session: Session) -> None:
+    # A request may have re-cached the old row between flush and commit
+    for user_id in session.info.pop("changed_user_ids", ()):
+        invalidate_user(user_id)
+
+
+@event.listens_for(Engine, "after_execute")
+def _invalidate_bulk_changed_users(
+    conn: Connection, clauseelement, multiparams, params, execution_options, result
+) -> None:
+    """Drop every cached user when an UPDATE or DELETE statement targets users."""
+    if isinstance(clauseelement, (Update, Delete)) and (
+        clauseelement.table.name == User.__tablename__
+    ):
+        user_cache.clear()
+        conn.info["users_changed"] = True
+
+
+@event.listens_for(Engine, "commit")
+@event.listens_for(Engine, "rollback")
+def _invalidate_bulk_committed_users(conn: Connection) -> None:
+    if conn.info.pop("users_changed", False):
+        user_cache.clear()
@@ -1,4 +1,5 @@
 from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 from app.core.config import settings
@@ -15,6 +16,35 @@ SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 Base = declarative_base()
 
 
+def get_async_database_url(url: str) -> str:
+    """Swap the driver of a sync database URL for its asyncio counterpart."""
+    for sync_prefix, async_prefix in (
+        ("postgresql+psycopg2://", "postgresql+asyncpg://"),
+        ("postgresql://", "postgresql+asyncpg://"),
+        ("sqlite://", "sqlite+aiosqlite://"),
+    ):
+        if url.startswith(sync_prefix):
+            return async_prefix + url[len(sync_prefix):]
+    return url
+
+
+async_engine = None
+AsyncSessionLocal = None
+
+if settings.DATABASE_ASYNC:
+    async_engine = create_async_engine(
+        settings.ASYNC_DATABASE_URL or get_async_database_url(settings.DATABASE_URL),
+        pool_size=settings.DATABASE_POOL_SIZE,
+        max_overflow=settings.DATABASE_MAX_OVERFLOW,
+        pool_pre_ping=True,
+    )
+    # expire_on_commit=False so committed objects can still be serialized
+    # without an implicit (and, under asyncio, illegal) lazy refresh.
+    AsyncSessionLocal = async_sessionmaker(
+        bind=async_engine, class_=AsyncSession, autoflush=False, expire_on_commit=False
+    )
+
+
 def get_db():
     """Dependency for getting database sessions."""
     db = SessionLocal()
@@ -22,3 +52,9 @@ def get_db():
         yield db
     finally:
         db.close()
+
+
+async def get_async_db():
+    """Dependency for getting async database sessions."""
+    async with AsyncSessionLocal() as db:
+        yield db
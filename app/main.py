@@ -3,7 +3,11 @@ from fastapi.middleware.cors import CORSMiddleware
 from fastapi.middleware.trustedhost import TrustedHostMiddleware
 from fastapi.responses import JSONResponse
 from app.core.config import settings
-from app.api import auth, photos, health
+from app.core.fast_json import FastJSONResponse, json_response_class
+from app.core.compression import CompressionMiddleware
+from app.core.rate_limit import RateLimitMiddleware
+from app.api import auth, photos, photographers, health, async_auth
+from app.api.sessions import ASYNC_SESSIONS, SYNC_SESSIONS
 from app.db.database import engine, Base
 import logging
 
@@ -25,8 +29,17 @@ app = FastAPI(
     docs_url="/api/docs",
     redoc_url="/api/redoc",
     openapi_url="/api/openapi.json",
+    default_response_class=FastJSONResponse if settings.FAST_JSON_ENABLED else JSONResponse,
 )
 
+# Response compression (innermost, so it sees the handler's response as-is)
+if settings.COMPRESSION_ENABLED:
+    app.add_middleware(CompressionMiddleware)
+
+# Rate limiting (added before CORS so preflight requests are not counted)
+if settings.RATE_LIMIT_ENABLED:
+    app.add_middleware(RateLimitMiddleware, exempt_paths=settings.RATE_LIMIT_EXEMPT_PATHS)
+
 # CORS Middleware
 app.add_middleware(
     CORSMiddleware,
@@ -37,9 +50,19 @@ app.add_middleware(
 )
 
 # Include routers
-app.include_router(health.router)
-app.include_router(auth.router)
-app.include_router(photos.router)
+app.include_router(health.router, default_response_class=json_response_class("health"))
+sessions = ASYNC_SESSIONS if settings.DATABASE_ASYNC else SYNC_SESSIONS
+app.include_router(
+    (async_auth if settings.DATABASE_ASYNC else auth).router,
+    default_response_class=json_response_class("auth"),
+)
+app.include_router(
+    photos.build_router(sessions), default_response_class=json_response_class("photos")
+)
+app.include_router(
+    photographers.build_router(sessions),
+    default_response_class=json_response_class("photographers"),
+)
 
 
 @app.get("/")
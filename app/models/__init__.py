@@ -1,4 +1,7 @@
 from app.models.user import User
+from app.models.photographer import Photographer
 from app.models.photo import Photo
+from app.models.ingest_checkpoint import IngestCheckpoint
+from app.models.photographer_stats import PhotographerStats
 
-__all__ = ["User", "Photo"]
+__all__ = ["User", "Photographer", "Photo", "IngestCheckpoint", "PhotographerStats"]
@@ -0,0 +1,18 @@
+from sqlalchemy import Column, Integer, BigInteger, String, DateTime
+from datetime import datetime
+from app.db.database import Base
+
+
+class IngestCheckpoint(Base):
+    """A chunk of an ingest source file that has been fully written."""
+
+    __tablename__ = "ingest_checkpoints"
+
+    source = Column(String, primary_key=True)
+    chunk_start = Column(BigInteger, primary_key=True)
+    chunk_end = Column(BigInteger, primary_key=True)
+    rows = Column(Integer, nullable=False)
+    completed_at = Column(DateTime, default=datetime.utcnow)
+
+    def __repr__(self):
+        return f"<IngestCheckpoint {self.source} [{self.chunk_start}, {self.chunk_end})>"
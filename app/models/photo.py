@@ -1,6 +1,22 @@
-from sqlalchemy import Column, Integer, String, DateTime, Index
+from sqlalchemy import (
+    Column,
+    Computed,
+    DateTime,
+    DDL,
+    Float,
+    ForeignKey,
+    Index,
+    Integer,
+    SmallInteger,
+    String,
+    event,
+    select,
+)
+from sqlalchemy.orm import column_property, validates
 from datetime import datetime
+from app.core.color import color_components
 from app.db.database import Base
+from app.models.photographer import Photographer
 
 
 class Photo(Base):
@@ -11,11 +27,23 @@ class Photo(Base):
     id = Column(Integer, primary_key=True, index=True)
     width = Column(Integer, nullable=False)
     height = Column(Integer, nullable=False)
+    # Derived from the dimensions by the database, so orientation, ratio and
+    # size filters are index scans instead of scans of idx_dimensions
+    aspect_ratio = Column(
+        Float, Computed("CAST(width AS DOUBLE PRECISION) / NULLIF(height, 0)", persisted=True)
+    )
+    megapixels = Column(
+        Float, Computed("CAST(width AS DOUBLE PRECISION) * height / 1000000", persisted=True)
+    )
     url = Column(String, nullable=False)
-    photographer = Column(String, nullable=False, index=True)
-    photographer_url = Column(String, nullable=False)
-    photographer_id = Column(Integer, nullable=False, index=True)
+    photographer_id = Column(Integer, ForeignKey("photographers.id"), nullable=False, index=True)
     avg_color = Column(String, nullable=True)
+    # RGB components of avg_color (see app.core.color), set alongside it (by
+    # the validator below, or explicitly by Core inserts and updates) so
+    # colour similarity is an index range scan rather than a hex parse per row
+    color_r = Column(SmallInteger, nullable=True)
+    color_g = Column(SmallInteger, nullable=True)
+    color_b = Column(SmallInteger, nullable=True)
 
     # Image sources
     src_original = Column(String, nullable=False)
@@ -29,14 +57,61 @@ class Photo(Base):
 
     # Metadata
     alt = Column(String, nullable=True, index=True)
+    # Digest of the source CSV row, used by delta ingest to skip unchanged rows
+    fingerprint = Column(String(32), nullable=True)
     created_at = Column(DateTime, default=datetime.utcnow, index=True)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
+    # Read-only photographer fields, loaded in the same SELECT by primary key
+    # lookups on photographers. Write them through PhotographerService.save.
+    photographer = column_property(
+        select(Photographer.name)
+        .where(Photographer.id == photographer_id)
+        .correlate_except(Photographer)
+        .scalar_subquery()
+    )
+    photographer_url = column_property(
+        select(Photographer.url)
+        .where(Photographer.id == photographer_id)
+        .correlate_except(Photographer)
+        .scalar_subquery()
+    )
+
     # Composite indexes for common queries
     __table_args__ = (
-        Index("idx_photographer_created", "photographer", "created_at"),
         Index("idx_dimensions", "width", "height"),
+        # Keyset pagination seeks on (created_at, id)
+        Index("idx_created_id", "created_at", "id"),
+        Index("idx_photographer_id_created_id", "photographer_id", "created_at", "id"),
+        # Colour similarity ranges over color_r and checks green and blue in the index
+        Index("idx_color_rgb", "color_r", "color_g", "color_b"),
+        Index("idx_aspect_ratio", "aspect_ratio"),
+        # Lists sorted by a column other than created_at seek on (column, id)
+        Index("idx_width_id", "width", "id"),
+        Index("idx_height_id", "height", "id"),
+        Index("idx_megapixels_id", "megapixels", "id"),
+        # Trigram indexes let PostgreSQL serve ILIKE '%term%' without a sequential scan
+        Index(
+            "idx_alt_trgm",
+            "alt",
+            postgresql_using="gin",
+            postgresql_ops={"alt": "gin_trgm_ops"},
+        ).ddl_if(dialect="postgresql"),
     )
 
+    @validates("avg_color")
+    def _set_color_components(self, key, avg_color):
+        """Keep color_r/g/b in step with avg_color on ORM writes."""
+        for column, component in color_components(avg_color).items():
+            setattr(self, column, component)
+        return avg_color
+
     def __repr__(self):
         return f"<Photo {self.id} by {self.photographer}>"
+
+
+event.listen(
+    Photo.__table__,
+    "before_create",
+    DDL("CREATE EXTENSION IF NOT EXISTS pg_trgm").execute_if(dialect="postgresql"),
+)
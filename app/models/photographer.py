@@ -0,0 +1,41 @@
+from sqlalchemy import Column, Integer, String, Index, DDL, event
+from app.db.database import Base
+
+# Photo fields stored on photographers rather than photos -> photographers column
+PHOTOGRAPHER_FIELDS = {"photographer": "name", "photographer_url": "url"}
+
+
+class Photographer(Base):
+    """
+    A Pexels photographer, referenced by Photo.photographer_id.
+
+    Names and URLs live here once instead of being repeated on every photo;
+    Photo exposes them as read-only `photographer` / `photographer_url`.
+    """
+
+    __tablename__ = "photographers"
+
+    # Pexels' photographer id, not generated locally
+    id = Column(Integer, primary_key=True, autoincrement=False)
+    name = Column(String, nullable=False, index=True)
+    url = Column(String, nullable=False)
+
+    __table_args__ = (
+        # Lets PostgreSQL serve the photographer ILIKE '%term%' filter from an index
+        Index(
+            "idx_photographers_name_trgm",
+            "name",
+            postgresql_using="gin",
+            postgresql_ops={"name": "gin_trgm_ops"},
+        ).ddl_if(dialect="postgresql"),
+    )
+
+    def __repr__(self):
+        return f"<Photographer {self.id}: {self.name}>"
+
+
+event.listen(
+    Photographer.__table__,
+    "before_create",
+    DDL("CREATE EXTENSION IF NOT EXISTS pg_trgm").execute_if(dialect="postgresql"),
+)
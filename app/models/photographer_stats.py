@@ -0,0 +1,44 @@
+from sqlalchemy import Column, Integer, DateTime, Float, ForeignKey, select
+from sqlalchemy.orm import column_property
+from datetime import datetime
+from app.db.database import Base
+from app.models.photographer import Photographer
+
+
+class PhotographerStats(Base):
+    """
+    Per-photographer summary of the photos table.
+
+    Maintained by PhotographerService from every photo write path and the
+    ingest scripts; scripts/rebuild_photographer_stats.py recomputes it from
+    scratch.
+    """
+
+    __tablename__ = "photographer_stats"
+
+    photographer_id = Column(Integer, ForeignKey("photographers.id"), primary_key=True)
+    photo_count = Column(Integer, nullable=False, index=True)
+    latest_created_at = Column(DateTime, nullable=True, index=True)
+    min_width = Column(Integer, nullable=False)
+    max_width = Column(Integer, nullable=False)
+    avg_width = Column(Float, nullable=False)
+    min_height = Column(Integer, nullable=False)
+    max_height = Column(Integer, nullable=False)
+    avg_height = Column(Float, nullable=False)
+    refreshed_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+
+    photographer = column_property(
+        select(Photographer.name)
+        .where(Photographer.id == photographer_id)
+        .correlate_except(Photographer)
+        .scalar_subquery()
+    )
+    photographer_url = column_property(
+        select(Photographer.url)
+        .where(Photographer.id == photographer_id)
+        .correlate_except(Photographer)
+        .scalar_subquery()
+    )
+
+    def __repr__(self):
+        return f"<PhotographerStats {self.photographer_id}: {self.photo_count} photos>"
@@ -1,5 +1,6 @@
 from app.schemas.user import UserCreate, UserResponse, UserLogin, Token
 from app.schemas.photo import PhotoCreate, PhotoResponse, PhotoUpdate, PhotoList
+from app.schemas.photographer import PhotographerResponse, PhotographerList
 
 __all__ = [
     "UserCreate",
@@ -10,4 +11,6 @@ __all__ = [
     "PhotoResponse",
     "PhotoUpdate",
     "PhotoList",
+    "PhotographerResponse",
+    "PhotographerList",
 ]
@@ -1,6 +1,10 @@
 from pydantic import BaseModel, Field, HttpUrl
 from datetime import datetime
-from typing import Optional, List
+from typing import Literal, Optional, List
+from app.core.config import settings
+
+# "atomic" applies all items or none; "partial" applies every item that can be
+BulkMode = Literal["atomic", "partial"]
 
 
 class PhotoBase(BaseModel):
@@ -64,12 +68,96 @@ class PhotoResponse(PhotoCreate):
 class PhotoList(BaseModel):
     """Schema for paginated photo list."""
 
-    total: int
-    page: int
+    total: Optional[int] = None
+    total_is_estimate: bool = False
+    page: Optional[int] = None
     page_size: int
+    next_cursor: Optional[str] = None
     photos: List[PhotoResponse]
 
 
+class PhotoBatchItem(BaseModel):
+    """Result for one requested id of a batch lookup."""
+
+    id: int
+    found: bool
+    photo: Optional[PhotoResponse] = None
+
+
+class PhotoBatch(BaseModel):
+    """Schema for a batch lookup, one result per requested id in request order."""
+
+    results: List[PhotoBatchItem]
+
+
+class PhotoColorMatch(BaseModel):
+    """A photo and the RGB distance of its average colour from the requested one."""
+
+    distance: float
+    photo: PhotoResponse
+
+
+class PhotoSimilarColor(BaseModel):
+    """Schema for a colour similarity lookup, nearest photos first."""
+
+    color: str
+    tolerance: int
+    results: List[PhotoColorMatch]
+
+
+class PhotoBulkCreateItem(PhotoCreate):
+    """A photo to create; give an id to upsert a known photo."""
+
+    id: Optional[int] = Field(None, gt=0)
+
+
+class PhotoBulkCreate(BaseModel):
+    """Schema for bulk create/upsert."""
+
+    items: List[PhotoBulkCreateItem] = Field(..., min_length=1, max_length=settings.MAX_BULK_ITEMS)
+    mode: BulkMode = "atomic"
+    # What to do with items whose id already exists
+    on_conflict: Literal["error", "update"] = "error"
+
+
+class PhotoBulkUpdateItem(PhotoUpdate):
+    """A partial update of one photo."""
+
+    id: int
+
+
+class PhotoBulkUpdate(BaseModel):
+    """Schema for bulk partial updates."""
+
+    items: List[PhotoBulkUpdateItem] = Field(..., min_length=1, max_length=settings.MAX_BULK_ITEMS)
+    mode: BulkMode = "atomic"
+
+
+class PhotoBulkDelete(BaseModel):
+    """Schema for bulk deletes."""
+
+    ids: List[int] = Field(..., min_length=1, max_length=settings.MAX_BULK_ITEMS)
+    mode: BulkMode = "atomic"
+
+
+class PhotoBulkItemResult(BaseModel):
+    """Outcome of one item of a bulk request."""
+
+    index: int
+    id: Optional[int] = None
+    status: str
+    detail: Optional[str] = None
+
+
+class PhotoBulkResult(BaseModel):
+    """Schema for bulk write responses, one result per item in request order."""
+
+    applied: bool
+    succeeded: int
+    failed: int
+    results: List[PhotoBulkItemResult]
+
+
 class PhotoFilter(BaseModel):
     """Schema for photo filtering."""
 
@@ -79,3 +167,23 @@ class PhotoFilter(BaseModel):
     min_height: Optional[int] = None
     max_height: Optional[int] = None
     search: Optional[str] = None
+    orientation: Optional[Literal["landscape", "portrait", "square"]] = None
+    # width / height, matched within ASPECT_RATIO_TOLERANCE
+    aspect_ratio: Optional[float] = None
+    min_ratio: Optional[float] = None
+    max_ratio: Optional[float] = None
+    min_megapixels: Optional[float] = None
+    max_megapixels: Optional[float] = None
+    # "#rrggbb" and the largest RGB distance from it
+    color: Optional[str] = None
+    tolerance: Optional[int] = None
+
+    def cache_key(self) -> tuple:
+        """Return a hashable key that is equal for filters matching the same rows."""
+        key = []
+        for field, value in sorted(self.model_dump(exclude_none=True).items()):
+            if isinstance(value, str):
+                # ILIKE matching is case-insensitive
+                value = value.lower()
+            key.append((field, value))
+        return tuple(key)
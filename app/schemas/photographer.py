@@ -0,0 +1,31 @@
+from pydantic import BaseModel
+from datetime import datetime
+from typing import List, Optional
+
+
+class PhotographerResponse(BaseModel):
+    """Schema for a photographer and the summary of their photos."""
+
+    photographer_id: int
+    photographer: str
+    photographer_url: str
+    photo_count: int
+    latest_created_at: Optional[datetime] = None
+    min_width: int
+    max_width: int
+    avg_width: float
+    min_height: int
+    max_height: int
+    avg_height: float
+
+    class Config:
+        from_attributes = True
+
+
+class PhotographerList(BaseModel):
+    """Schema for paginated photographer list."""
+
+    total: int
+    page: int
+    page_size: int
+    photographers: List[PhotographerResponse]
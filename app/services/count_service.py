@@ -0,0 +1,100 @@
+from sqlalchemy.orm import Session, Query
+from sqlalchemy import func, text
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.sql.elements import TextClause
+from typing import Hashable, Optional
+import json
+import logging
+from app.core.cache import TTLCache
+from app.core.config import settings
+from app.models.photo import Photo
+
+logger = logging.getLogger(__name__)
+
+
+class CountService:
+    """
+    Service for resolving list totals without a COUNT(*) on every request.
+
+    Totals are cached per normalized filter and dropped whenever photos are
+    written. On PostgreSQL, large totals can come from planner statistics
+    instead of an exact count, depending on TOTAL_COUNT_STRATEGY.
+    """
+
+    _cache = TTLCache(
+        maxsize=settings.TOTAL_COUNT_CACHE_SIZE,
+        ttl=settings.TOTAL_COUNT_CACHE_TTL_SECONDS,
+    )
+
+    @staticmethod
+    def get_total(db: Session, query: Query, key: Hashable) -> tuple[int, bool]:
+        """
+        Get the number of rows matched by query.
+
+        Returns a (total, is_estimate) tuple. key must identify the filter the
+        query was built from.
+        """
+        cached = CountService._cache.get(key)
+        if cached is not None:
+            return cached
+
+        result = None
+        strategy = settings.TOTAL_COUNT_STRATEGY
+        if strategy != "exact" and db.get_bind().dialect.name == "postgresql":
+            estimate = CountService._estimate(db, query, unfiltered=not key)
+            if estimate is not None and (
+                strategy == "estimate" or estimate >= settings.TOTAL_COUNT_ESTIMATE_THRESHOLD
+            ):
+                result = (estimate, True)
+
+        if result is None:
+            total = query.order_by(None).with_entities(func.count(Photo.id)).scalar()
+            result = (total, False)
+
+        CountService._cache.set(key, result)
+        return result
+
+    @staticmethod
+    def invalidate() -> None:
+        """Drop all cached totals after photos were created, updated or deleted."""
+        CountService._cache.clear()
+
+    @staticmethod
+    def stats() -> dict:
+        """Return hit/miss counters for the totals cache."""
+        return CountService._cache.stats()
+
+    @staticmethod
+    def _explain(query: Query) -> TextClause:
+        """
+        EXPLAIN (FORMAT JSON) of query's count, with its values as bound parameters.
+
+        The SQL is rendered with named placeholders and rebound through
+        text(), so the executing driver applies its own paramstyle
+        (psycopg2's %(name)s, asyncpg's $1, ...).
+        """
+        compiled = query.order_by(None).statement.compile(
+            dialect=postgresql.dialect(paramstyle="named"),
+            compile_kwargs={"render_postcompile": True},
+        )
+        return text(f"EXPLAIN (FORMAT JSON) {compiled}").bindparams(**compiled.params)
+
+    @staticmethod
+    def _estimate(db: Session, query: Query, unfiltered: bool) -> Optional[int]:
+        """Estimate the row count from PostgreSQL planner statistics."""
+        try:
+            if unfiltered:
+                reltuples = db.execute(
+                    text("SELECT reltuples::bigint FROM pg_class WHERE oid = 'photos'::regclass")
+                ).scalar()
+                # reltuples is -1 until the table has been vacuumed or analyzed
+                return int(reltuples) if reltuples is not None and reltuples >= 0 else None
+
+            with db.begin_nested():
+                plan = db.execute(CountService._explain(query)).scalar()
+            if isinstance(plan, str):
+                plan = json.loads(plan)
+            return int(plan[0]["Plan"]["Plan Rows"])
+        except Exception as e:
+            logger.warning(f"Could not estimate photo count: {e}")
+            return None
@@ -0,0 +1,109 @@
+import csv
+import io
+import json
+from typing import AsyncIterator, Iterator, List, Optional, Sequence
+from sqlalchemy.engine import Engine, Row
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession
+from sqlalchemy.orm import Session
+from sqlalchemy.sql import Select
+from app.core.config import settings
+from app.core.projection import select_photo_fields
+from app.models.photo import Photo
+from app.schemas.photo import PhotoFilter
+from app.services.photo_service import PhotoService
+
+# photos.csv header -> photo field, in file order
+PHOTOS_CSV_COLUMNS = {
+    "id": "id",
+    "width": "width",
+    "height": "height",
+    "url": "url",
+    "photographer": "photographer",
+    "photographer_url": "photographer_url",
+    "photographer_id": "photographer_id",
+    "avg_color": "avg_color",
+    "src.original": "src_original",
+    "src.large2x": "src_large2x",
+    "src.large": "src_large",
+    "src.medium": "src_medium",
+    "src.small": "src_small",
+    "src.portrait": "src_portrait",
+    "src.landscape": "src_landscape",
+    "src.tiny": "src_tiny",
+    "alt": "alt",
+}
+
+# NDJSON records carry the same fields as PhotoResponse
+NDJSON_COLUMNS = [
+    *PHOTOS_CSV_COLUMNS.values(),
+    "created_at",
+    "updated_at",
+]
+
+EXPORT_MEDIA_TYPES = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv; charset=utf-8",
+}
+
+
+class ExportService:
+    """
+    Streams the photo catalogue as NDJSON or CSV.
+
+    Rows are read through a server-side cursor in batches of
+    EXPORT_BATCH_SIZE and each batch is encoded into one chunk, so memory per
+    export is constant however many rows match. The stream opens its own
+    session because it outlives the request's dependencies.
+    """
+
+    @staticmethod
+    def _statement(filters: Optional[PhotoFilter], fmt: str) -> Select:
+        columns = NDJSON_COLUMNS if fmt == "ndjson" else list(PHOTOS_CSV_COLUMNS.values())
+        return (
+            select_photo_fields(columns)
+            .where(*PhotoService.filter_conditions(filters))
+            .order_by(Photo.id)
+            .execution_options(yield_per=settings.EXPORT_BATCH_SIZE)
+        )
+
+    @staticmethod
+    def _encode(rows: Sequence[Row], fmt: str) -> bytes:
+        """Encode one batch of rows."""
+        if fmt == "ndjson":
+            return "".join(
+                json.dumps(row._asdict(), default=lambda v: v.isoformat()) + "\n"
+                for row in rows
+            ).encode("utf-8")
+
+        buffer = io.StringIO()
+        csv.writer(buffer).writerows(rows)
+        return buffer.getvalue().encode("utf-8")
+
+    @staticmethod
+    def _header(fmt: str) -> List[bytes]:
+        if fmt != "csv":
+            return []
+        buffer = io.StringIO()
+        csv.writer(buffer).writerow(PHOTOS_CSV_COLUMNS)
+        return [buffer.getvalue().encode("utf-8")]
+
+    @staticmethod
+    def stream(bind: Engine, filters: Optional[PhotoFilter], fmt: str) -> Iterator[bytes]:
+        """Yield the export in chunks of one batch each."""
+        yield from ExportService._header(fmt)
+        with Session(bind=bind) as session:
+            result = session.execute(ExportService._statement(filters, fmt))
+            for rows in result.partitions():
+                yield ExportService._encode(rows, fmt)
+
+    @staticmethod
+    async def stream_async(
+        bind: AsyncEngine, filters: Optional[PhotoFilter], fmt: str
+    ) -> AsyncIterator[bytes]:
+        """Async counterpart of stream for AsyncEngine."""
+        for chunk in ExportService._header(fmt):
+            yield chunk
+        async with AsyncSession(bind=bind) as session:
+            result = await session.stream(ExportService._statement(filters, fmt))
+            async for rows in result.partitions():
+                yield ExportService._encode(rows, fmt)
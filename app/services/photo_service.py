@@ -1,9 +1,96 @@
 from sqlalchemy.orm import Session
-from sqlalchemy import or_, and_
+from sqlalchemy import or_, and_, tuple_, case, func, select, insert, update, delete
+from sqlalchemy.engine import Row
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.sql import ColumnElement, Select
 from fastapi import HTTPException, status
-from typing import List, Optional
+from datetime import datetime
+import math
+from typing import Callable, Dict, Iterable, List, NamedTuple, Optional, Set, Tuple
 from app.models.photo import Photo
-from app.schemas.photo import PhotoCreate, PhotoUpdate, PhotoFilter
+from app.models.photographer import Photographer
+from app.schemas.photo import (
+    PhotoBulkCreateItem,
+    PhotoBulkUpdateItem,
+    PhotoCreate,
+    PhotoFilter,
+    PhotoUpdate,
+)
+from app.core.color import RGB, color_components, parse_hex_color, rank_by_distance
+from app.core.config import settings
+from app.core.pagination import encode_cursor, decode_cursor
+from app.core.projection import load_only_fields, photo_select
+from app.core.response_cache import photo_response_cache
+from app.services.count_service import CountService
+from app.services.photographer_service import PhotographerService
+
+
+class PhotoPage(NamedTuple):
+    """
+    One page of photos plus the metadata returned alongside it.
+
+    photos are Core rows of photo_select(fields), not ORM objects.
+    """
+
+    photos: List[Row]
+    total: Optional[int]
+    total_is_estimate: bool
+    next_cursor: Optional[str]
+
+
+class BulkItemResult(NamedTuple):
+    """Outcome of one item of a bulk write."""
+
+    index: int
+    id: Optional[int]
+    status: str
+    detail: Optional[str] = None
+
+
+class BulkOutcome(NamedTuple):
+    """Per-item results of a bulk write and whether anything was written."""
+
+    applied: bool
+    results: List[BulkItemResult]
+
+    def as_response(self) -> dict:
+        """Body of a PhotoBulkResult response."""
+        succeeded = sum(r.status in BULK_SUCCESS_STATUSES for r in self.results)
+        return {
+            "applied": self.applied,
+            "succeeded": succeeded if self.applied else 0,
+            "failed": sum(r.status not in BULK_SUCCESS_STATUSES | {"skipped"} for r in self.results),
+            "results": [r._asdict() for r in self.results],
+        }
+
+
+# Statuses of items that were (or, in atomic mode, would have been) written
+BULK_SUCCESS_STATUSES = {"created", "updated", "deleted"}
+
+PHOTOGRAPHER_NOT_FOUND = (
+    "Photographer not found; include photographer and photographer_url to create it"
+)
+
+# (photographer_id, name, url) requested by one write; None keeps the stored value
+PhotographerChange = Tuple[int, Optional[str], Optional[str]]
+
+# ?orientation= values as conditions on the indexed aspect_ratio column
+ORIENTATIONS = {
+    "landscape": Photo.aspect_ratio > 1,
+    "portrait": Photo.aspect_ratio < 1,
+    "square": Photo.aspect_ratio == 1,
+}
+
+# ?sort= columns for list pages. Each is paired with id as a tiebreaker and
+# backed by a (column, id) index (the primary key for id), so pages and
+# cursor seeks read the index in order instead of sorting the matches.
+PHOTO_SORTS = {
+    "created_at": Photo.created_at,
+    "id": Photo.id,
+    "width": Photo.width,
+    "height": Photo.height,
+    "megapixels": Photo.megapixels,
+}
 
 
 class PhotoService:
@@ -11,17 +98,36 @@ class PhotoService:
 
     @staticmethod
     def create_photo(db: Session, photo_data: PhotoCreate) -> Photo:
-        """Create a new photo."""
-        photo = Photo(**photo_data.model_dump())
+        """
+        Create a new photo, creating its photographer if the id is new.
+
+        An existing photographer keeps their name and URL; renames go through
+        update_photo.
+        """
+        values = photo_data.model_dump(exclude={"photographer", "photographer_url"})
+        PhotographerService.save(
+            db,
+            {photo_data.photographer_id: (photo_data.photographer, photo_data.photographer_url)},
+            overwrite=False,
+        )
+        photo = Photo(**values)
         db.add(photo)
+        db.flush()
+        PhotographerService.refresh(db, [photo.photographer_id])
         db.commit()
         db.refresh(photo)
+        PhotoService._invalidate_caches()
         return photo
 
     @staticmethod
-    def get_photo_by_id(db: Session, photo_id: int) -> Photo:
-        """Get photo by ID."""
-        photo = db.query(Photo).filter(Photo.id == photo_id).first()
+    def get_photo_by_id(
+        db: Session, photo_id: int, fields: Optional[Tuple[str, ...]] = None
+    ) -> Photo:
+        """Get photo by ID, loading only the given fields if set."""
+        query = db.query(Photo).filter(Photo.id == photo_id)
+        if fields:
+            query = query.options(load_only_fields(fields))
+        photo = query.first()
         if not photo:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
@@ -29,63 +135,268 @@ class PhotoService:
             )
         return photo
 
+    @staticmethod
+    def get_photos_by_ids(db: Session, photo_ids: List[int]) -> List[Optional[Row]]:
+        """
+        Get many photos with one query.
+
+        Returns one row of photo_select() per requested id, in request order,
+        with None for ids that do not exist.
+        """
+        rows = db.execute(PhotoService._ids_statement(photo_ids))
+        by_id = {row.id: row for row in rows}
+        return [by_id.get(photo_id) for photo_id in photo_ids]
+
+    @staticmethod
+    def _ids_statement(photo_ids: List[int]) -> Select:
+        """Core select of the photos with the given ids."""
+        return photo_select().where(Photo.__table__.c.id.in_(set(photo_ids)))
+
     @staticmethod
     def get_photos(
         db: Session,
         skip: int = 0,
         limit: int = 20,
         filters: Optional[PhotoFilter] = None,
-    ) -> tuple[List[Photo], int]:
-        """Get list of photos with optional filtering."""
-        query = db.query(Photo)
-
-        # Apply filters if provided
-        if filters:
-            if filters.photographer:
-                query = query.filter(
-                    Photo.photographer.ilike(f"%{filters.photographer}%")
+        cursor: Optional[str] = None,
+        include_total: bool = True,
+        sort: str = "created_at",
+        order: str = "desc",
+        fields: Optional[Tuple[str, ...]] = None,
+    ) -> PhotoPage:
+        """
+        Get list of photos with optional filtering.
+
+        When a cursor is given, skip is ignored and the page starts right after
+        the row the cursor points at. The total is skipped entirely when
+        include_total is False. sort is one of PHOTO_SORTS, in the given
+        order, or "relevance", which orders by how well the search term
+        matches (best first, whatever the order) and only supports offset
+        pagination. fields restricts the columns selected for each photo.
+        """
+        rank = None
+        if sort == "relevance":
+            if not (filters and filters.search):
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail="Sorting by relevance requires a search term",
+                )
+            if cursor:
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail="Cursor pagination is not supported when sorting by relevance",
                 )
+            rank = PhotoService._search_rank(db, filters.search)
+
+        conditions = PhotoService.filter_conditions(filters)
+
+        # Get total count
+        total, total_is_estimate = None, False
+        if include_total:
+            key = filters.cache_key() if filters else ()
+            query = db.query(Photo).filter(*conditions)
+            total, total_is_estimate = CountService.get_total(db, query, key)
 
-            if filters.min_width:
-                query = query.filter(Photo.width >= filters.min_width)
+        # Get paginated results
+        photos, next_cursor = PhotoService._paginate(
+            db,
+            conditions,
+            skip,
+            limit,
+            cursor,
+            rank=rank,
+            fields=fields,
+            sort="created_at" if rank is not None else sort,
+            order="desc" if rank is not None else order,
+        )
 
-            if filters.max_width:
-                query = query.filter(Photo.width <= filters.max_width)
+        return PhotoPage(photos, total, total_is_estimate, next_cursor)
 
-            if filters.min_height:
-                query = query.filter(Photo.height >= filters.min_height)
+    @staticmethod
+    def filter_conditions(filters: Optional[PhotoFilter]) -> List[ColumnElement]:
+        """WHERE clauses for a PhotoFilter, usable with Query.filter or select().where."""
+        conditions = []
+        if not filters:
+            return conditions
 
-            if filters.max_height:
-                query = query.filter(Photo.height <= filters.max_height)
+        if filters.photographer or filters.search:
+            conditions.append(PhotoService._photographer_join())
 
-            if filters.search:
-                search_term = f"%{filters.search}%"
-                query = query.filter(
-                    or_(
-                        Photo.alt.ilike(search_term),
-                        Photo.photographer.ilike(search_term),
-                    )
+        if filters.photographer:
+            conditions.append(Photographer.name.ilike(f"%{filters.photographer}%"))
+
+        if filters.min_width:
+            conditions.append(Photo.width >= filters.min_width)
+
+        if filters.max_width:
+            conditions.append(Photo.width <= filters.max_width)
+
+        if filters.min_height:
+            conditions.append(Photo.height >= filters.min_height)
+
+        if filters.max_height:
+            conditions.append(Photo.height <= filters.max_height)
+
+        if filters.orientation:
+            conditions.append(ORIENTATIONS[filters.orientation])
+
+        if filters.aspect_ratio:
+            tolerance = filters.aspect_ratio * settings.ASPECT_RATIO_TOLERANCE
+            conditions.append(
+                Photo.aspect_ratio.between(
+                    filters.aspect_ratio - tolerance, filters.aspect_ratio + tolerance
                 )
+            )
 
-        # Get total count
-        total = query.count()
+        if filters.min_ratio:
+            conditions.append(Photo.aspect_ratio >= filters.min_ratio)
 
-        # Get paginated results
-        photos = query.order_by(Photo.created_at.desc()).offset(skip).limit(limit).all()
+        if filters.max_ratio:
+            conditions.append(Photo.aspect_ratio <= filters.max_ratio)
+
+        if filters.min_megapixels:
+            conditions.append(Photo.megapixels >= filters.min_megapixels)
+
+        if filters.max_megapixels:
+            conditions.append(Photo.megapixels <= filters.max_megapixels)
+
+        if filters.search:
+            search_term = f"%{filters.search}%"
+            conditions.append(
+                or_(
+                    Photo.alt.ilike(search_term),
+                    Photographer.name.ilike(search_term),
+                )
+            )
+
+        if filters.color:
+            conditions.extend(
+                PhotoService._color_conditions(parse_hex_color(filters.color), filters.tolerance)
+            )
+
+        return conditions
+
+    @staticmethod
+    def _color_distance_squared(rgb: RGB) -> ColumnElement:
+        """Squared RGB distance between a photo's average colour and rgb."""
+        r, g, b = rgb
+        return (
+            (Photo.color_r - r) * (Photo.color_r - r)
+            + (Photo.color_g - g) * (Photo.color_g - g)
+            + (Photo.color_b - b) * (Photo.color_b - b)
+        )
+
+    @staticmethod
+    def _color_conditions(rgb: RGB, tolerance: int) -> List[ColumnElement]:
+        """
+        Photos whose average colour is within tolerance of rgb.
+
+        The bounding cube is a range scan of idx_color_rgb; the exact
+        distance check then only runs on the rows inside it.
+        """
+        columns = (Photo.color_r, Photo.color_g, Photo.color_b)
+        return [
+            *(
+                column.between(component - tolerance, component + tolerance)
+                for column, component in zip(columns, rgb)
+            ),
+            PhotoService._color_distance_squared(rgb) <= tolerance * tolerance,
+        ]
+
+    @staticmethod
+    def get_similar_color(
+        db: Session,
+        filters: PhotoFilter,
+        limit: int = 20,
+        fields: Optional[Tuple[str, ...]] = None,
+    ) -> List[Tuple[float, Row]]:
+        """
+        Get the photos whose average colour is nearest filters.color.
+
+        Only photos within filters.tolerance (and matching the other filters)
+        are considered. Returns (distance, row of photo_select(fields)) pairs,
+        nearest first. PostgreSQL ranks in SQL; other databases fetch the
+        candidates' colour components and rank them in memory with
+        rank_by_distance.
+        """
+        rgb = parse_hex_color(filters.color)
+        conditions = PhotoService.filter_conditions(filters)
+
+        if db.get_bind().dialect.name == "postgresql":
+            distance = PhotoService._color_distance_squared(rgb)
+            ranked = [
+                (row.id, math.sqrt(row.distance))
+                for row in db.execute(
+                    select(Photo.id, distance.label("distance"))
+                    .where(*conditions)
+                    .order_by(distance, Photo.id)
+                    .limit(limit)
+                )
+            ]
+        else:
+            candidates = db.execute(
+                select(Photo.id, Photo.color_r, Photo.color_g, Photo.color_b).where(*conditions)
+            ).all()
+            ranked = rank_by_distance(candidates, rgb, limit)
+
+        if not ranked:
+            return []
+        rows = db.execute(
+            photo_select(fields).where(Photo.__table__.c.id.in_([i for i, _ in ranked]))
+        )
+        by_id = {row.id: row for row in rows}
+        return [(distance, by_id[i]) for i, distance in ranked if i in by_id]
+
+    @staticmethod
+    def _photographer_join() -> ColumnElement:
+        """
+        Join condition that lets filters match on the photo's photographer.
 
-        return photos, total
+        An inner join, not `photographer_id IN (...)`, so the planner can
+        still walk the sort index and stop after limit + 1 matches for
+        common names (the IN form fetched and sorted every photo of every
+        matching photographer first) while rejecting non-matching rows
+        cheaply for rare ones. Each photo has exactly one photographer, so
+        the join never duplicates rows.
+        """
+        return Photographer.id == Photo.photographer_id
 
     @staticmethod
     def update_photo(db: Session, photo_id: int, photo_data: PhotoUpdate) -> Photo:
-        """Update a photo."""
+        """
+        Update a photo.
+
+        A new photographer name or URL renames the photographer, for all
+        their photos.
+        """
         photo = PhotoService.get_photo_by_id(db, photo_id)
+        previous_photographer_id = photo.photographer_id
+
+        update_data = photo_data.model_dump(
+            exclude_unset=True, exclude={"photographer", "photographer_url"}
+        )
+        if PhotoService._changes_photographer(photo_data):
+            change = (
+                photo_data.photographer_id or photo.photographer_id,
+                photo_data.photographer,
+                photo_data.photographer_url,
+            )
+            photographers, unknown = PhotoService._resolve_photographers(db, {0: change})
+            if unknown:
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail=PHOTOGRAPHER_NOT_FOUND,
+                )
+            PhotographerService.save(db, photographers)
 
-        update_data = photo_data.model_dump(exclude_unset=True)
         for field, value in update_data.items():
             setattr(photo, field, value)
 
+        db.flush()
+        PhotographerService.refresh(db, {previous_photographer_id, photo.photographer_id})
         db.commit()
         db.refresh(photo)
+        PhotoService._invalidate_caches()
         return photo
 
     @staticmethod
@@ -93,14 +404,390 @@ class PhotoService:
         """Delete a photo."""
         photo = PhotoService.get_photo_by_id(db, photo_id)
         db.delete(photo)
+        db.flush()
+        PhotographerService.refresh(db, [photo.photographer_id])
         db.commit()
+        PhotoService._invalidate_caches()
+
+    @staticmethod
+    def bulk_create(
+        db: Session,
+        items: List[PhotoBulkCreateItem],
+        atomic: bool = True,
+        on_conflict: str = "error",
+    ) -> BulkOutcome:
+        """
+        Create many photos; items with an existing id are a conflict, or are
+        overwritten when on_conflict is "update".
+
+        Existing ids are looked up with one query and rows are written with
+        executemany INSERT/UPDATE statements in a single transaction. As in
+        create_photo, existing photographers are not renamed.
+        """
+        existing = PhotoService._existing_ids(db, [i.id for i in items if i.id is not None])
+        duplicates = PhotoService._duplicate_indexes(item.id for item in items)
+        photographer_ids = {item.photographer_id for item in items}
+        if on_conflict == "update":
+            photographer_ids |= PhotoService._photographer_ids(db, existing)
+        now = datetime.utcnow()
+
+        results, inserts, inserts_with_id, updates = [], [], [], []
+        for index, item in enumerate(items):
+            values = item.model_dump(exclude={"id", "photographer", "photographer_url"})
+            values.update(color_components(values["avg_color"]))
+            if index in duplicates:
+                results.append(PhotoService._duplicate(index, item.id))
+            elif item.id is None:
+                inserts.append((index, {**values, "created_at": now, "updated_at": now}))
+                results.append(BulkItemResult(index, None, "created"))
+            elif item.id not in existing:
+                inserts_with_id.append(
+                    {**values, "id": item.id, "created_at": now, "updated_at": now}
+                )
+                results.append(BulkItemResult(index, item.id, "created"))
+            elif on_conflict == "update":
+                updates.append({**values, "id": item.id, "updated_at": now})
+                results.append(BulkItemResult(index, item.id, "updated"))
+            else:
+                results.append(BulkItemResult(index, item.id, "conflict", "Photo already exists"))
+
+        # Later items win when several name the same photographer
+        photographers = {
+            item.photographer_id: (item.photographer, item.photographer_url)
+            for item, result in zip(items, results)
+            if result.status in BULK_SUCCESS_STATUSES
+        }
+
+        def write() -> None:
+            PhotographerService.save(db, photographers, overwrite=False)
+            if inserts:
+                new_ids = db.scalars(
+                    insert(Photo).returning(Photo.id, sort_by_parameter_order=True),
+                    [values for _, values in inserts],
+                ).all()
+                for (index, _), photo_id in zip(inserts, new_ids):
+                    results[index] = results[index]._replace(id=photo_id)
+            if inserts_with_id:
+                db.execute(insert(Photo), inserts_with_id)
+            if updates:
+                db.execute(update(Photo), updates)
+
+        return PhotoService._apply_bulk(db, results, atomic, write, photographer_ids)
+
+    @staticmethod
+    def bulk_update(
+        db: Session, items: List[PhotoBulkUpdateItem], atomic: bool = True
+    ) -> BulkOutcome:
+        """
+        Apply partial updates to many photos with one UPDATE executemany.
+
+        New photographer names or URLs rename the photographer, as in
+        update_photo.
+        """
+        existing = PhotoService._existing_ids(db, [item.id for item in items])
+        duplicates = PhotoService._duplicate_indexes(item.id for item in items)
+        current = PhotoService._photographer_by_photo(db, existing)
+        photographer_ids = set(current.values()) | {
+            item.photographer_id for item in items if item.photographer_id is not None
+        }
+        now = datetime.utcnow()
+
+        changes = {
+            index: (
+                item.photographer_id or current[item.id],
+                item.photographer,
+                item.photographer_url,
+            )
+            for index, item in enumerate(items)
+            if index not in duplicates
+            and item.id in existing
+            and PhotoService._changes_photographer(item)
+        }
+        photographers, unknown = PhotoService._resolve_photographers(db, changes)
+
+        results, updates = [], []
+        for index, item in enumerate(items):
+            if index in duplicates:
+                results.append(PhotoService._duplicate(index, item.id))
+            elif item.id not in existing:
+                results.append(BulkItemResult(index, item.id, "not_found", "Photo not found"))
+            elif index in unknown:
+                results.append(
+                    BulkItemResult(index, item.id, "not_found", PHOTOGRAPHER_NOT_FOUND)
+                )
+            else:
+                values = item.model_dump(
+                    exclude_unset=True, exclude={"photographer", "photographer_url"}
+                )
+                if "avg_color" in values:
+                    values.update(color_components(values["avg_color"]))
+                updates.append({**values, "updated_at": now})
+                results.append(BulkItemResult(index, item.id, "updated"))
+
+        def write() -> None:
+            PhotographerService.save(db, photographers)
+            if updates:
+                db.execute(update(Photo), updates)
+
+        return PhotoService._apply_bulk(db, results, atomic, write, photographer_ids)
+
+    @staticmethod
+    def bulk_delete(db: Session, photo_ids: List[int], atomic: bool = True) -> BulkOutcome:
+        """Delete many photos with one DELETE ... WHERE id IN (...)."""
+        existing = PhotoService._existing_ids(db, photo_ids)
+        duplicates = PhotoService._duplicate_indexes(photo_ids)
+        photographer_ids = PhotoService._photographer_ids(db, existing)
+
+        results, deletes = [], []
+        for index, photo_id in enumerate(photo_ids):
+            if index in duplicates:
+                results.append(PhotoService._duplicate(index, photo_id))
+            elif photo_id not in existing:
+                results.append(BulkItemResult(index, photo_id, "not_found", "Photo not found"))
+            else:
+                deletes.append(photo_id)
+                results.append(BulkItemResult(index, photo_id, "deleted"))
+
+        def write() -> None:
+            if deletes:
+                db.execute(
+                    delete(Photo).where(Photo.id.in_(deletes)).execution_options(
+                        synchronize_session=False
+                    )
+                )
+
+        return PhotoService._apply_bulk(db, results, atomic, write, photographer_ids)
+
+    @staticmethod
+    def _existing_ids(db: Session, photo_ids: List[int]) -> Set[int]:
+        """Return which of photo_ids exist, with one query."""
+        if not photo_ids:
+            return set()
+        return set(db.scalars(select(Photo.id).where(Photo.id.in_(set(photo_ids)))))
+
+    @staticmethod
+    def _photographer_ids(db: Session, photo_ids: Iterable[int]) -> Set[int]:
+        """Return the photographers of the given photos, with one query."""
+        return set(PhotoService._photographer_by_photo(db, photo_ids).values())
+
+    @staticmethod
+    def _photographer_by_photo(db: Session, photo_ids: Iterable[int]) -> Dict[int, int]:
+        """Map each of the given photos to its photographer_id, with one query."""
+        photo_ids = set(photo_ids)
+        if not photo_ids:
+            return {}
+        rows = db.execute(select(Photo.id, Photo.photographer_id).where(Photo.id.in_(photo_ids)))
+        return {row.id: row.photographer_id for row in rows}
+
+    @staticmethod
+    def _changes_photographer(item: PhotoUpdate) -> bool:
+        """Whether a partial update sets the photo's photographer or their name/URL."""
+        return any(
+            value is not None
+            for value in (item.photographer_id, item.photographer, item.photographer_url)
+        )
+
+    @staticmethod
+    def _resolve_photographers(
+        db: Session, changes: Dict[int, PhotographerChange]
+    ) -> Tuple[Dict[int, Tuple[str, str]], Set[int]]:
+        """
+        Resolve photographer changes, keyed by item index, against the stored
+        photographers.
+
+        Returns the photographers to save, with an omitted name or URL filled
+        in from the stored row (or an earlier change), and the indexes of
+        changes naming a photographer that does not exist without giving
+        both its name and URL.
+        """
+        ids = {photographer_id for photographer_id, _, _ in changes.values()}
+        if not ids:
+            return {}, set()
+        stored = {
+            row.id: (row.name, row.url)
+            for row in db.execute(
+                select(Photographer.id, Photographer.name, Photographer.url).where(
+                    Photographer.id.in_(ids)
+                )
+            )
+        }
+
+        photographers, unknown = {}, set()
+        for index, (photographer_id, name, url) in changes.items():
+            known = photographers.get(photographer_id) or stored.get(photographer_id)
+            if known is None and (name is None or url is None):
+                unknown.add(index)
+            elif name is not None or url is not None:
+                photographers[photographer_id] = (
+                    name if name is not None else known[0],
+                    url if url is not None else known[1],
+                )
+        return photographers, unknown
+
+    @staticmethod
+    def _duplicate_indexes(photo_ids: Iterable[Optional[int]]) -> Set[int]:
+        """Indexes of ids already seen earlier in the request."""
+        seen, duplicates = set(), set()
+        for index, photo_id in enumerate(photo_ids):
+            if photo_id is None:
+                continue
+            if photo_id in seen:
+                duplicates.add(index)
+            seen.add(photo_id)
+        return duplicates
+
+    @staticmethod
+    def _duplicate(index: int, photo_id: int) -> BulkItemResult:
+        """Result for an item whose id was already used earlier in the request."""
+        return BulkItemResult(index, photo_id, "duplicate", "Id appears earlier in the request")
+
+    @staticmethod
+    def _apply_bulk(
+        db: Session,
+        results: List[BulkItemResult],
+        atomic: bool,
+        write: Callable[[], None],
+        photographer_ids: Set[int],
+    ) -> BulkOutcome:
+        """
+        Run write(), refresh the touched photographers' summaries and commit,
+        unless atomic and some item already failed.
+
+        A constraint violation while writing rolls the whole request back.
+        """
+        failed = any(r.status not in BULK_SUCCESS_STATUSES for r in results)
+        if atomic and failed:
+            return BulkOutcome(
+                applied=False,
+                results=[
+                    r._replace(status="skipped", detail="Not applied because another item failed")
+                    if r.status in BULK_SUCCESS_STATUSES
+                    else r
+                    for r in results
+                ],
+            )
+
+        try:
+            write()
+            PhotographerService.refresh(db, photographer_ids)
+            db.commit()
+        except IntegrityError:
+            db.rollback()
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail="Bulk write violated a database constraint; nothing was written",
+            )
+
+        PhotoService._invalidate_caches()
+        return BulkOutcome(applied=True, results=results)
 
     @staticmethod
     def get_photos_by_photographer(
-        db: Session, photographer_id: int, skip: int = 0, limit: int = 20
-    ) -> tuple[List[Photo], int]:
+        db: Session,
+        photographer_id: int,
+        skip: int = 0,
+        limit: int = 20,
+        cursor: Optional[str] = None,
+        include_total: bool = True,
+        fields: Optional[Tuple[str, ...]] = None,
+    ) -> PhotoPage:
         """Get photos by photographer ID."""
-        query = db.query(Photo).filter(Photo.photographer_id == photographer_id)
-        total = query.count()
-        photos = query.order_by(Photo.created_at.desc()).offset(skip).limit(limit).all()
-        return photos, total
+        conditions = [Photo.photographer_id == photographer_id]
+
+        total, total_is_estimate = None, False
+        if include_total:
+            key = (("photographer_id", photographer_id),)
+            query = db.query(Photo).filter(*conditions)
+            total, total_is_estimate = CountService.get_total(db, query, key)
+
+        photos, next_cursor = PhotoService._paginate(
+            db, conditions, skip, limit, cursor, fields=fields
+        )
+        return PhotoPage(photos, total, total_is_estimate, next_cursor)
+
+    @staticmethod
+    def _invalidate_caches() -> None:
+        """Drop cached totals and list responses after a write."""
+        CountService.invalidate()
+        photo_response_cache.invalidate()
+
+    @staticmethod
+    def _paginate(
+        db: Session,
+        conditions: List[ColumnElement],
+        skip: int,
+        limit: int,
+        cursor: Optional[str],
+        rank: Optional[ColumnElement] = None,
+        fields: Optional[Tuple[str, ...]] = None,
+        sort: str = "created_at",
+        order: str = "desc",
+    ) -> tuple[List[Row], Optional[str]]:
+        """
+        Fetch one page ordered by (sort column, id) in the given order.
+
+        Offset mode walks past `skip` rows; cursor mode seeks directly into the
+        (sort column, id) index. One extra row is fetched to decide whether a
+        next cursor should be returned. When a rank expression is given it
+        takes precedence in the ordering and no cursor is produced.
+
+        The page is read with a Core select of photo_select(fields), so rows
+        come back as plain tuples with no ORM identity map or instance state.
+        The sort column is selected too, as the next cursor is built from it.
+        """
+        column = PHOTO_SORTS[sort]
+        descending = order == "desc"
+        stmt = photo_select(fields, extra=(sort,)).where(*conditions)
+
+        if cursor:
+            value, photo_id = decode_cursor(cursor, sort, order)
+            if column is Photo.id:
+                seek = Photo.id < photo_id if descending else Photo.id > photo_id
+            elif descending:
+                seek = tuple_(column, Photo.id) < (value, photo_id)
+            else:
+                seek = tuple_(column, Photo.id) > (value, photo_id)
+            stmt = stmt.where(seek)
+            skip = 0
+
+        keys = [column] if column is Photo.id else [column, Photo.id]
+        order_by = [key.desc() if descending else key.asc() for key in keys]
+        if rank is not None:
+            order_by.insert(0, rank.desc())
+
+        photos = db.execute(stmt.order_by(*order_by).offset(skip).limit(limit + 1)).all()
+
+        next_cursor = None
+        if len(photos) > limit:
+            photos = photos[:limit]
+            if rank is None:
+                last = photos[-1]
+                next_cursor = encode_cursor(sort, order, getattr(last, sort), last.id)
+
+        return photos, next_cursor
+
+    @staticmethod
+    def _search_rank(db: Session, term: str) -> ColumnElement:
+        """
+        Build a relevance score for a search term.
+
+        PostgreSQL scores with pg_trgm word similarity against alt text and
+        photographer name. Other databases fall back to a coarse score that
+        prefers exact photographer matches, then prefix matches. Names are read
+        from the photographers row the search filter joins, not through the
+        Photo.photographer subquery.
+        """
+        if db.get_bind().dialect.name == "postgresql":
+            return func.greatest(
+                func.word_similarity(term, func.coalesce(Photo.alt, "")),
+                func.word_similarity(term, Photographer.name),
+            )
+
+        return case(
+            (func.lower(Photographer.name) == term.lower(), 3),
+            (
+                or_(Photo.alt.ilike(f"{term}%"), Photographer.name.ilike(f"{term}%")),
+                2,
+            ),
+            else_=1,
+        )
@@ -0,0 +1,290 @@
+from sqlalchemy.orm import Session
+from sqlalchemy.engine import Connection
+from sqlalchemy import (
+    DateTime,
+    bindparam,
+    delete,
+    exists,
+    func,
+    insert,
+    literal,
+    select,
+    text,
+    update,
+)
+from sqlalchemy.sql import Select
+from fastapi import HTTPException, status
+from datetime import datetime
+from typing import Iterable, List, Mapping, Optional, Set, Tuple, Union
+from app.models.photo import Photo
+from app.models.photographer import Photographer
+from app.models.photographer_stats import PhotographerStats
+
+# Photographers recomputed per statement by refresh() and looked up per statement by save()
+REFRESH_BATCH_SIZE = 1000
+
+# Photos whose updated_at save() bumps per statement when their photographer is renamed
+TOUCH_BATCH_SIZE = 1000
+
+# First key of the PostgreSQL advisory locks taken per photographer by refresh()
+ADVISORY_LOCK_NAMESPACE = 7341
+
+# photographer_stats columns in the order _summary() selects them
+SUMMARY_COLUMNS = [
+    "photographer_id",
+    "photo_count",
+    "latest_created_at",
+    "min_width",
+    "max_width",
+    "avg_width",
+    "min_height",
+    "max_height",
+    "avg_height",
+    "refreshed_at",
+]
+
+PHOTOGRAPHER_SORTS = {
+    "photo_count": (PhotographerStats.photo_count.desc(), PhotographerStats.photographer_id),
+    "latest": (PhotographerStats.latest_created_at.desc(), PhotographerStats.photographer_id),
+    "name": (Photographer.name, PhotographerStats.photographer_id),
+}
+
+
+class PhotographerService:
+    """
+    Service for photographers and the photographer_stats summary table.
+
+    Writes never recount the whole photos table: refresh() recomputes only
+    the photographers a write touched, through the photographer_id index.
+    """
+
+    @staticmethod
+    def save(
+        db: Union[Session, Connection],
+        photographers: Mapping[int, Tuple[str, str]],
+        overwrite: bool = True,
+    ) -> Set[int]:
+        """
+        Insert missing photographers and, with overwrite, rename changed ones.
+
+        photographers maps id -> (name, url). Photos of renamed photographers
+        get a new updated_at so their ETags, cached fragments and
+        Last-Modified change along with the name; they are updated
+        TOUCH_BATCH_SIZE at a time, walking photo ids, so no single statement
+        grows with the photographer's catalogue. Returns the renamed ids.
+        """
+        table = Photographer.__table__
+        ids = sorted(photographers)
+        dialect = PhotographerService._dialect(db)
+        renamed = []
+        for start in range(0, len(ids), REFRESH_BATCH_SIZE):
+            batch = ids[start:start + REFRESH_BATCH_SIZE]
+            existing = {
+                row.id: (row.name, row.url)
+                for row in db.execute(
+                    select(table.c.id, table.c.name, table.c.url).where(table.c.id.in_(batch))
+                )
+            }
+            new = [
+                {"id": i, "name": photographers[i][0], "url": photographers[i][1]}
+                for i in batch
+                if i not in existing
+            ]
+            if new:
+                db.execute(PhotographerService._insert_missing(dialect), new)
+            if overwrite:
+                renamed.extend(
+                    i for i in batch if i in existing and existing[i] != tuple(photographers[i])
+                )
+
+        if renamed:
+            db.execute(
+                update(table)
+                .where(table.c.id == bindparam("b_id"))
+                .values(name=bindparam("b_name"), url=bindparam("b_url")),
+                [
+                    {"b_id": i, "b_name": photographers[i][0], "b_url": photographers[i][1]}
+                    for i in renamed
+                ],
+            )
+            PhotographerService._touch_photos(db, renamed, datetime.utcnow())
+        return set(renamed)
+
+    @staticmethod
+    def get_photographer(db: Session, photographer_id: int) -> PhotographerStats:
+        """Get a photographer's summary by ID."""
+        stats = db.get(PhotographerStats, photographer_id)
+        if not stats:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Photographer not found",
+            )
+        return stats
+
+    @staticmethod
+    def list_photographers(
+        db: Session,
+        skip: int = 0,
+        limit: int = 20,
+        sort: str = "photo_count",
+        name: Optional[str] = None,
+    ) -> Tuple[List[PhotographerStats], int]:
+        """Get one page of photographer summaries and the total number matching."""
+        stmt, count = PhotographerService._list_statements(skip, limit, sort, name)
+        return list(db.scalars(stmt)), db.scalar(count)
+
+    @staticmethod
+    def _list_statements(
+        skip: int, limit: int, sort: str, name: Optional[str]
+    ) -> Tuple[Select, Select]:
+        conditions = []
+        if name:
+            conditions.append(Photographer.name.ilike(f"%{name}%"))
+        stmt = (
+            select(PhotographerStats)
+            .join(Photographer, Photographer.id == PhotographerStats.photographer_id)
+            .where(*conditions)
+            .order_by(*PHOTOGRAPHER_SORTS[sort])
+            .offset(skip)
+            .limit(limit)
+        )
+        count = (
+            select(func.count())
+            .select_from(PhotographerStats)
+            .join(Photographer, Photographer.id == PhotographerStats.photographer_id)
+            .where(*conditions)
+        )
+        return stmt, count
+
+    @staticmethod
+    def refresh(db: Union[Session, Connection], photographer_ids: Iterable[int]) -> None:
+        """
+        Recompute the summaries of the given photographers in db's transaction.
+
+        Call after the photo writes have been flushed. Photographers left
+        without photos are removed. On PostgreSQL an advisory lock per
+        photographer, held until commit, makes concurrent refreshes of the
+        same photographer run one after the other, so the later one always
+        sees the earlier one's photos.
+        """
+        ids = sorted(set(photographer_ids))
+        dialect = PhotographerService._dialect(db)
+        now = datetime.utcnow()
+        for start in range(0, len(ids), REFRESH_BATCH_SIZE):
+            batch = ids[start:start + REFRESH_BATCH_SIZE]
+            summary = PhotographerService._summary(now).where(Photo.photographer_id.in_(batch))
+
+            if dialect == "postgresql":
+                # ids are sorted, so locks are always taken in the same order
+                db.execute(
+                    text(
+                        "SELECT pg_advisory_xact_lock(:namespace, id) "
+                        "FROM unnest(CAST(:ids AS integer[])) AS id"
+                    ),
+                    {"namespace": ADVISORY_LOCK_NAMESPACE, "ids": batch},
+                )
+
+            upsert = PhotographerService._upsert(dialect, summary)
+            if upsert is None:
+                db.execute(
+                    delete(PhotographerStats).where(PhotographerStats.photographer_id.in_(batch))
+                )
+                db.execute(insert(PhotographerStats).from_select(SUMMARY_COLUMNS, summary))
+                continue
+
+            db.execute(upsert)
+            db.execute(
+                delete(PhotographerStats).where(
+                    PhotographerStats.photographer_id.in_(batch),
+                    ~exists().where(Photo.photographer_id == PhotographerStats.photographer_id),
+                )
+            )
+
+    @staticmethod
+    def rebuild(db: Union[Session, Connection]) -> int:
+        """
+        Recompute every summary from photos in db's transaction.
+
+        Meant to run offline (or after bulk loads); returns the number of
+        photographers.
+        """
+        db.execute(delete(PhotographerStats))
+        db.execute(
+            insert(PhotographerStats).from_select(
+                SUMMARY_COLUMNS, PhotographerService._summary(datetime.utcnow())
+            )
+        )
+        return db.scalar(select(func.count()).select_from(PhotographerStats))
+
+    @staticmethod
+    def _touch_photos(
+        db: Union[Session, Connection], photographer_ids: List[int], updated_at: datetime
+    ) -> None:
+        """Set updated_at on every photo of the given photographers, in id-ordered batches."""
+        photos = Photo.__table__
+        last_id = None
+        while True:
+            batch = select(photos.c.id).where(photos.c.photographer_id.in_(photographer_ids))
+            if last_id is not None:
+                batch = batch.where(photos.c.id > last_id)
+            ids = list(db.scalars(batch.order_by(photos.c.id).limit(TOUCH_BATCH_SIZE)))
+            if not ids:
+                return
+            db.execute(update(photos).where(photos.c.id.in_(ids)).values(updated_at=updated_at))
+            last_id = ids[-1]
+
+    @staticmethod
+    def _summary(refreshed_at: datetime) -> Select:
+        """Aggregate photos per photographer, in SUMMARY_COLUMNS order."""
+        return select(
+            Photo.photographer_id,
+            func.count(Photo.id),
+            func.max(Photo.created_at),
+            func.min(Photo.width),
+            func.max(Photo.width),
+            func.avg(Photo.width),
+            func.min(Photo.height),
+            func.max(Photo.height),
+            func.avg(Photo.height),
+            literal(refreshed_at, DateTime),
+        ).group_by(Photo.photographer_id)
+
+    @staticmethod
+    def _dialect_insert(dialect: str):
+        """The dialect's insert() with ON CONFLICT support, or None."""
+        if dialect == "postgresql":
+            from sqlalchemy.dialects.postgresql import insert as dialect_insert
+        elif dialect == "sqlite":
+            from sqlalchemy.dialects.sqlite import insert as dialect_insert
+        else:
+            return None
+        return dialect_insert
+
+    @staticmethod
+    def _insert_missing(dialect: str):
+        """INSERT into photographers that skips ids inserted concurrently, where supported."""
+        dialect_insert = PhotographerService._dialect_insert(dialect)
+        if dialect_insert is None:
+            return insert(Photographer.__table__)
+        return dialect_insert(Photographer.__table__).on_conflict_do_nothing(
+            index_elements=["id"]
+        )
+
+    @staticmethod
+    def _upsert(dialect: str, summary: Select):
+        """INSERT ... SELECT summary ON CONFLICT DO UPDATE, where the dialect supports it."""
+        dialect_insert = PhotographerService._dialect_insert(dialect)
+        if dialect_insert is None:
+            return None
+
+        stmt = dialect_insert(PhotographerStats).from_select(SUMMARY_COLUMNS, summary)
+        return stmt.on_conflict_do_update(
+            index_elements=["photographer_id"],
+            set_={column: stmt.excluded[column] for column in SUMMARY_COLUMNS[1:]},
+        )
+
+    @staticmethod
+    def _dialect(db: Union[Session, Connection]) -> str:
+        """Name of the database dialect behind a Session or Connection."""
+        bind = db.get_bind() if isinstance(db, Session) else db
+        return bind.dialect.name
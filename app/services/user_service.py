@@ -1,8 +1,11 @@
 from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select
 from fastapi import HTTPException, status
+from typing import Optional
 from app.models.user import User
 from app.schemas.user import UserCreate
-from app.core.security import get_password_hash, verify_password
+from app.core.hashing import password_hasher
 
 
 class UserService:
@@ -29,7 +32,7 @@ class UserService:
         user = User(
             email=user_data.email,
             username=user_data.username,
-            hashed_password=get_password_hash(user_data.password),
+            hashed_password=password_hasher.hash(user_data.password),
         )
         db.add(user)
         db.commit()
@@ -46,7 +49,8 @@ class UserService:
                 detail="Incorrect username or password",
             )
 
-        if not verify_password(password, user.hashed_password):
+        valid, new_hash = password_hasher.verify_and_update(password, user.hashed_password)
+        if not valid:
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 detail="Incorrect username or password",
@@ -58,6 +62,11 @@ class UserService:
                 detail="Inactive user",
             )
 
+        # The configured bcrypt cost changed since this hash was created
+        if new_hash:
+            user.hashed_password = new_hash
+            db.commit()
+
         return user
 
     @staticmethod
@@ -70,3 +79,86 @@ class UserService:
                 detail="User not found",
             )
         return user
+
+
+class AsyncUserService:
+    """Async counterpart of UserService for use with AsyncSession."""
+
+    @staticmethod
+    async def _get_by(db: AsyncSession, *criteria) -> Optional[User]:
+        """Get the first user matching criteria."""
+        return (await db.execute(select(User).where(*criteria))).scalars().first()
+
+    @staticmethod
+    async def create_user(db: AsyncSession, user_data: UserCreate) -> User:
+        """Create a new user."""
+        # Check if email already exists
+        if await AsyncUserService._get_by(db, User.email == user_data.email):
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Email already registered",
+            )
+
+        # Check if username already exists
+        if await AsyncUserService._get_by(db, User.username == user_data.username):
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Username already taken",
+            )
+
+        # bcrypt is CPU-bound, keep it off the event loop
+        hashed_password = await password_hasher.hash_async(user_data.password)
+
+        # Create user
+        user = User(
+            email=user_data.email,
+            username=user_data.username,
+            hashed_password=hashed_password,
+        )
+        db.add(user)
+        await db.commit()
+        await db.refresh(user)
+        return user
+
+    @staticmethod
+    async def authenticate_user(db: AsyncSession, username: str, password: str) -> User:
+        """Authenticate a user."""
+        user = await AsyncUserService._get_by(db, User.username == username)
+        if not user:
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail="Incorrect username or password",
+            )
+
+        valid, new_hash = await password_hasher.verify_and_update_async(
+            password, user.hashed_password
+        )
+        if not valid:
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail="Incorrect username or password",
+            )
+
+        if not user.is_active:
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail="Inactive user",
+            )
+
+        # The configured bcrypt cost changed since this hash was created
+        if new_hash:
+            user.hashed_password = new_hash
+            await db.commit()
+
+        return user
+
+    @staticmethod
+    async def get_user_by_id(db: AsyncSession, user_id: int) -> User:
+        """Get user by ID."""
+        user = await AsyncUserService._get_by(db, User.id == user_id)
+        if not user:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="User not found",
+            )
+        return user
@@ -0,0 +1,186 @@
+"""
+Benchmark the photo list read path: ORM hydration vs Core rows.
+
+Populates a synthetic photos table, then reads and serializes pages the way
+the list endpoint used to (ORM Photo instances validated through PhotoList
+with from_attributes) and the way it does now (a Core select of
+photo_select() encoded straight to JSON), plus the same Core path with
+cached per-photo fragments (FAST_JSON). Reports rows per second for each,
+after checking that they produce the same body.
+
+Usage:
+    python scripts/bench_list_serialization.py [--rows 20000] [--page-size 100]
+        [--repeat 50] [--database-url sqlite://]
+
+Uses an in-memory SQLite database unless --database-url is given. Pass
+--rows 0 to benchmark the photos already in that database.
+"""
+import argparse
+import sys
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+# Add parent directory to path to import app modules
+sys.path.append(str(Path(__file__).parent.parent))
+
+from pydantic_core import to_json
+from sqlalchemy import create_engine, insert
+from sqlalchemy.orm import Session
+from sqlalchemy.pool import StaticPool
+from app.core.projection import encode_photo_rows, photo_select, row_dict
+from app.db.database import Base
+from app.models.photo import Photo
+from app.models.photographer import Photographer
+from app.schemas.photo import PhotoList
+
+
+def populate(engine, rows: int) -> None:
+    """Insert rows synthetic photos by 1000 photographers."""
+    now = datetime.utcnow()
+    photographers = [
+        {
+            "id": i,
+            "name": f"Photographer {i}",
+            "url": f"https://www.pexels.com/@photographer-{i}",
+        }
+        for i in range(min(rows, 1000))
+    ]
+    values = [
+        {
+            "width": 1920 + i % 500,
+            "height": 1080 + i % 300,
+            "url": f"https://www.pexels.com/photo/{i}/",
+            "photographer_id": i % 1000,
+            "avg_color": "#7A8B9C",
+            **{
+                f"src_{size}": f"https://images.pexels.com/photos/{i}/{size}.jpeg"
+                for size in (
+                    "original", "large2x", "large", "medium",
+                    "small", "portrait", "landscape", "tiny",
+                )
+            },
+            "alt": f"Synthetic photo number {i}",
+            "created_at": now - timedelta(seconds=i),
+            "updated_at": now - timedelta(seconds=i),
+        }
+        for i in range(rows)
+    ]
+    with engine.begin() as conn:
+        conn.execute(insert(Photographer), photographers)
+        conn.execute(insert(Photo), values)
+
+
+def orm_page(engine, page_size: int, offset: int) -> bytes:
+    """Previous path: ORM instances, then PhotoList validation."""
+    with Session(engine) as db:
+        photos = (
+            db.query(Photo)
+            .order_by(Photo.created_at.desc(), Photo.id.desc())
+            .offset(offset)
+            .limit(page_size)
+            .all()
+        )
+        payload = {
+            "total": None,
+            "total_is_estimate": False,
+            "page": None,
+            "page_size": page_size,
+            "next_cursor": None,
+            "photos": photos,
+        }
+        return PhotoList.model_validate(payload, from_attributes=True).model_dump_json().encode()
+
+
+def core_page(engine, page_size: int, offset: int) -> bytes:
+    """Current path: Core rows encoded directly."""
+    with Session(engine) as db:
+        rows = db.execute(
+            photo_select()
+            .order_by(Photo.created_at.desc(), Photo.id.desc())
+            .offset(offset)
+            .limit(page_size)
+        ).all()
+        return to_json(
+            {
+                "total": None,
+                "total_is_estimate": False,
+                "page": None,
+                "page_size": page_size,
+                "next_cursor": None,
+                "photos": [row_dict(row) for row in rows],
+            }
+        )
+
+
+def fragment_page(engine, page_size: int, offset: int) -> bytes:
+    """Core rows with the photos array concatenated from cached fragments."""
+    with Session(engine) as db:
+        rows = db.execute(
+            photo_select()
+            .order_by(Photo.created_at.desc(), Photo.id.desc())
+            .offset(offset)
+            .limit(page_size)
+        ).all()
+        envelope = {
+            "total": None,
+            "total_is_estimate": False,
+            "page": None,
+            "page_size": page_size,
+            "next_cursor": None,
+        }
+        return to_json(envelope)[:-1] + b',"photos":' + encode_photo_rows(rows, fragments=True) + b"}"
+
+
+def _rows_per_second(read_page, engine, page_size: int, repeat: int, pages: int) -> float:
+    """Read repeat pages, cycling through the table, and return rows per second."""
+    start = time.perf_counter()
+    for i in range(repeat):
+        read_page(engine, page_size, (i % pages) * page_size)
+    return repeat * page_size / (time.perf_counter() - start)
+
+
+def main():
+    """Main function to run the list serialization benchmark."""
+    parser = argparse.ArgumentParser(description="Benchmark ORM vs Core list reads")
+    parser.add_argument("--rows", type=int, default=20_000, help="Synthetic rows to insert")
+    parser.add_argument("--page-size", type=int, default=100)
+    parser.add_argument("--repeat", type=int, default=50, help="Pages read per path")
+    parser.add_argument("--database-url", default="sqlite://")
+    args = parser.parse_args()
+
+    if args.database_url.startswith("sqlite://"):
+        engine = create_engine(
+            args.database_url,
+            connect_args={"check_same_thread": False},
+            poolclass=StaticPool,
+        )
+    else:
+        engine = create_engine(args.database_url)
+    Base.metadata.create_all(bind=engine)
+    if args.rows:
+        populate(engine, args.rows)
+
+    pages = max(1, args.rows // args.page_size)
+    assert orm_page(engine, args.page_size, 0) == core_page(engine, args.page_size, 0)
+    assert core_page(engine, args.page_size, 0) == fragment_page(engine, args.page_size, 0)
+
+    # Warm up statement caches before timing
+    orm_page(engine, args.page_size, 0)
+    core_page(engine, args.page_size, 0)
+
+    orm = _rows_per_second(orm_page, engine, args.page_size, args.repeat, pages)
+    core = _rows_per_second(core_page, engine, args.page_size, args.repeat, pages)
+    # Fragments are warm after one pass over the pages being read
+    for i in range(min(args.repeat, pages)):
+        fragment_page(engine, args.page_size, i * args.page_size)
+    fragments = _rows_per_second(fragment_page, engine, args.page_size, args.repeat, pages)
+
+    print(f"{args.repeat} pages of {args.page_size} rows from {engine.url.drivername}\n")
+    print(f"ORM + PhotoList validation: {orm:10,.0f} rows/s")
+    print(f"Core rows + direct JSON:    {core:10,.0f} rows/s  ({core / orm:.1f}x)")
+    print(f"Core rows + fragments:      {fragments:10,.0f} rows/s  ({fragments / orm:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
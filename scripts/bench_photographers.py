@@ -0,0 +1,241 @@
+"""
+Benchmark storing photographers on every photo versus in their own table.
+
+Builds two synthetic layouts of the photographer data (default: 200,000
+photos by 5,000 photographers): the old one, with photographer and
+photographer_url on each photo and their indexes, and the normalized one,
+with a photographers table referenced by photographer_id. Reports the size
+of each layout and the latency of the `photographer` filter PhotoService
+issues against it.
+
+Usage:
+    python scripts/bench_photographers.py [--rows 200000] [--photographers 5000]
+        [--repeat 5] [--keep]
+
+Works on SQLite (needs the dbstat virtual table for sizes) and PostgreSQL.
+"""
+import argparse
+import random
+import statistics
+import sys
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+# Add parent directory to path to import app modules
+sys.path.append(str(Path(__file__).parent.parent))
+
+from sqlalchemy import text
+from app.db.database import engine
+import logging
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+DENORMALIZED = "bench_photos_denormalized"
+NORMALIZED = "bench_photos_normalized"
+PHOTOGRAPHERS = "bench_photographers"
+
+FIRST_NAMES = ["Anna", "Ben", "Carla", "David", "Elena", "Farid", "Grace", "Hiro", "Ines", "Jonas"]
+LAST_NAMES = ["Smith", "Kowalski", "Nguyen", "Garcia", "Okafor", "Rossi", "Tanaka", "Muller"]
+
+INSERT_BATCH_SIZE = 5000
+
+
+def _ilike(column: str) -> str:
+    """Case-insensitive LIKE on column, as SQLAlchemy's ilike() compiles it."""
+    if engine.dialect.name == "postgresql":
+        return f"{column} ILIKE :term"
+    return f"lower({column}) LIKE lower(:term)"
+
+
+def queries() -> dict:
+    """(before SQL, after SQL, params) per query, as PhotoService issues them."""
+    joined = (
+        f"{NORMALIZED}, {PHOTOGRAPHERS} WHERE {PHOTOGRAPHERS}.id = {NORMALIZED}.photographer_id "
+        f"AND {_ilike('name')}"
+    )
+    page = "ORDER BY created_at DESC, id DESC LIMIT 21"
+    denormalized_filter = f"SELECT * FROM {DENORMALIZED} WHERE {_ilike('photographer')} {page}"
+    normalized_filter = f"SELECT {NORMALIZED}.* FROM {joined} {page}"
+    return {
+        "filter, common name": (denormalized_filter, normalized_filter, {"term": "%okafor%"}),
+        "filter, rare name": (denormalized_filter, normalized_filter, {"term": "%smith 42%"}),
+        "filter, no match": (denormalized_filter, normalized_filter, {"term": "%nobody%"}),
+        "filter count, common name": (
+            f"SELECT count(*) FROM {DENORMALIZED} WHERE {_ilike('photographer')}",
+            f"SELECT count(*) FROM {joined}",
+            {"term": "%okafor%"},
+        ),
+        "photos of one photographer": (
+            f"SELECT * FROM {DENORMALIZED} WHERE photographer_id = :pid {page}",
+            f"SELECT * FROM {NORMALIZED} WHERE photographer_id = :pid {page}",
+            {"pid": 42},
+        ),
+    }
+
+
+def _photographers(count: int) -> list:
+    """Synthetic photographers with unique names."""
+    rng = random.Random(0)
+    rows = []
+    for i in range(1, count + 1):
+        name = f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)} {i}"
+        url = "https://www.pexels.com/@" + name.lower().replace(" ", "-")
+        rows.append({"id": i, "name": name, "url": url})
+    return rows
+
+
+def build_tables(conn, rows: int, photographer_count: int):
+    """Create and populate both layouts with the same photos."""
+    for table in (DENORMALIZED, NORMALIZED, PHOTOGRAPHERS):
+        conn.execute(text(f"DROP TABLE IF EXISTS {table}"))
+    conn.execute(
+        text(
+            f"CREATE TABLE {DENORMALIZED} (id integer PRIMARY KEY, "
+            "photographer varchar NOT NULL, photographer_url varchar NOT NULL, "
+            "photographer_id integer NOT NULL, created_at timestamp NOT NULL)"
+        )
+    )
+    conn.execute(
+        text(
+            f"CREATE TABLE {PHOTOGRAPHERS} (id integer PRIMARY KEY, "
+            "name varchar NOT NULL, url varchar NOT NULL)"
+        )
+    )
+    conn.execute(
+        text(
+            f"CREATE TABLE {NORMALIZED} (id integer PRIMARY KEY, "
+            f"photographer_id integer NOT NULL REFERENCES {PHOTOGRAPHERS} (id), "
+            "created_at timestamp NOT NULL)"
+        )
+    )
+
+    photographers = _photographers(photographer_count)
+    conn.execute(
+        text(f"INSERT INTO {PHOTOGRAPHERS} (id, name, url) VALUES (:id, :name, :url)"),
+        photographers,
+    )
+    rng = random.Random(1)
+    now = datetime.utcnow()
+    for start in range(1, rows + 1, INSERT_BATCH_SIZE):
+        batch = []
+        for i in range(start, min(start + INSERT_BATCH_SIZE, rows + 1)):
+            p = rng.choice(photographers)
+            batch.append(
+                {
+                    "id": i,
+                    "photographer": p["name"],
+                    "photographer_url": p["url"],
+                    "photographer_id": p["id"],
+                    "created_at": now - timedelta(seconds=i),
+                }
+            )
+        conn.execute(
+            text(
+                f"INSERT INTO {DENORMALIZED} VALUES "
+                "(:id, :photographer, :photographer_url, :photographer_id, :created_at)"
+            ),
+            batch,
+        )
+        conn.execute(
+            text(f"INSERT INTO {NORMALIZED} VALUES (:id, :photographer_id, :created_at)"),
+            batch,
+        )
+
+    # The indexes each layout carries on photographer data
+    conn.execute(text(f"CREATE INDEX bench_denorm_created ON {DENORMALIZED} (created_at, id)"))
+    conn.execute(text(f"CREATE INDEX bench_denorm_name ON {DENORMALIZED} (photographer)"))
+    conn.execute(text(f"CREATE INDEX bench_denorm_pid ON {DENORMALIZED} (photographer_id)"))
+    conn.execute(
+        text(
+            f"CREATE INDEX bench_denorm_name_created ON {DENORMALIZED} (photographer, created_at)"
+        )
+    )
+    conn.execute(text(f"CREATE INDEX bench_norm_created ON {NORMALIZED} (created_at, id)"))
+    conn.execute(text(f"CREATE INDEX bench_norm_pid ON {NORMALIZED} (photographer_id)"))
+    conn.execute(text(f"CREATE INDEX bench_photographers_name ON {PHOTOGRAPHERS} (name)"))
+    if engine.dialect.name == "postgresql":
+        conn.execute(text("CREATE EXTENSION IF NOT EXISTS pg_trgm"))
+        conn.execute(
+            text(f"CREATE INDEX ON {DENORMALIZED} USING gin (photographer gin_trgm_ops)")
+        )
+        conn.execute(text(f"CREATE INDEX ON {PHOTOGRAPHERS} USING gin (name gin_trgm_ops)"))
+    for table in (DENORMALIZED, NORMALIZED, PHOTOGRAPHERS):
+        conn.execute(text(f"ANALYZE {table}"))
+
+
+def layout_bytes(conn, tables) -> int:
+    """Bytes used by the tables and their indexes."""
+    if engine.dialect.name == "postgresql":
+        return sum(
+            conn.execute(text("SELECT pg_total_relation_size(:t)"), {"t": t}).scalar()
+            for t in tables
+        )
+    return conn.execute(
+        text(
+            "SELECT sum(pgsize) FROM dbstat WHERE name IN "
+            "(SELECT name FROM sqlite_master WHERE tbl_name IN ("
+            + ", ".join(f"'{t}'" for t in tables)
+            + "))"
+        )
+    ).scalar()
+
+
+def run_queries(conn, repeat: int) -> dict:
+    """Return median (before ms, after ms) for every query."""
+    results = {}
+    for name, (*statements, params) in queries().items():
+        medians = []
+        for sql in statements:
+            conn.execute(text(sql), params).fetchall()  # warm the cache
+            timings = []
+            for _ in range(repeat):
+                start = time.perf_counter()
+                conn.execute(text(sql), params).fetchall()
+                timings.append((time.perf_counter() - start) * 1000)
+            medians.append(statistics.median(timings))
+        results[name] = tuple(medians)
+    return results
+
+
+def main():
+    """Main function to run the photographer layout benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--rows", type=int, default=200_000)
+    parser.add_argument("--photographers", type=int, default=5_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--keep", action="store_true", help="Keep the synthetic tables")
+    args = parser.parse_args()
+
+    with engine.begin() as conn:
+        logger.info(f"Building both layouts with {args.rows:,} photos...")
+        build_tables(conn, args.rows, args.photographers)
+
+    with engine.connect() as conn:
+        before_bytes = layout_bytes(conn, [DENORMALIZED])
+        after_bytes = layout_bytes(conn, [NORMALIZED, PHOTOGRAPHERS])
+        logger.info("Running queries...")
+        results = run_queries(conn, args.repeat)
+
+    if not args.keep:
+        with engine.begin() as conn:
+            for table in (DENORMALIZED, NORMALIZED, PHOTOGRAPHERS):
+                conn.execute(text(f"DROP TABLE {table}"))
+
+    print(
+        f"\n{args.rows:,} photos by {args.photographers:,} photographers on "
+        f"{engine.dialect.name}, median of {args.repeat} runs\n"
+    )
+    print(
+        f"{'size (tables + indexes)':<30} {before_bytes / 2**20:>9.1f}M "
+        f"{after_bytes / 2**20:>9.1f}M {after_bytes / before_bytes:>8.2f}x"
+    )
+    print(f"{'query':<30} {'before ms':>10} {'after ms':>10} {'ratio':>9}")
+    for name, (before_ms, after_ms) in results.items():
+        ratio = after_ms / before_ms if before_ms else float("inf")
+        print(f"{name:<30} {before_ms:>10.1f} {after_ms:>10.1f} {ratio:>8.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,199 @@
+"""
+Benchmark photo search filters on a synthetic table, with and without the
+pg_trgm GIN indexes.
+
+Builds UNLOGGED copies of the searchable photo columns (default: one million
+rows) and of the photographers they belong to (one per PHOTOS_PER_PHOTOGRAPHER
+photos), runs the queries PhotoService issues for `search` and
+`photographer` filters, joining photos to photographers on photographer_id
+as the app does, then creates the trigram indexes and runs them again.
+
+Usage:
+    python scripts/bench_search.py [--rows 1000000] [--repeat 5] [--keep]
+
+Requires DATABASE_URL to point at PostgreSQL.
+"""
+import argparse
+import statistics
+import sys
+import time
+from pathlib import Path
+
+# Add parent directory to path to import app modules
+sys.path.append(str(Path(__file__).parent.parent))
+
+from sqlalchemy import text
+from app.db.database import engine
+import logging
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+TABLE = "bench_photo_search"
+PHOTOGRAPHERS_TABLE = "bench_photographer_search"
+PHOTOS_PER_PHOTOGRAPHER = 20
+
+WORDS = [
+    "sunset", "beach", "mountain", "forest", "city", "street", "portrait", "coffee",
+    "ocean", "river", "night", "snow", "desert", "flowers", "architecture", "bridge",
+    "woman", "man", "child", "dog", "cat", "bird", "car", "road", "light", "shadow",
+    "window", "kitchen", "garden", "market", "festival", "rain", "cloud", "lake",
+]
+FIRST_NAMES = ["Anna", "Ben", "Carla", "David", "Elena", "Farid", "Grace", "Hiro", "Ines", "Jonas"]
+LAST_NAMES = ["Smith", "Kowalski", "Nguyen", "Garcia", "Okafor", "Rossi", "Tanaka", "Muller"]
+
+# Photos joined to their photographer, as PhotoService._photographer_join() does
+FROM_JOIN = f"FROM {TABLE} p, {PHOTOGRAPHERS_TABLE} ph WHERE ph.id = p.photographer_id"
+
+QUERIES = {
+    "search (alt OR name ILIKE)": (
+        f"SELECT p.*, ph.name {FROM_JOIN} "
+        "AND (p.alt ILIKE :term OR ph.name ILIKE :term) "
+        "ORDER BY p.created_at DESC, p.id DESC LIMIT 21",
+        {"term": "%festival%"},
+    ),
+    "photographer name ILIKE": (
+        f"SELECT p.*, ph.name {FROM_JOIN} AND ph.name ILIKE :term "
+        "ORDER BY p.created_at DESC, p.id DESC LIMIT 21",
+        {"term": "%okafor%"},
+    ),
+    "search count": (
+        f"SELECT count(*) {FROM_JOIN} AND (p.alt ILIKE :term OR ph.name ILIKE :term)",
+        {"term": "%festival%"},
+    ),
+    "search sorted by relevance": (
+        f"SELECT p.*, ph.name {FROM_JOIN} "
+        "AND (p.alt ILIKE :term OR ph.name ILIKE :term) "
+        "ORDER BY greatest(word_similarity(:raw, coalesce(p.alt, '')), "
+        "word_similarity(:raw, ph.name)) DESC, p.created_at DESC, p.id DESC LIMIT 21",
+        {"term": "%festival%", "raw": "festival"},
+    ),
+}
+
+
+def _sql_array(values):
+    return "ARRAY[" + ", ".join(f"'{v}'" for v in values) + "]"
+
+
+def build_tables(conn, rows: int):
+    """Create and populate the synthetic photos and photographers tables."""
+    words = _sql_array(WORDS)
+    photographers = max(rows // PHOTOS_PER_PHOTOGRAPHER, 1)
+    # word_similarity() is needed by the relevance query even before indexing
+    conn.execute(text("CREATE EXTENSION IF NOT EXISTS pg_trgm"))
+    conn.execute(text(f"DROP TABLE IF EXISTS {TABLE}, {PHOTOGRAPHERS_TABLE}"))
+    conn.execute(
+        text(
+            f"CREATE UNLOGGED TABLE {PHOTOGRAPHERS_TABLE} ("
+            "id integer PRIMARY KEY, name varchar NOT NULL)"
+        )
+    )
+    conn.execute(
+        text(
+            f"INSERT INTO {PHOTOGRAPHERS_TABLE} (id, name) "
+            "SELECT g, "
+            f"{_sql_array(FIRST_NAMES)}[1 + floor(random() * {len(FIRST_NAMES)})::int] || ' ' || "
+            f"{_sql_array(LAST_NAMES)}[1 + floor(random() * {len(LAST_NAMES)})::int] "
+            "FROM generate_series(1, :photographers) AS g"
+        ),
+        {"photographers": photographers},
+    )
+    conn.execute(
+        text(
+            f"CREATE UNLOGGED TABLE {TABLE} ("
+            "id integer PRIMARY KEY, alt varchar, photographer_id integer NOT NULL, "
+            "created_at timestamp NOT NULL)"
+        )
+    )
+    conn.execute(
+        text(
+            f"INSERT INTO {TABLE} (id, alt, photographer_id, created_at) "
+            "SELECT g, "
+            f"initcap({words}[1 + floor(random() * {len(WORDS)})::int]) || ' ' || "
+            f"{words}[1 + floor(random() * {len(WORDS)})::int] || ' and ' || "
+            f"{words}[1 + floor(random() * {len(WORDS)})::int], "
+            "1 + floor(random() * :photographers)::int, "
+            "now() - make_interval(secs => g) "
+            "FROM generate_series(1, :rows) AS g"
+        ),
+        {"rows": rows, "photographers": photographers},
+    )
+    # The same b-tree indexes the Photo model declares for these queries
+    conn.execute(text(f"CREATE INDEX ON {TABLE} (created_at, id)"))
+    conn.execute(text(f"CREATE INDEX ON {TABLE} (photographer_id, created_at, id)"))
+    conn.execute(text(f"ANALYZE {TABLE}"))
+    conn.execute(text(f"ANALYZE {PHOTOGRAPHERS_TABLE}"))
+
+
+def create_trigram_indexes(conn):
+    """Create the same trigram indexes the Photo and Photographer models declare."""
+    conn.execute(text(f"CREATE INDEX ON {TABLE} USING gin (alt gin_trgm_ops)"))
+    conn.execute(text(f"CREATE INDEX ON {PHOTOGRAPHERS_TABLE} USING gin (name gin_trgm_ops)"))
+    conn.execute(text(f"ANALYZE {TABLE}"))
+    conn.execute(text(f"ANALYZE {PHOTOGRAPHERS_TABLE}"))
+
+
+def run_queries(conn, repeat: int) -> dict:
+    """Return median latency in ms and the top plan node for every query."""
+    results = {}
+    for name, (sql, params) in QUERIES.items():
+        timings = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            conn.execute(text(sql), params).fetchall()
+            timings.append((time.perf_counter() - start) * 1000)
+        plan = conn.execute(text(f"EXPLAIN (FORMAT JSON) {sql}"), params).scalar()
+        plan_node = _scan_nodes(plan[0]["Plan"])
+        results[name] = (statistics.median(timings), plan_node)
+    return results
+
+
+def _scan_nodes(plan: dict) -> str:
+    """Collect the scan node types of a plan tree."""
+    nodes = []
+    if "Scan" in plan["Node Type"]:
+        nodes.append(plan["Node Type"])
+    for child in plan.get("Plans", []):
+        nodes.append(_scan_nodes(child))
+    return ", ".join(n for n in nodes if n)
+
+
+def main():
+    """Main function to run the search benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--keep", action="store_true", help="Keep the synthetic table")
+    args = parser.parse_args()
+
+    if engine.dialect.name != "postgresql":
+        logger.error("The search benchmark requires a PostgreSQL DATABASE_URL")
+        sys.exit(1)
+
+    with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+        logger.info(f"Building {TABLE} with {args.rows:,} rows...")
+        build_tables(conn, args.rows)
+
+        logger.info("Running queries without trigram indexes...")
+        before = run_queries(conn, args.repeat)
+
+        logger.info("Creating trigram indexes...")
+        create_trigram_indexes(conn)
+
+        logger.info("Running queries with trigram indexes...")
+        after = run_queries(conn, args.repeat)
+
+        if not args.keep:
+            conn.execute(text(f"DROP TABLE {TABLE}, {PHOTOGRAPHERS_TABLE}"))
+
+    print(f"\n{args.rows:,} rows, median of {args.repeat} runs\n")
+    print(f"{'query':<38} {'before ms':>10} {'after ms':>10} {'speedup':>8}  plan after")
+    for name in QUERIES:
+        before_ms, _ = before[name]
+        after_ms, plan = after[name]
+        speedup = before_ms / after_ms if after_ms else float("inf")
+        print(f"{name:<38} {before_ms:>10.1f} {after_ms:>10.1f} {speedup:>7.1f}x  {plan}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,317 @@
+"""
+Parallel, resumable ingestion of large Pexels CSV dumps.
+
+The file is split into byte-range chunks aligned to line boundaries. A process
+pool parses chunks, and the parsed rows go through a bounded queue to a set of
+writer threads. Each writer stores a chunk's rows and its checkpoint row in
+the same transaction, so a rerun after a failure skips every chunk that was
+already written and resumes with the rest.
+
+Chunks are split on newlines, so records must not contain embedded line
+breaks (true of the Pexels dumps). Resume with the same --chunk-mb; a different
+chunk size produces different ranges and rewrites the file (harmlessly, since
+writes are upserts).
+
+Cached list responses and totals are invalidated when the run ends, as in
+scripts/ingest_photos.py.
+
+Usage:
+    python scripts/ingest_parallel.py photos.csv [--workers 4] [--writers 2]
+        [--chunk-mb 16] [--on-conflict nothing|update|delta] [--restart]
+"""
+import argparse
+import csv
+import io
+import os
+import queue
+import sys
+import threading
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+# Add parent directory to path to import app modules
+sys.path.append(str(Path(__file__).parent.parent))
+
+from sqlalchemy import delete, insert, select
+from sqlalchemy.engine import Engine
+from app.db.database import Base, engine
+from app.models.ingest_checkpoint import IngestCheckpoint
+from app.services.photographer_service import PhotographerService
+from scripts.ingest_photos import (
+    ON_CONFLICT_MODES,
+    _columns_for_header,
+    invalidate_caches,
+    row_to_values,
+    split_photographers,
+    upsert_photos,
+    upsert_statement,
+)
+import logging
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+Chunk = Tuple[int, int]
+
+
+class ParsedChunk(NamedTuple):
+    """Rows parsed from one byte range of the source file."""
+
+    start: int
+    end: int
+    rows: List[Dict[str, object]]
+
+
+class PipelineStats(NamedTuple):
+    """Outcome of a pipeline run."""
+
+    chunks_total: int
+    chunks_skipped: int
+    chunks_written: int
+    rows_written: int
+    seconds: float
+
+
+def source_key(csv_path: str) -> str:
+    """Identify a source file; a changed file size starts a fresh set of checkpoints."""
+    path = Path(csv_path).resolve()
+    return f"{path}:{path.stat().st_size}"
+
+
+def split_chunks(csv_path: str, chunk_size: int) -> Tuple[List[str], List[Chunk]]:
+    """
+    Return the CSV header and the byte ranges of the data that follows it.
+
+    Every range starts at the beginning of a line and ends just after a
+    newline (or at end of file), so each can be parsed on its own.
+    """
+    size = os.path.getsize(csv_path)
+    with open(csv_path, "rb") as file:
+        header = next(csv.reader([file.readline().decode("utf-8-sig")]))
+        boundaries = [file.tell()]
+        while boundaries[-1] < size:
+            file.seek(boundaries[-1] + chunk_size)
+            file.readline()
+            boundaries.append(min(file.tell(), size))
+    return header, list(zip(boundaries, boundaries[1:]))
+
+
+def parse_chunk(csv_path: str, header: List[str], start: int, end: int) -> ParsedChunk:
+    """Parse one byte range into photos column values (runs in a worker process)."""
+    with open(csv_path, "rb") as file:
+        file.seek(start)
+        data = file.read(end - start).decode("utf-8")
+    reader = csv.DictReader(io.StringIO(data, newline=""), fieldnames=header)
+    return ParsedChunk(start, end, [row_to_values(row) for row in reader])
+
+
+class Progress:
+    """Thread-safe progress counter that logs throughput and ETA."""
+
+    def __init__(self, total_chunks: int, total_bytes: int):
+        self.total_chunks = total_chunks
+        self.total_bytes = total_bytes
+        self.chunks = 0
+        self.rows = 0
+        self.bytes = 0
+        self.started = time.perf_counter()
+        self._lock = threading.Lock()
+
+    def update(self, rows: int, nbytes: int) -> None:
+        with self._lock:
+            self.chunks += 1
+            self.rows += rows
+            self.bytes += nbytes
+            elapsed = time.perf_counter() - self.started
+            byte_rate = self.bytes / elapsed if elapsed else 0.0
+            eta = (self.total_bytes - self.bytes) / byte_rate if byte_rate else 0.0
+            logger.info(
+                f"chunk {self.chunks}/{self.total_chunks}: {self.rows:,} rows, "
+                f"{self.rows / elapsed:,.0f} rows/s, {byte_rate / 2**20:.1f} MB/s, "
+                f"ETA {eta:.0f}s"
+            )
+
+
+def _write_chunk(bind: Engine, source: str, chunk: ParsedChunk, on_conflict: str) -> int:
+    """Write a chunk's rows, photographer summaries and checkpoint in one transaction."""
+    now = datetime.utcnow()
+    with bind.begin() as conn:
+        written = 0
+        if chunk.rows:
+            values, photographers = split_photographers(
+                [{**row, "created_at": now, "updated_at": now} for row in chunk.rows]
+            )
+            PhotographerService.save(conn, photographers, overwrite=on_conflict != "nothing")
+            written, photographer_ids = upsert_photos(
+                conn, upsert_statement(bind, on_conflict), values, on_conflict
+            )
+            PhotographerService.refresh(conn, photographer_ids)
+        conn.execute(
+            insert(IngestCheckpoint).values(
+                source=source,
+                chunk_start=chunk.start,
+                chunk_end=chunk.end,
+                rows=len(chunk.rows),
+                completed_at=now,
+            )
+        )
+    return written
+
+
+def _writer(
+    bind: Engine,
+    source: str,
+    chunks: "queue.Queue[Optional[ParsedChunk]]",
+    on_conflict: str,
+    progress: Progress,
+    written: List[int],
+    errors: List[BaseException],
+) -> None:
+    """Drain parsed chunks from the queue until a None sentinel arrives."""
+    while True:
+        chunk = chunks.get()
+        if chunk is None:
+            return
+        if errors:
+            # Keep draining so the producer never blocks on a full queue
+            continue
+        try:
+            written.append(_write_chunk(bind, source, chunk, on_conflict))
+            progress.update(len(chunk.rows), chunk.end - chunk.start)
+        except BaseException as e:
+            logger.error(f"Chunk [{chunk.start}, {chunk.end}) failed: {e}")
+            errors.append(e)
+
+
+def run_pipeline(
+    csv_path: str,
+    bind: Engine = engine,
+    workers: Optional[int] = None,
+    writers: int = 2,
+    chunk_size: int = 16 * 2**20,
+    on_conflict: str = "nothing",
+    restart: bool = False,
+) -> PipelineStats:
+    """
+    Ingest csv_path with `workers` parser processes and `writers` DB writers.
+
+    Chunks already recorded in ingest_checkpoints are skipped unless restart
+    is set. Memory is bounded by the chunks being parsed (one per worker),
+    queued (2 * writers) and written (one per writer), whatever the file size.
+    """
+    if on_conflict not in ON_CONFLICT_MODES:
+        raise ValueError(f"on_conflict must be one of {', '.join(ON_CONFLICT_MODES)}")
+    if bind.dialect.name == "sqlite" and writers > 1:
+        logger.info("SQLite allows a single writer at a time; using 1 writer")
+        writers = 1
+    workers = workers or os.cpu_count() or 1
+
+    started = time.perf_counter()
+    source = source_key(csv_path)
+    header, chunks = split_chunks(csv_path, chunk_size)
+    _columns_for_header(header)
+
+    with bind.begin() as conn:
+        if restart:
+            conn.execute(delete(IngestCheckpoint).where(IngestCheckpoint.source == source))
+        done = set(
+            conn.execute(
+                select(IngestCheckpoint.chunk_start, IngestCheckpoint.chunk_end).where(
+                    IngestCheckpoint.source == source
+                )
+            ).tuples()
+        )
+    pending = [chunk for chunk in chunks if chunk not in done]
+    logger.info(
+        f"{len(chunks)} chunks in {csv_path}: {len(chunks) - len(pending)} already done, "
+        f"{len(pending)} to go"
+    )
+
+    progress = Progress(len(pending), sum(end - start for start, end in pending))
+    parsed: "queue.Queue[Optional[ParsedChunk]]" = queue.Queue(maxsize=2 * writers)
+    written: List[int] = []
+    errors: List[BaseException] = []
+    threads = [
+        threading.Thread(
+            target=_writer,
+            args=(bind, source, parsed, on_conflict, progress, written, errors),
+            name=f"ingest-writer-{i}",
+        )
+        for i in range(writers)
+    ]
+    for thread in threads:
+        thread.start()
+
+    try:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            in_flight = deque()
+            for start, end in pending:
+                if errors:
+                    break
+                in_flight.append(pool.submit(parse_chunk, csv_path, header, start, end))
+                # Bound parsed-but-unwritten chunks; put() blocks while writers catch up
+                if len(in_flight) >= workers:
+                    parsed.put(in_flight.popleft().result())
+            while in_flight and not errors:
+                parsed.put(in_flight.popleft().result())
+            for future in in_flight:
+                future.cancel()
+    finally:
+        for _ in threads:
+            parsed.put(None)
+        for thread in threads:
+            thread.join()
+        invalidate_caches()
+
+    if errors:
+        raise errors[0]
+
+    stats = PipelineStats(
+        chunks_total=len(chunks),
+        chunks_skipped=len(chunks) - len(pending),
+        chunks_written=len(written),
+        rows_written=sum(written),
+        seconds=time.perf_counter() - started,
+    )
+    logger.info(
+        f"Ingested {progress.rows:,} rows ({stats.rows_written:,} written) from "
+        f"{stats.chunks_written} chunks in {stats.seconds:.1f}s "
+        f"({progress.rows / stats.seconds:,.0f} rows/s)"
+    )
+    return stats
+
+
+def main():
+    """Main function to run the parallel ingestion pipeline."""
+    parser = argparse.ArgumentParser(description="Parallel, resumable photo ingestion")
+    parser.add_argument("csv_path")
+    parser.add_argument("--workers", type=int, default=os.cpu_count(), help="Parser processes")
+    parser.add_argument("--writers", type=int, default=2, help="Concurrent DB writers")
+    parser.add_argument("--chunk-mb", type=float, default=16, help="Chunk size in MB")
+    parser.add_argument("--on-conflict", choices=ON_CONFLICT_MODES, default="nothing")
+    parser.add_argument(
+        "--restart", action="store_true", help="Ignore checkpoints from earlier runs"
+    )
+    args = parser.parse_args()
+
+    Base.metadata.create_all(bind=engine)
+    try:
+        run_pipeline(
+            args.csv_path,
+            workers=args.workers,
+            writers=args.writers,
+            chunk_size=int(args.chunk_mb * 2**20),
+            on_conflict=args.on_conflict,
+            restart=args.restart,
+        )
+    except Exception as e:
+        logger.error(f"Ingestion stopped: {e}; rerun to resume from the last checkpoint")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,23 +1,95 @@
 """
 Script to ingest photo data from photos.csv into the database.
+
+The default mode adds photos one by one through the ORM, which is fine for the
+sample file. Pass --bulk for large dumps: on PostgreSQL the file is streamed
+into a staging table with COPY and merged with INSERT ... ON CONFLICT; other
+databases get batched multi-row inserts. Memory use stays flat either way.
+
+Photographer names and URLs are written to the photographers table (the
+newest photo of each photographer in a batch names them), and summaries
+(photographer_stats) are refreshed, in the same transaction, for the
+photographers of the rows a batch actually wrote and the previous owners of
+photos it moved; --delete-missing rebuilds them entirely.
+
+Every photo stores a fingerprint of its source row. With --on-conflict delta
+only rows whose fingerprint changed are rewritten, and --delete-missing
+removes photos absent from the file (for full snapshots), so a nightly sync
+costs in proportion to what changed upstream.
+
+Cached list responses and totals are invalidated once the run ends. API
+workers only see that through the shared response cache
+(RESPONSE_CACHE_REDIS_URL); without it they keep serving cached pages for
+up to RESPONSE_CACHE_TTL_SECONDS.
+
+Usage:
+    python scripts/ingest_photos.py [csv_path] [--bulk]
+        [--on-conflict nothing|update|delta] [--delete-missing]
 """
+import argparse
 import csv
+import hashlib
 import sys
+import time
+from datetime import datetime
 from pathlib import Path
+from typing import Dict, Iterator, List, NamedTuple, Set, Tuple
 
 # Add parent directory to path to import app modules
 sys.path.append(str(Path(__file__).parent.parent))
 
+from sqlalchemy import select, text
+from sqlalchemy.engine import Connection, Engine
 from sqlalchemy.orm import Session
 from app.db.database import SessionLocal, engine, Base
 from app.models.photo import Photo
+from app.models.photographer import PHOTOGRAPHER_FIELDS
 from app.models.user import User
+from app.core.color import COLOR_COLUMNS, color_components
+from app.core.response_cache import photo_response_cache
 from app.core.security import get_password_hash
+from app.services.count_service import CountService
+from app.services.export_service import PHOTOS_CSV_COLUMNS
+from app.services.photographer_service import PhotographerService
 import logging
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# CSV header -> photo field (the layout GET /photos/export also produces)
+CSV_COLUMNS = PHOTOS_CSV_COLUMNS
+# Fields of CSV_COLUMNS stored on photos; the rest go to photographers
+PHOTO_COLUMNS = [c for c in CSV_COLUMNS.values() if c not in PHOTOGRAPHER_FIELDS]
+INTEGER_COLUMNS = {"id", "width", "height", "photographer_id"}
+ON_CONFLICT_MODES = ("nothing", "update", "delta")
+
+# Separator between fields in the fingerprinted string (ASCII unit separator)
+FINGERPRINT_SEPARATOR = "\x1f"
+
+# Bytes handed to COPY per read; bounds memory regardless of file size
+COPY_BUFFER_SIZE = 1 << 20
+
+# COLOR_COLUMNS computed from photos_staging.avg_color, as color_components() does
+COPY_COLOR_COMPONENTS = ", ".join(
+    f"CASE WHEN avg_color ~ '^#?[0-9A-Fa-f]{{6}}$' "
+    f"THEN ('x' || substr(ltrim(avg_color, '#'), {start}, 2))::bit(8)::int END"
+    for start in (1, 3, 5)
+)
+
+
+class IngestStats(NamedTuple):
+    """Outcome of a bulk ingest run."""
+
+    rows_read: int
+    rows_written: int
+    seconds: float
+    rows_deleted: int = 0
+
+    @property
+    def rows_per_second(self) -> float:
+        """Rows read per second of wall time."""
+        return self.rows_read / self.seconds if self.seconds else 0.0
+
 
 def create_admin_user(db: Session):
     """Create a default admin user if it doesn't exist."""
@@ -37,51 +109,88 @@ def create_admin_user(db: Session):
         logger.info("Admin user already exists")
 
 
-def ingest_photos(csv_path: str, db: Session):
-    """Ingest photos from CSV file into the database."""
+def invalidate_caches() -> None:
+    """Invalidate cached list responses and totals after photos were written."""
+    CountService.invalidate()
+    photo_response_cache.invalidate()
+
+
+def fingerprint(values: Dict[str, object]) -> str:
+    """
+    MD5 of a photo's source fields in CSV_COLUMNS order.
+
+    Integers are rendered canonically, so "0042" and "42" match. The COPY path
+    computes the same digest in SQL with md5(concat_ws(...)).
+    """
+    joined = FINGERPRINT_SEPARATOR.join(str(values[c]) for c in CSV_COLUMNS.values())
+    return hashlib.md5(joined.encode("utf-8"), usedforsecurity=False).hexdigest()
+
+
+def row_to_values(row: Dict[str, str]) -> Dict[str, object]:
+    """Map a CSV row onto photo field values, including its fingerprint and colour components."""
+    values = {column: row[header] for header, column in CSV_COLUMNS.items()}
+    for column in INTEGER_COLUMNS:
+        values[column] = int(values[column])
+    values["fingerprint"] = fingerprint(values)
+    values.update(color_components(values["avg_color"]))
+    return values
+
+
+def split_photographers(
+    values: List[Dict[str, object]]
+) -> Tuple[List[Dict[str, object]], Dict[int, Tuple[str, str]]]:
+    """
+    Split row_to_values() output into photos rows and the photographers
+    they name, as photographer_id -> (name, url).
+
+    When rows disagree about a photographer, the row with the highest photo
+    id wins, as in the COPY path.
+    """
+    photographers = {
+        row["photographer_id"]: (row["photographer"], row["photographer_url"])
+        for row in sorted(values, key=lambda row: row["id"])
+    }
+    photos = [{k: v for k, v in row.items() if k not in PHOTOGRAPHER_FIELDS} for row in values]
+    return photos, photographers
+
+
+def ingest_photos(csv_path: str, db: Session, batch_size: int = 100):
+    """
+    Ingest photos from CSV file into the database, skipping existing ones.
+
+    Each batch of batch_size rows takes one SELECT for the ids already
+    stored and one PhotographerService.save() call, and is committed along
+    with the summaries of its photographers.
+    """
     try:
         with open(csv_path, "r", encoding="utf-8") as file:
-            csv_reader = csv.DictReader(file)
             count = 0
-
-            for row in csv_reader:
-                # Check if photo already exists
-                existing_photo = db.query(Photo).filter(Photo.id == int(row["id"])).first()
-                if existing_photo:
-                    logger.debug(f"Photo {row['id']} already exists, skipping")
-                    continue
-
-                # Create photo object
-                photo = Photo(
-                    id=int(row["id"]),
-                    width=int(row["width"]),
-                    height=int(row["height"]),
-                    url=row["url"],
-                    photographer=row["photographer"],
-                    photographer_url=row["photographer_url"],
-                    photographer_id=int(row["photographer_id"]),
-                    avg_color=row["avg_color"],
-                    src_original=row["src.original"],
-                    src_large2x=row["src.large2x"],
-                    src_large=row["src.large"],
-                    src_medium=row["src.medium"],
-                    src_small=row["src.small"],
-                    src_portrait=row["src.portrait"],
-                    src_landscape=row["src.landscape"],
-                    src_tiny=row["src.tiny"],
-                    alt=row["alt"],
+            for batch in _batches(csv.DictReader(file), batch_size):
+                # Skip photos that already exist, and repeats of an id in the batch
+                seen = set(
+                    db.scalars(select(Photo.id).where(Photo.id.in_([int(r["id"]) for r in batch])))
                 )
+                rows = []
+                for row in batch:
+                    values = row_to_values(row)
+                    if values["id"] in seen:
+                        logger.debug(f"Photo {values['id']} already exists, skipping")
+                        continue
+                    seen.add(values["id"])
+                    rows.append(values)
+                if not rows:
+                    continue
 
-                db.add(photo)
-                count += 1
-
-                # Commit in batches of 100
-                if count % 100 == 0:
-                    db.commit()
-                    logger.info(f"Ingested {count} photos")
+                values, photographers = split_photographers(rows)
+                PhotographerService.save(db, photographers, overwrite=False)
+                db.add_all(Photo(**v) for v in values)
+                db.flush()
+                # In the batch's transaction, so committed photos never have stale summaries
+                PhotographerService.refresh(db, photographers)
+                db.commit()
+                count += len(values)
+                logger.info(f"Ingested {count} photos")
 
-            # Commit remaining photos
-            db.commit()
             logger.info(f"Successfully ingested {count} photos from {csv_path}")
 
     except FileNotFoundError:
@@ -91,10 +200,318 @@ def ingest_photos(csv_path: str, db: Session):
         logger.error(f"Error ingesting photos: {e}")
         db.rollback()
         raise
+    finally:
+        # Batches committed before a failure are visible too
+        invalidate_caches()
+
+
+def upsert_photos(
+    conn: Connection, stmt, values: List[Dict[str, object]], on_conflict: str
+) -> Tuple[int, Set[int]]:
+    """
+    Upsert a batch of photos rows with stmt, upsert_statement(on_conflict).
+
+    Returns the number of rows written and the photographers whose summaries
+    the write can change: the owners of the rows written and, for overwritten
+    photos, their previous owners. Rows skipped by ON CONFLICT touch nobody.
+    """
+    previous = {}
+    if on_conflict != "nothing":
+        previous = dict(
+            conn.execute(
+                select(Photo.id, Photo.photographer_id).where(
+                    Photo.id.in_([v["id"] for v in values])
+                )
+            ).all()
+        )
+    table = Photo.__table__
+    written = conn.execute(stmt.returning(table.c.id, table.c.photographer_id), values).all()
+    photographer_ids = {photographer_id for _, photographer_id in written}
+    photographer_ids.update(previous[photo_id] for photo_id, _ in written if photo_id in previous)
+    return len(written), photographer_ids
+
+
+def _columns_for_header(header: List[str]) -> List[str]:
+    """Map a CSV header onto photo fields, in file order."""
+    missing = set(CSV_COLUMNS) - set(header)
+    unknown = set(header) - set(CSV_COLUMNS)
+    if missing or unknown:
+        raise ValueError(
+            f"Unexpected CSV header (missing: {sorted(missing)}, unknown: {sorted(unknown)})"
+        )
+    return [CSV_COLUMNS[name] for name in header]
+
+
+def _batches(reader: Iterator[Dict[str, str]], size: int) -> Iterator[List[Dict[str, str]]]:
+    """Group rows into lists of at most size rows."""
+    batch = []
+    for row in reader:
+        batch.append(row)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def _copy_ingest(
+    csv_path: str, bind: Engine, on_conflict: str, delete_missing: bool
+) -> tuple[int, int, int]:
+    """
+    Stream the CSV into a temporary staging table with COPY, then merge it
+    into photos in a single INSERT ... SELECT ... ON CONFLICT (id).
+
+    The file is read by psycopg2 in COPY_BUFFER_SIZE chunks and never held in
+    memory. Duplicate ids within the file are collapsed before the merge.
+    """
+    with bind.begin() as conn:
+        # COPY needs the DBAPI cursor; it shares conn's transaction
+        cursor = conn.connection.cursor()
+        with open(csv_path, "r", encoding="utf-8", newline="") as file:
+            header_columns = _columns_for_header(next(csv.reader([file.readline()])))
+            text_columns = ", ".join(c for c in header_columns if c not in INTEGER_COLUMNS)
+
+            cursor.execute(
+                "CREATE TEMP TABLE photos_staging (LIKE photos INCLUDING DEFAULTS) ON COMMIT DROP"
+            )
+            cursor.execute(
+                "ALTER TABLE photos_staging "
+                "ADD COLUMN IF NOT EXISTS photographer varchar, "
+                "ADD COLUMN IF NOT EXISTS photographer_url varchar"
+            )
+            # FORCE_NOT_NULL keeps empty strings as '' like the ORM path does
+            cursor.copy_expert(
+                f"COPY photos_staging ({', '.join(header_columns)}) FROM STDIN "
+                f"WITH (FORMAT csv, FORCE_NOT_NULL ({text_columns}))",
+                file,
+                size=COPY_BUFFER_SIZE,
+            )
+            rows_read = cursor.rowcount
+
+        # One row per photographer (many fewer than photos), named by their newest photo
+        cursor.execute(
+            "SELECT DISTINCT ON (photographer_id) photographer_id, photographer, photographer_url "
+            "FROM photos_staging ORDER BY photographer_id, id DESC"
+        )
+        PhotographerService.save(
+            conn,
+            {row[0]: (row[1], row[2]) for row in cursor.fetchall()},
+            overwrite=on_conflict != "nothing",
+        )
+        columns = [c for c in header_columns if c not in PHOTOGRAPHER_FIELDS]
+        column_list = ", ".join(columns)
+
+        # Same digest as fingerprint(); concat_ws renders integers canonically
+        digest = "md5(concat_ws(chr(31), {}))".format(", ".join(CSV_COLUMNS.values()))
+        if on_conflict == "nothing":
+            conflict = "DO NOTHING"
+        else:
+            updates = ", ".join(
+                f"{c} = EXCLUDED.{c}" for c in [*columns, *COLOR_COLUMNS] if c != "id"
+            )
+            conflict = (
+                f"DO UPDATE SET {updates}, fingerprint = EXCLUDED.fingerprint, "
+                f"updated_at = EXCLUDED.updated_at"
+            )
+            if on_conflict == "delta":
+                conflict += " WHERE photos.fingerprint IS DISTINCT FROM EXCLUDED.fingerprint"
+        # Summaries to refresh: owners of the rows written and, for overwritten
+        # photos, their previous owners (every CTE sees photos before the INSERT)
+        previous = touched = ""
+        if on_conflict != "nothing":
+            previous = (
+                "previous AS (SELECT p.id, p.photographer_id "
+                "FROM photos p JOIN photos_staging s USING (id)), "
+            )
+            touched = " UNION SELECT previous.photographer_id FROM previous JOIN written USING (id)"
+        cursor.execute(
+            f"WITH {previous}written AS ("
+            f"INSERT INTO photos ({column_list}, {', '.join(COLOR_COLUMNS)}, "
+            f"fingerprint, created_at, updated_at) "
+            f"SELECT DISTINCT ON (id) {column_list}, {COPY_COLOR_COMPONENTS}, {digest}, "
+            f"now() AT TIME ZONE 'utc', now() AT TIME ZONE 'utc' "
+            f"FROM photos_staging ORDER BY id "
+            f"ON CONFLICT (id) {conflict} "
+            f"RETURNING id, photographer_id) "
+            f"SELECT (SELECT count(*) FROM written), "
+            f"ARRAY(SELECT photographer_id FROM written{touched})"
+        )
+        rows_written, photographer_ids = cursor.fetchone()
+
+        rows_deleted = 0
+        if delete_missing:
+            if not rows_read:
+                raise ValueError("Refusing to delete missing photos: the file has no rows")
+            cursor.execute(
+                "DELETE FROM photos WHERE NOT EXISTS "
+                "(SELECT 1 FROM photos_staging s WHERE s.id = photos.id)"
+            )
+            rows_deleted = cursor.rowcount
+            PhotographerService.rebuild(conn)
+        else:
+            PhotographerService.refresh(conn, photographer_ids)
+
+        return rows_read, rows_written, rows_deleted
+
+
+def upsert_statement(bind: Engine, on_conflict: str):
+    """
+    INSERT into photos with ON CONFLICT (id) DO NOTHING or DO UPDATE.
+
+    "delta" only updates rows whose stored fingerprint differs from the new
+    one, so unchanged photos are not rewritten.
+    """
+    if bind.dialect.name == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert
+    elif bind.dialect.name == "sqlite":
+        from sqlalchemy.dialects.sqlite import insert
+    else:
+        raise ValueError(f"Bulk ingest is not supported on {bind.dialect.name}")
+
+    stmt = insert(Photo.__table__)
+    if on_conflict == "nothing":
+        return stmt.on_conflict_do_nothing(index_elements=["id"])
+
+    return stmt.on_conflict_do_update(
+        index_elements=["id"],
+        set_={
+            column: stmt.excluded[column]
+            for column in [*PHOTO_COLUMNS, *COLOR_COLUMNS, "fingerprint", "updated_at"]
+            if column != "id"
+        },
+        where=(
+            Photo.__table__.c.fingerprint.is_distinct_from(stmt.excluded.fingerprint)
+            if on_conflict == "delta"
+            else None
+        ),
+    )
+
+
+def _batched_insert_ingest(
+    csv_path: str, bind: Engine, on_conflict: str, batch_size: int, delete_missing: bool
+) -> tuple[int, int, int]:
+    """
+    Insert the CSV in batches of batch_size rows with executemany, committing
+    each batch. Used when the bind is not PostgreSQL over psycopg2 (e.g.
+    SQLite, or asyncpg and pg8000), as COPY goes through psycopg2.
+
+    With delete_missing, the ids seen are collected in a temporary table
+    rather than in memory.
+    """
+    stmt = upsert_statement(bind, on_conflict)
+    rows_read = rows_written = rows_deleted = 0
+    started = time.perf_counter()
+    with bind.connect() as conn, open(csv_path, "r", encoding="utf-8", newline="") as file:
+        if delete_missing:
+            conn.execute(text("CREATE TEMP TABLE ingest_seen_ids (id INTEGER NOT NULL)"))
+
+        reader = csv.DictReader(file)
+        _columns_for_header(reader.fieldnames or [])
+        for batch in _batches(reader, batch_size):
+            now = datetime.utcnow()
+            values, photographers = split_photographers(
+                [{**row_to_values(row), "created_at": now, "updated_at": now} for row in batch]
+            )
+            PhotographerService.save(conn, photographers, overwrite=on_conflict != "nothing")
+            written, photographer_ids = upsert_photos(conn, stmt, values, on_conflict)
+            rows_written += written
+            if not delete_missing:
+                PhotographerService.refresh(conn, photographer_ids)
+            else:
+                conn.execute(
+                    text("INSERT INTO ingest_seen_ids (id) VALUES (:id)"),
+                    [{"id": v["id"]} for v in values],
+                )
+            conn.commit()
+            rows_read += len(batch)
+            elapsed = time.perf_counter() - started
+            logger.info(f"Ingested {rows_read:,} rows ({rows_read / elapsed:,.0f} rows/s)")
+
+        if delete_missing:
+            if not rows_read:
+                raise ValueError("Refusing to delete missing photos: the file has no rows")
+            conn.execute(text("CREATE INDEX ingest_seen_ids_id ON ingest_seen_ids (id)"))
+            rows_deleted = conn.execute(
+                text(
+                    "DELETE FROM photos WHERE NOT EXISTS "
+                    "(SELECT 1 FROM ingest_seen_ids s WHERE s.id = photos.id)"
+                )
+            ).rowcount
+            conn.execute(text("DROP TABLE ingest_seen_ids"))
+            PhotographerService.rebuild(conn)
+            conn.commit()
+
+    return rows_read, rows_written, rows_deleted
+
+
+def bulk_ingest(
+    csv_path: str,
+    bind: Engine = engine,
+    on_conflict: str = "nothing",
+    batch_size: int = 10_000,
+    delete_missing: bool = False,
+) -> IngestStats:
+    """
+    Load a Pexels CSV dump in bulk.
+
+    on_conflict="nothing" keeps existing photos untouched; "update" overwrites
+    them with the values from the file; "delta" overwrites only those whose
+    source row changed since it was last ingested. delete_missing treats the
+    file as a full snapshot and deletes photos whose id it does not contain.
+    """
+    if on_conflict not in ON_CONFLICT_MODES:
+        raise ValueError(f"on_conflict must be one of {', '.join(ON_CONFLICT_MODES)}")
+
+    started = time.perf_counter()
+    try:
+        if bind.dialect.name == "postgresql" and bind.dialect.driver == "psycopg2":
+            rows_read, rows_written, rows_deleted = _copy_ingest(
+                csv_path, bind, on_conflict, delete_missing
+            )
+        else:
+            rows_read, rows_written, rows_deleted = _batched_insert_ingest(
+                csv_path, bind, on_conflict, batch_size, delete_missing
+            )
+    finally:
+        # Batches committed before a failure are visible too
+        invalidate_caches()
+
+    stats = IngestStats(rows_read, rows_written, time.perf_counter() - started, rows_deleted)
+    logger.info(
+        f"Bulk ingested {stats.rows_read:,} rows from {csv_path} "
+        f"({stats.rows_written:,} written, {stats.rows_deleted:,} deleted) "
+        f"in {stats.seconds:.1f}s ({stats.rows_per_second:,.0f} rows/s)"
+    )
+    return stats
 
 
 def main():
     """Main function to run the ingestion script."""
+    parser = argparse.ArgumentParser(description="Ingest photos from a CSV file")
+    parser.add_argument(
+        "csv_path",
+        nargs="?",
+        default=str(Path(__file__).parent.parent / "photos.csv"),
+    )
+    parser.add_argument(
+        "--bulk", action="store_true", help="Use COPY / batched inserts for large files"
+    )
+    parser.add_argument(
+        "--on-conflict",
+        choices=ON_CONFLICT_MODES,
+        default="nothing",
+        help="What --bulk does with photos that already exist",
+    )
+    parser.add_argument(
+        "--delete-missing",
+        action="store_true",
+        help="Treat the file as a full snapshot and delete photos not in it (--bulk only)",
+    )
+    parser.add_argument("--batch-size", type=int, default=10_000)
+    args = parser.parse_args()
+    if args.delete_missing and not args.bulk:
+        parser.error("--delete-missing requires --bulk")
+
     # Create tables
     logger.info("Creating database tables...")
     Base.metadata.create_all(bind=engine)
@@ -108,9 +525,16 @@ def main():
         create_admin_user(db)
 
         # Ingest photos
-        csv_path = Path(__file__).parent.parent / "photos.csv"
-        logger.info(f"Starting photo ingestion from {csv_path}")
-        ingest_photos(str(csv_path), db)
+        logger.info(f"Starting photo ingestion from {args.csv_path}")
+        if args.bulk:
+            bulk_ingest(
+                args.csv_path,
+                on_conflict=args.on_conflict,
+                batch_size=args.batch_size,
+                delete_missing=args.delete_missing,
+            )
+        else:
+            ingest_photos(args.csv_path, db)
 
         logger.info("Ingestion completed successfully!")
 
@@ -0,0 +1,286 @@
+"""
+Script to bring an existing database up to date with the current models.
+
+`Base.metadata.create_all` only creates missing tables, so indexes and
+columns added to existing tables have to be applied here. Every statement is
+idempotent and safe to re-run. Added columns derived from others (the colour
+components of avg_color) are backfilled in short batches.
+
+Photographer names and URLs moved from photos to the photographers table.
+On PostgreSQL that migration runs online in two phases:
+
+1. `migrate_schema.py` (expand): makes the old photos columns nullable and
+   copies them into photographers in short batches. Run it before deploying
+   the new app version and again once every instance runs it, to pick up
+   photographers written by old instances in between.
+2. `migrate_schema.py --contract`: copies any stragglers, adds the
+   photos -> photographers foreign key without a long lock (NOT VALID, then
+   VALIDATE) and drops the old columns and their indexes.
+
+Other databases are migrated in one go.
+
+Usage:
+    python scripts/migrate_schema.py [--contract]
+"""
+import argparse
+import sys
+from pathlib import Path
+
+# Add parent directory to path to import app modules
+sys.path.append(str(Path(__file__).parent.parent))
+
+from sqlalchemy import inspect, text
+from app.core.color import color_components
+from app.db.database import engine, Base
+from app.services.photographer_service import PhotographerService
+import app.models  # noqa: F401  (register models on Base.metadata)
+import logging
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# (table, column, type) added to existing tables when missing
+ADDED_COLUMNS = [
+    ("photos", "fingerprint", "VARCHAR(32)"),
+    ("photos", "color_r", "SMALLINT"),
+    ("photos", "color_g", "SMALLINT"),
+    ("photos", "color_b", "SMALLINT"),
+]
+
+# (table, column) of generated columns added when missing; type and expression
+# come from the model. PostgreSQL adds them STORED, which rewrites the table
+# under an exclusive lock, so run this in a quiet period on large tables.
+# SQLite can only add VIRTUAL generated columns, but indexes on them still
+# store the computed values.
+GENERATED_COLUMNS = [
+    ("photos", "aspect_ratio"),
+    ("photos", "megapixels"),
+]
+
+# Statements run on PostgreSQL outside a transaction so indexes can be built
+# CONCURRENTLY without blocking writes on a live photos table.
+POSTGRES_MIGRATIONS = [
+    "CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_created_id ON photos (created_at, id)",
+    "CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_photographer_id_created_id "
+    "ON photos (photographer_id, created_at, id)",
+    "CREATE EXTENSION IF NOT EXISTS pg_trgm",
+    "CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_alt_trgm ON photos USING gin (alt gin_trgm_ops)",
+    "CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_photographers_name_trgm "
+    "ON photographers USING gin (name gin_trgm_ops)",
+    "CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_color_rgb ON photos (color_r, color_g, color_b)",
+    "CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_aspect_ratio ON photos (aspect_ratio)",
+    "CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_width_id ON photos (width, id)",
+    "CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_height_id ON photos (height, id)",
+    "CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_megapixels_id ON photos (megapixels, id)",
+    # Superseded by idx_megapixels_id
+    "DROP INDEX CONCURRENTLY IF EXISTS idx_megapixels",
+]
+
+SQLITE_MIGRATIONS = [
+    "CREATE INDEX IF NOT EXISTS idx_created_id ON photos (created_at, id)",
+    "CREATE INDEX IF NOT EXISTS idx_photographer_id_created_id "
+    "ON photos (photographer_id, created_at, id)",
+    "CREATE INDEX IF NOT EXISTS idx_color_rgb ON photos (color_r, color_g, color_b)",
+    "CREATE INDEX IF NOT EXISTS idx_aspect_ratio ON photos (aspect_ratio)",
+    "CREATE INDEX IF NOT EXISTS idx_width_id ON photos (width, id)",
+    "CREATE INDEX IF NOT EXISTS idx_height_id ON photos (height, id)",
+    "CREATE INDEX IF NOT EXISTS idx_megapixels_id ON photos (megapixels, id)",
+    "DROP INDEX IF EXISTS idx_megapixels",
+]
+
+
+# Denormalized photographer columns of photos, and the indexes on them
+LEGACY_PHOTOGRAPHER_COLUMNS = ("photographer", "photographer_url")
+LEGACY_PHOTOGRAPHER_INDEXES = (
+    "idx_photographer_trgm",
+    "idx_photographer_created",
+    "ix_photos_photographer",
+)
+
+# Photographers (or photos, for colours) copied per backfill transaction
+BACKFILL_BATCH_SIZE = 10_000
+
+
+def backfill_colors(conn) -> int:
+    """
+    Fill the colour component columns of photos stored before they existed.
+
+    Walks photos in id order, BACKFILL_BATCH_SIZE at a time, each batch
+    committed on its own (conn is in autocommit). avg_color is parsed with
+    the same color_components() the app writes with. Returns the number of
+    photos updated.
+    """
+    updated, after = 0, -1
+    while True:
+        rows = conn.execute(
+            text(
+                "SELECT id, avg_color FROM photos WHERE id > :after "
+                "AND color_r IS NULL AND avg_color IS NOT NULL ORDER BY id LIMIT :size"
+            ),
+            {"after": after, "size": BACKFILL_BATCH_SIZE},
+        ).all()
+        if not rows:
+            return updated
+        values = []
+        for row in rows:
+            components = color_components(row.avg_color)
+            if components["color_r"] is not None:
+                values.append({"photo_id": row.id, **components})
+        if values:
+            conn.execute(
+                text(
+                    "UPDATE photos SET color_r = :color_r, color_g = :color_g, "
+                    "color_b = :color_b WHERE id = :photo_id"
+                ),
+                values,
+            )
+        updated += len(values)
+        after = rows[-1].id
+
+
+def backfill_photographers(conn) -> int:
+    """
+    Copy photographer names and URLs from photos into photographers.
+
+    Works through photographer_id in batches of BACKFILL_BATCH_SIZE
+    photographers, each committed on its own (conn is in autocommit), so no
+    lock is held for long. Each photographer is named by their newest photo.
+    Photographers already present are left alone. Returns the number added.
+    """
+    added, after = 0, -1
+    while True:
+        upto = conn.scalar(
+            text(
+                "SELECT max(photographer_id) FROM (SELECT DISTINCT photographer_id FROM photos "
+                "WHERE photographer_id > :after ORDER BY photographer_id LIMIT :size) batch"
+            ),
+            {"after": after, "size": BACKFILL_BATCH_SIZE},
+        )
+        if upto is None:
+            return added
+        added += conn.execute(
+            text(
+                "INSERT INTO photographers (id, name, url) "
+                "SELECT photographer_id, photographer, photographer_url FROM photos "
+                "WHERE id IN (SELECT max(id) FROM photos WHERE photographer_id > :after "
+                "AND photographer_id <= :upto AND photographer IS NOT NULL "
+                "GROUP BY photographer_id) "
+                "ON CONFLICT (id) DO NOTHING"
+            ),
+            {"after": after, "upto": upto},
+        ).rowcount
+        after = upto
+
+
+def migrate_photographers(conn, contract: bool) -> None:
+    """Move photographer names and URLs from photos to photographers (see module docstring)."""
+    postgres = engine.dialect.name == "postgresql"
+    inspector = inspect(conn)
+    legacy = [
+        c["name"]
+        for c in inspector.get_columns("photos")
+        if c["name"] in LEGACY_PHOTOGRAPHER_COLUMNS
+    ]
+
+    if legacy:
+        if postgres:
+            for column in legacy:
+                # New app versions no longer write these columns
+                statement = f"ALTER TABLE photos ALTER COLUMN {column} DROP NOT NULL"
+                logger.info(f"Applying: {statement}")
+                conn.execute(text(statement))
+        logger.info("Backfilling photographers from photos...")
+        logger.info(f"Added {backfill_photographers(conn)} photographers")
+
+    # Summaries used to copy names too; they are derived, so rebuild them
+    stats_columns = {c["name"] for c in inspector.get_columns("photographer_stats")}
+    if "photographer" in stats_columns:
+        logger.info("Rebuilding photographer_stats without photographer names...")
+        conn.execute(text("DROP TABLE photographer_stats"))
+        Base.metadata.create_all(bind=conn)
+        with engine.begin() as tx:
+            PhotographerService.rebuild(tx)
+
+    if not legacy or (postgres and not contract):
+        return
+
+    statements = []
+    if postgres:
+        foreign_keys = {fk["name"] for fk in inspector.get_foreign_keys("photos")}
+        if "photos_photographer_id_fkey" not in foreign_keys:
+            statements += [
+                "ALTER TABLE photos ADD CONSTRAINT photos_photographer_id_fkey "
+                "FOREIGN KEY (photographer_id) REFERENCES photographers (id) NOT VALID",
+                # Checks existing rows without blocking writes
+                "ALTER TABLE photos VALIDATE CONSTRAINT photos_photographer_id_fkey",
+            ]
+        statements += [
+            f"DROP INDEX CONCURRENTLY IF EXISTS {index}" for index in LEGACY_PHOTOGRAPHER_INDEXES
+        ]
+    else:
+        statements += [f"DROP INDEX IF EXISTS {index}" for index in LEGACY_PHOTOGRAPHER_INDEXES]
+    statements += [f"ALTER TABLE photos DROP COLUMN {column}" for column in legacy]
+
+    for statement in statements:
+        logger.info(f"Applying: {statement}")
+        conn.execute(text(statement))
+
+
+def migrate(contract: bool = False):
+    """Apply all pending schema changes."""
+    Base.metadata.create_all(bind=engine)
+
+    if engine.dialect.name == "postgresql":
+        statements = POSTGRES_MIGRATIONS
+    else:
+        statements = SQLITE_MIGRATIONS
+
+    with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+        inspector = inspect(conn)
+        for table, column, type_ in ADDED_COLUMNS:
+            if column not in {c["name"] for c in inspector.get_columns(table)}:
+                statement = f"ALTER TABLE {table} ADD COLUMN {column} {type_}"
+                logger.info(f"Applying: {statement}")
+                conn.execute(text(statement))
+
+        storage = "STORED" if engine.dialect.name == "postgresql" else "VIRTUAL"
+        for table, column in GENERATED_COLUMNS:
+            if column not in {c["name"] for c in inspector.get_columns(table)}:
+                definition = Base.metadata.tables[table].c[column]
+                statement = (
+                    f"ALTER TABLE {table} ADD COLUMN {column} "
+                    f"{definition.type.compile(dialect=engine.dialect)} "
+                    f"GENERATED ALWAYS AS ({definition.computed.sqltext}) {storage}"
+                )
+                logger.info(f"Applying: {statement}")
+                conn.execute(text(statement))
+
+        for statement in statements:
+            logger.info(f"Applying: {statement}")
+            conn.execute(text(statement))
+
+        logger.info(f"Backfilled colour components of {backfill_colors(conn)} photos")
+
+        migrate_photographers(conn, contract)
+
+
+def main():
+    """Main function to run the migration script."""
+    parser = argparse.ArgumentParser(description="Bring the database schema up to date")
+    parser.add_argument(
+        "--contract",
+        action="store_true",
+        help="Drop the old photographer columns of photos once every app instance is upgraded",
+    )
+    args = parser.parse_args()
+
+    try:
+        migrate(contract=args.contract)
+        logger.info("Migration completed successfully!")
+    except Exception as e:
+        logger.error(f"Migration failed: {e}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,42 @@
+"""
+Script to rebuild the photographer_stats summary table from photos.
+
+Writes keep the summaries current incrementally; run this once after
+upgrading (to populate the table for existing photos) or whenever the
+summaries are suspected to have drifted. The rebuild runs in a single
+transaction, so readers see either the old or the new summaries.
+"""
+import sys
+import time
+from pathlib import Path
+
+# Add parent directory to path to import app modules
+sys.path.append(str(Path(__file__).parent.parent))
+
+from app.db.database import engine, Base
+from app.services.photographer_service import PhotographerService
+import app.models  # noqa: F401  (register models on Base.metadata)
+import logging
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+def main():
+    """Main function to run the rebuild script."""
+    try:
+        Base.metadata.create_all(bind=engine)
+        started = time.perf_counter()
+        with engine.begin() as conn:
+            count = PhotographerService.rebuild(conn)
+        logger.info(
+            f"Rebuilt summaries for {count} photographers "
+            f"in {time.perf_counter() - started:.2f}s"
+        )
+    except Exception as e:
+        logger.error(f"Rebuild failed: {e}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -8,7 +8,15 @@ from sqlalchemy.orm import sessionmaker
 from app.main import app
 from app.db.database import Base, get_db
 from app.models.user import User
+from app.models.photographer import Photographer
 from app.core.security import get_password_hash
+from app.core.compression import compression_stats
+from app.core.fast_json import photo_fragment_cache
+from app.core.rate_limit import rate_limiter
+from app.core.response_cache import photo_response_cache
+from app.core.security import token_cache
+from app.core.user_cache import user_cache
+from app.services.count_service import CountService
 
 # Use SQLite in-memory database for testing
 SQLALCHEMY_DATABASE_URL = "sqlite:///./test.db"
@@ -19,6 +27,19 @@ engine = create_engine(
 TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
 
+@pytest.fixture(autouse=True)
+def reset_caches():
+    """Clear in-process caches so state does not leak between tests."""
+    CountService.invalidate()
+    user_cache.clear()
+    token_cache.clear()
+    rate_limiter.backend.clear()
+    photo_response_cache.clear()
+    photo_fragment_cache.clear()
+    compression_stats.clear()
+    yield
+
+
 @pytest.fixture(scope="function")
 def db():
     """Create a fresh database for each test."""
@@ -63,6 +84,17 @@ def test_user(db):
     return user
 
 
+@pytest.fixture
+def test_photographer(db):
+    """Create the photographer test photos belong to by default."""
+    photographer = Photographer(
+        id=123, name="Test Photographer", url="https://example.com/photographer"
+    )
+    db.add(photographer)
+    db.commit()
+    return photographer
+
+
 @pytest.fixture
 def test_admin(db):
     """Create a test admin user."""
@@ -0,0 +1,222 @@
+"""
+Tests for the async request path (DATABASE_ASYNC).
+"""
+import pytest
+from fastapi import FastAPI, status
+from fastapi.testclient import TestClient
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.pool import NullPool
+from app.api import async_auth, photographers, photos
+from app.api.sessions import ASYNC_SESSIONS
+from app.db.database import get_async_db, get_async_database_url
+from app.models.photo import Photo
+from app.models.photographer import PHOTOGRAPHER_FIELDS, Photographer
+from tests.conftest import SQLALCHEMY_DATABASE_URL
+
+# NullPool: the test client may run each request on a different event loop
+async_engine = create_async_engine(
+    get_async_database_url(SQLALCHEMY_DATABASE_URL), poolclass=NullPool
+)
+TestingAsyncSessionLocal = async_sessionmaker(
+    bind=async_engine, class_=AsyncSession, autoflush=False, expire_on_commit=False
+)
+
+
+@pytest.fixture
+def async_client(db):
+    """Create a test client for an app serving the async routers."""
+    app = FastAPI()
+    app.include_router(async_auth.router)
+    app.include_router(photos.build_router(ASYNC_SESSIONS))
+    app.include_router(photographers.build_router(ASYNC_SESSIONS))
+
+    async def override_get_async_db():
+        async with TestingAsyncSessionLocal() as session:
+            yield session
+
+    app.dependency_overrides[get_async_db] = override_get_async_db
+    with TestClient(app) as test_client:
+        yield test_client
+
+
+@pytest.fixture
+def async_headers(async_client, test_user):
+    """Get authorization headers from the async login route."""
+    response = async_client.post(
+        "/auth/login",
+        json={"username": "testuser", "password": "testpass123"},
+    )
+    assert response.status_code == status.HTTP_200_OK
+    return {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+
+@pytest.fixture
+def async_admin_headers(async_client, test_admin):
+    """Get admin authorization headers from the async login route."""
+    response = async_client.post(
+        "/auth/login",
+        json={"username": "admin", "password": "adminpass123"},
+    )
+    return {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+
+PHOTO_DATA = {
+    "width": 1920,
+    "height": 1080,
+    "url": "https://example.com/photo",
+    "photographer": "Test Photographer",
+    "photographer_url": "https://example.com/photographer",
+    "photographer_id": 123,
+    "avg_color": "#FFFFFF",
+    "src_original": "https://example.com/original.jpg",
+    "src_large2x": "https://example.com/large2x.jpg",
+    "src_large": "https://example.com/large.jpg",
+    "src_medium": "https://example.com/medium.jpg",
+    "src_small": "https://example.com/small.jpg",
+    "src_portrait": "https://example.com/portrait.jpg",
+    "src_landscape": "https://example.com/landscape.jpg",
+    "src_tiny": "https://example.com/tiny.jpg",
+    "alt": "Test photo",
+}
+
+# PHOTO_DATA without the fields stored on photographers, for building Photo rows
+PHOTO_ROW = {k: v for k, v in PHOTO_DATA.items() if k not in PHOTOGRAPHER_FIELDS}
+
+
+def test_async_register_and_refresh(async_client):
+    """Test registration and token refresh on the async routes."""
+    response = async_client.post(
+        "/auth/register",
+        json={"email": "async@example.com", "username": "asyncuser", "password": "password123"},
+    )
+    assert response.status_code == status.HTTP_201_CREATED
+    assert response.json()["username"] == "asyncuser"
+
+    login = async_client.post(
+        "/auth/login", json={"username": "asyncuser", "password": "password123"}
+    )
+    refresh_token = login.json()["refresh_token"]
+    response = async_client.post(f"/auth/refresh?refresh_token={refresh_token}")
+    assert response.status_code == status.HTTP_200_OK
+
+
+def test_async_login_invalid_credentials(async_client, test_user):
+    """Test login with a wrong password on the async routes."""
+    response = async_client.post(
+        "/auth/login",
+        json={"username": "testuser", "password": "wrongpassword"},
+    )
+    assert response.status_code == status.HTTP_401_UNAUTHORIZED
+
+
+def test_async_list_and_get_photos(async_client, async_headers, db, test_photographer):
+    """Test reading photos through the async routes."""
+    db.add(Photo(id=7, **PHOTO_ROW))
+    db.commit()
+
+    response = async_client.get("/photos/", headers=async_headers)
+    assert response.status_code == status.HTTP_200_OK
+    data = response.json()
+    assert data["total"] == 1
+    assert data["photos"][0]["id"] == 7
+
+    response = async_client.get("/photos/7", headers=async_headers)
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json()["alt"] == "Test photo"
+
+    response = async_client.get("/photos/batch?ids=99999,7", headers=async_headers)
+    assert [r["found"] for r in response.json()["results"]] == [False, True]
+
+    response = async_client.get("/photos/99999", headers=async_headers)
+    assert response.status_code == status.HTTP_404_NOT_FOUND
+
+    response = async_client.get("/photos/photographer/123", headers=async_headers)
+    assert response.json()["total"] == 1
+
+    response = async_client.get("/photos/?fields=alt", headers=async_headers)
+    assert response.json()["photos"] == [{"id": 7, "alt": "Test photo"}]
+    response = async_client.get("/photos/7?fields=alt", headers=async_headers)
+    assert response.json() == {"id": 7, "alt": "Test photo"}
+    response = async_client.get(
+        "/photos/?sort=megapixels&order=asc&fields=alt", headers=async_headers
+    )
+    assert response.json()["photos"] == [{"id": 7, "alt": "Test photo"}]
+
+    response = async_client.get(
+        "/photos/similar-color?color=FAFAFA&fields=alt", headers=async_headers
+    )
+    assert response.json()["results"] == [
+        {"distance": 8.66, "photo": {"id": 7, "alt": "Test photo"}}
+    ]
+
+
+def test_async_admin_writes(async_client, async_headers, async_admin_headers):
+    """Test create, update and delete through the async routes."""
+    response = async_client.post("/photos/", json=PHOTO_DATA, headers=async_headers)
+    assert response.status_code == status.HTTP_403_FORBIDDEN
+
+    response = async_client.post("/photos/", json=PHOTO_DATA, headers=async_admin_headers)
+    assert response.status_code == status.HTTP_201_CREATED
+    photo_id = response.json()["id"]
+
+    response = async_client.patch(
+        f"/photos/{photo_id}", json={"alt": "Updated"}, headers=async_admin_headers
+    )
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json()["alt"] == "Updated"
+
+    response = async_client.delete(f"/photos/{photo_id}", headers=async_admin_headers)
+    assert response.status_code == status.HTTP_204_NO_CONTENT
+
+
+def test_async_export_photos(async_client, async_headers, db, test_photographer):
+    """Test streaming an export through the async routes."""
+    db.add(Photographer(id=124, name="Someone Else", url="https://example.com/else"))
+    db.add(Photo(id=7, **PHOTO_ROW))
+    db.add(Photo(id=8, **{**PHOTO_ROW, "photographer_id": 124}))
+    db.commit()
+
+    response = async_client.get("/photos/export?photographer=test", headers=async_headers)
+    assert response.status_code == status.HTTP_200_OK
+    lines = response.text.splitlines()
+    assert len(lines) == 1
+    assert '"id": 7' in lines[0]
+
+    response = async_client.get("/photos/export?format=csv", headers=async_headers)
+    assert response.text.splitlines()[0].startswith("id,width,height")
+    assert len(response.text.splitlines()) == 3
+
+
+def test_async_bulk_writes(async_client, async_admin_headers, db):
+    """Test the bulk write routes on the async router."""
+    response = async_client.post(
+        "/photos/bulk",
+        json={"items": [{**PHOTO_DATA, "id": 31}, {**PHOTO_DATA, "id": 32}]},
+        headers=async_admin_headers,
+    )
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json()["succeeded"] == 2
+
+    response = async_client.patch(
+        "/photos/bulk", json={"items": [{"id": 31, "alt": "Bulk"}]}, headers=async_admin_headers
+    )
+    assert response.json()["results"][0]["status"] == "updated"
+
+    response = async_client.request(
+        "DELETE", "/photos/bulk", json={"ids": [31, 32]}, headers=async_admin_headers
+    )
+    assert response.json()["applied"] is True
+    assert db.query(Photo).count() == 0
+
+
+def test_async_photographers(async_client, async_headers, async_admin_headers):
+    """Test that async writes refresh summaries served by the async router."""
+    async_client.post("/photos/", json={**PHOTO_DATA, "id": 41}, headers=async_admin_headers)
+
+    response = async_client.get("/photographers/?sort=latest", headers=async_headers)
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json()["photographers"][0]["photo_count"] == 1
+
+    response = async_client.get("/photographers/123", headers=async_headers)
+    assert response.json()["photographer"] == "Test Photographer"
+    assert async_client.get("/photographers/9", headers=async_headers).status_code == 404
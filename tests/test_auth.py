@@ -1,8 +1,17 @@
 """
 Tests for authentication endpoints.
 """
+import threading
+import time
+from datetime import timedelta
 import pytest
-from fastapi import status
+from fastapi import HTTPException, status
+from sqlalchemy import update
+from app.core.config import settings
+from app.core.hashing import PasswordHasher
+from app.core.security import create_access_token, decode_token, pwd_context, token_cache
+from app.core.user_cache import user_cache
+from app.models.user import User
 
 
 def test_register_user(client):
@@ -97,3 +106,79 @@ def test_refresh_token(client, test_user):
     data = response.json()
     assert "access_token" in data
     assert "refresh_token" in data
+
+
+def test_current_user_cache(client, db, test_user, auth_headers):
+    """Test that authorization reuses the cached user until it changes."""
+    client.get("/photos/", headers=auth_headers)
+    hits = user_cache.stats()["hits"]
+    response = client.get("/photos/", headers=auth_headers)
+    assert response.status_code == status.HTTP_200_OK
+    assert user_cache.stats()["hits"] == hits + 1
+
+    # Deactivating the user through the ORM drops the cached entry
+    test_user.is_active = False
+    db.commit()
+
+    response = client.get("/photos/", headers=auth_headers)
+    assert response.status_code == status.HTTP_403_FORBIDDEN
+
+
+def test_current_user_cache_core_update(client, db, test_user, auth_headers):
+    """Test that Core UPDATE statements on users drop cached users."""
+    client.get("/photos/", headers=auth_headers)
+    assert len(user_cache) == 1
+
+    db.execute(update(User).where(User.id == test_user.id).values(is_active=False))
+    db.commit()
+    assert len(user_cache) == 0
+
+    response = client.get("/photos/", headers=auth_headers)
+    assert response.status_code == status.HTTP_403_FORBIDDEN
+
+
+def test_decode_token_cache_respects_expiry():
+    """Test that cached token payloads are not served past exp."""
+    token = create_access_token(data={"sub": 1}, expires_delta=timedelta(seconds=1))
+
+    assert decode_token(token)["sub"] == "1"
+    hits = token_cache.stats()["hits"]
+    assert decode_token(token)["sub"] == "1"
+    assert token_cache.stats()["hits"] == hits + 1
+
+    time.sleep(2)
+    assert decode_token(token) is None
+
+
+def test_login_rehashes_password_with_new_cost(client, db, test_user):
+    """Test that a hash made with another bcrypt cost is replaced on login."""
+    test_user.hashed_password = pwd_context.handler("bcrypt").using(rounds=4).hash("testpass123")
+    db.commit()
+
+    response = client.post(
+        "/auth/login",
+        json={"username": "testuser", "password": "testpass123"},
+    )
+    assert response.status_code == status.HTTP_200_OK
+
+    db.refresh(test_user)
+    assert test_user.hashed_password.startswith(f"$2b${settings.BCRYPT_ROUNDS:02d}$")
+
+
+def test_password_hasher_rejects_when_saturated():
+    """Test that a full hashing queue fails fast with 503 and Retry-After."""
+    hasher = PasswordHasher(workers=1, max_queue=0)
+    release = threading.Event()
+    blocker = hasher._submit(release.wait)
+
+    with pytest.raises(HTTPException) as exc_info:
+        hasher.hash("password123")
+    assert exc_info.value.status_code == status.HTTP_503_SERVICE_UNAVAILABLE
+    assert "Retry-After" in exc_info.value.headers
+
+    release.set()
+    blocker.result()
+    assert hasher.hash("password123").startswith("$2b$")
+    stats = hasher.stats()
+    assert stats["rejected"] == 1
+    assert stats["completed"] == 2
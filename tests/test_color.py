@@ -0,0 +1,158 @@
+"""
+Tests for colour similarity filters and lookups.
+"""
+import random
+import pytest
+from fastapi import status
+from app.core import color
+from app.core.color import color_components, parse_hex_color, rank_by_distance
+from app.models.photo import Photo
+from scripts.ingest_photos import bulk_ingest
+from scripts.migrate_schema import backfill_colors
+from tests.conftest import engine
+from tests.test_ingest import PHOTOS_CSV
+from tests.test_photographers import PHOTO_DATA
+from tests.test_photos import make_photo
+
+# id -> avg_color; distances from #3A5F8B: 0, 9.38, 60, 221.74
+COLORS = {1: "#3A5F8B", 2: "#40658F", 3: "#3A5FC7", 4: "#DDDDDD"}
+
+
+def create_photos(client, admin_headers):
+    """Create one photo per entry of COLORS."""
+    for photo_id, color in COLORS.items():
+        response = client.post(
+            "/photos/",
+            json={
+                **PHOTO_DATA,
+                "id": photo_id,
+                "url": f"https://example.com/{photo_id}",
+                "avg_color": color,
+            },
+            headers=admin_headers,
+        )
+        assert response.status_code == status.HTTP_201_CREATED
+
+
+def test_parse_and_rank():
+    """Test hex parsing and the in-memory ranker."""
+    assert parse_hex_color("#3A5F8B") == (58, 95, 139)
+    assert parse_hex_color("3a5f8b") == (58, 95, 139)
+    for value in (None, "", "#FFF", "#GGGGGG", "#3A5F8B "):
+        assert parse_hex_color(value) is None
+    assert color_components("bogus") == {"color_r": None, "color_g": None, "color_b": None}
+
+    candidates = [(1, 0, 0, 0), (2, 10, 0, 0), (3, 0, 10, 0), (4, 3, 4, 0)]
+    assert rank_by_distance(candidates, (0, 0, 0), 3) == [(1, 0.0), (4, 5.0), (2, 10.0)]
+    assert rank_by_distance([], (0, 0, 0), 3) == []
+
+
+def test_numpy_ranker_matches_heapq(monkeypatch):
+    """Test that the NumPy ranker returns the heapq ranker's results and tie order."""
+    pytest.importorskip("numpy")
+    rng = random.Random(0)
+    # Few distinct colours, so many candidates tie on distance
+    colors = [(0, 0, 0), (3, 4, 0), (10, 0, 0), (0, 0, 5)]
+    candidates = [(i, *rng.choice(colors)) for i in range(500)]
+    rng.shuffle(candidates)
+
+    expected = {}
+    for limit in (1, 7, 120, 1000):
+        expected[limit] = rank_by_distance(candidates, (0, 0, 0), limit)
+    monkeypatch.setattr(color, "numpy", None)
+    for limit, ranked in expected.items():
+        assert ranked == rank_by_distance(candidates, (0, 0, 0), limit)
+
+
+def test_color_filter(client, admin_headers, auth_headers):
+    """Test ?color= and ?tolerance= on the list endpoint."""
+    create_photos(client, admin_headers)
+
+    response = client.get("/photos/?color=%233a5f8b&tolerance=20", headers=auth_headers)
+    assert response.status_code == status.HTTP_200_OK
+    assert sorted(p["id"] for p in response.json()["photos"]) == [1, 2]
+
+    # Default tolerance (40) excludes photo 3, 100 includes it
+    response = client.get("/photos/?color=3A5F8B", headers=auth_headers)
+    assert response.json()["total"] == 2
+    response = client.get("/photos/?color=3A5F8B&tolerance=100", headers=auth_headers)
+    assert response.json()["total"] == 3
+
+    response = client.get("/photos/?color=blue", headers=auth_headers)
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+    response = client.get("/photos/?color=3A5F8B&tolerance=500", headers=auth_headers)
+    assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+
+
+def test_similar_color(client, admin_headers, auth_headers):
+    """Test that /photos/similar-color returns the nearest photos first."""
+    create_photos(client, admin_headers)
+
+    response = client.get(
+        "/photos/similar-color?color=%233A5F8B&tolerance=442&limit=3&fields=avg_color",
+        headers=auth_headers,
+    )
+    assert response.status_code == status.HTTP_200_OK
+    data = response.json()
+    assert (data["color"], data["tolerance"]) == ("#3a5f8b", 442)
+    assert [r["photo"] for r in data["results"]] == [
+        {"id": 1, "avg_color": "#3A5F8B"},
+        {"id": 2, "avg_color": "#40658F"},
+        {"id": 3, "avg_color": "#3A5FC7"},
+    ]
+    assert [r["distance"] for r in data["results"]] == [0.0, 9.38, 60.0]
+
+    # Other filters still apply
+    response = client.get(
+        "/photos/similar-color?color=3A5F8B&tolerance=442&photographer=nobody",
+        headers=auth_headers,
+    )
+    assert response.json()["results"] == []
+
+    response = client.get("/photos/similar-color", headers=auth_headers)
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+
+def test_writes_keep_components_current(client, admin_headers, auth_headers, db):
+    """Test that updates and bulk writes store the parsed colour."""
+    create_photos(client, admin_headers)
+
+    client.patch("/photos/4", json={"avg_color": "#3A5F8C"}, headers=admin_headers)
+    client.patch(
+        "/photos/bulk", json={"items": [{"id": 1, "avg_color": "#000000"}]}, headers=admin_headers
+    )
+    client.post(
+        "/photos/bulk",
+        json={"items": [{**PHOTO_DATA, "id": 5, "avg_color": "#3B5F8B"}]},
+        headers=admin_headers,
+    )
+
+    response = client.get("/photos/similar-color?color=3A5F8B&tolerance=5", headers=auth_headers)
+    assert [r["photo"]["id"] for r in response.json()["results"]] == [4, 5]
+    db.expire_all()
+    assert (db.get(Photo, 1).color_r, db.get(Photo, 1).color_g) == (0, 0)
+
+
+def test_ingest_and_backfill_store_components(db, test_photographer):
+    """Test that ingest parses avg_color and the migration backfills old rows."""
+    bulk_ingest(PHOTOS_CSV, bind=engine, batch_size=3)
+    for photo in db.query(Photo):
+        assert color_components(photo.avg_color) == {
+            "color_r": photo.color_r,
+            "color_g": photo.color_g,
+            "color_b": photo.color_b,
+        }
+
+    # A photo stored before the colour columns existed
+    db.add(make_photo(0, id=10**9, avg_color="#102030"))
+    db.flush()
+    db.query(Photo).filter(Photo.id == 10**9).update(
+        {"color_r": None, "color_g": None, "color_b": None}
+    )
+    db.commit()
+    with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+        assert backfill_colors(conn) == 1
+        assert backfill_colors(conn) == 0
+    db.expire_all()
+    photo = db.get(Photo, 10**9)
+    assert (photo.color_r, photo.color_g, photo.color_b) == (16, 32, 48)
@@ -0,0 +1,101 @@
+"""
+Tests for the response compression middleware.
+"""
+import gzip
+from fastapi import status
+from starlette.applications import Starlette
+from starlette.responses import PlainTextResponse, Response, StreamingResponse
+from starlette.routing import Route
+from starlette.testclient import TestClient
+from app.core.compression import CompressionMiddleware, CompressionStats, negotiate
+from tests.test_photos import make_photo
+
+GZIP = {"Accept-Encoding": "gzip"}
+
+
+def make_client(stats: CompressionStats) -> TestClient:
+    """Client for a small app with large, small, streaming and binary responses."""
+
+    async def stream_rows():
+        yield b"id,url\n"
+        for i in range(200):
+            yield f"{i},https://images.pexels.com/photos/{i}/original.jpeg\n".encode()
+
+    routes = [
+        Route("/large", lambda request: PlainTextResponse("pexels " * 1000)),
+        Route("/small", lambda request: PlainTextResponse("tiny")),
+        Route(
+            "/stream",
+            lambda request: StreamingResponse(stream_rows(), media_type="text/csv"),
+        ),
+        Route("/image", lambda request: Response(b"\x89PNG" * 1000, media_type="image/png")),
+        Route("/error", lambda request: PlainTextResponse("failed " * 1000, status_code=500)),
+    ]
+    app = CompressionMiddleware(
+        Starlette(routes=routes), encodings=["gzip"], min_size=500, stats=stats
+    )
+    return TestClient(app)
+
+
+def test_negotiate_respects_q_values_and_server_order():
+    """Test Accept-Encoding negotiation."""
+    assert negotiate("gzip, br", ["br", "gzip"]) == "br"
+    assert negotiate("br;q=0, gzip;q=0.5", ["br", "gzip"]) == "gzip"
+    assert negotiate("*", ["gzip"]) == "gzip"
+    assert negotiate("identity", ["gzip"]) is None
+    assert negotiate("", ["gzip"]) is None
+
+
+def test_compresses_large_bodies_and_skips_small_or_binary():
+    """Test the size threshold, content-type allowlist and status check."""
+    stats = CompressionStats()
+    client = make_client(stats)
+
+    response = client.get("/large", headers=GZIP)
+    assert response.headers["content-encoding"] == "gzip"
+    assert response.headers["vary"] == "Accept-Encoding"
+    assert response.text == "pexels " * 1000
+
+    assert "content-encoding" not in client.get("/small", headers=GZIP).headers
+    assert "content-encoding" not in client.get("/image", headers=GZIP).headers
+    assert "content-encoding" not in client.get("/error", headers=GZIP).headers
+    response = client.get("/large", headers={"Accept-Encoding": "identity"})
+    assert "content-encoding" not in response.headers
+
+    gzip_stats = stats.stats()["encodings"]["gzip"]
+    assert gzip_stats["responses"] == 1
+    assert gzip_stats["ratio"] > 10
+    assert stats.stats()["skipped_small"] == 1
+
+
+def test_compresses_streaming_responses():
+    """Test that streamed chunks form one valid gzip stream."""
+    client = make_client(CompressionStats())
+    with client.stream("GET", "/stream", headers=GZIP) as response:
+        assert response.headers["content-encoding"] == "gzip"
+        assert "content-length" not in response.headers
+        raw = b"".join(response.iter_raw())
+
+    lines = gzip.decompress(raw).decode().splitlines()
+    assert lines[0] == "id,url"
+    assert len(lines) == 201
+
+
+def test_photo_list_compressed_and_revalidated(client, auth_headers, db, test_photographer):
+    """Test that compressed list responses keep working with ETag revalidation."""
+    db.add_all([make_photo(i) for i in range(20)])
+    db.commit()
+
+    response = client.get("/photos/", headers={**auth_headers, **GZIP})
+    assert response.headers["content-encoding"] == "gzip"
+    assert len(response.json()["photos"]) == 20
+    etag = response.headers["etag"]
+    assert etag.startswith('W/"')
+
+    response = client.get("/photos/", headers={**auth_headers, **GZIP, "If-None-Match": etag})
+    assert response.status_code == status.HTTP_304_NOT_MODIFIED
+    assert "content-encoding" not in response.headers
+    assert response.headers["etag"] == etag
+
+    metrics = client.get("/health/metrics").json()["compression"]
+    assert metrics["encodings"]["gzip"]["responses"] == 1
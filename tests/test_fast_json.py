@@ -0,0 +1,77 @@
+"""
+Tests for fast JSON responses and cached photo fragments.
+"""
+from datetime import datetime
+from fastapi.responses import JSONResponse
+from app.api import photos
+from app.core.config import settings
+from app.core.fast_json import FastJSONResponse, json_response_class, photo_fragment_cache
+from app.core.projection import render_photo_batch
+from app.core.response_cache import photo_response_cache, render_photo_list
+from app.services.photo_service import PhotoService
+from tests.test_photos import make_photo
+
+
+def test_fast_json_response_matches_default_encoding():
+    """Test that FastJSONResponse emits the same bytes as JSONResponse."""
+    content = {"name": "Zoë", "sizes": [1, 2.5, None], "ok": True}
+    assert FastJSONResponse(content).body == JSONResponse(content).body
+
+
+def test_json_response_class_per_router(monkeypatch):
+    """Test that fast JSON can be enabled globally or for named routers."""
+    assert json_response_class("photos") is JSONResponse
+
+    monkeypatch.setattr(settings, "FAST_JSON_ROUTERS", ["photos"])
+    assert json_response_class("photos") is FastJSONResponse
+    assert json_response_class("auth") is JSONResponse
+
+    monkeypatch.setattr(settings, "FAST_JSON_ENABLED", True)
+    assert json_response_class("auth") is FastJSONResponse
+
+
+def test_fragments_match_plain_encoding(db, test_photographer):
+    """Test that list and batch bodies built from fragments are byte-identical."""
+    db.add_all([make_photo(i, id=i) for i in range(1, 4)])
+    db.commit()
+    page = PhotoService.get_photos(db, limit=10)
+
+    plain = render_photo_list("key", page, 1, 10)
+    fast = render_photo_list("key", page, 1, 10, fragments=True)
+    assert fast == plain
+    assert photo_fragment_cache.stats()["size"] == 3
+
+    render_photo_list("key", page, 1, 10, fragments=True)
+    assert photo_fragment_cache.stats()["hits"] >= 3
+
+    rows = PhotoService.get_photos_by_ids(db, [2, 99])
+    assert render_photo_batch([2, 99], rows, fragments=True) == render_photo_batch([2, 99], rows)
+
+
+def test_fragment_replaced_when_photo_updated(db, test_photographer):
+    """Test that an updated photo is re-encoded rather than served stale."""
+    photo = make_photo(1, id=1)
+    db.add(photo)
+    db.commit()
+    render_photo_list("key", PhotoService.get_photos(db), 1, 20, fragments=True)
+
+    photo.alt = "Edited"
+    photo.updated_at = datetime.utcnow()
+    db.commit()
+    body = render_photo_list("key", PhotoService.get_photos(db), 1, 20, fragments=True).body
+
+    assert b'"alt":"Edited"' in body
+
+
+def test_photo_routes_with_fragments(client, auth_headers, db, test_photographer, monkeypatch):
+    """Test that the list and batch routes serve the same bodies from fragments."""
+    db.add_all([make_photo(i, id=i) for i in range(1, 4)])
+    db.commit()
+    expected_list = client.get("/photos/", headers=auth_headers).content
+    expected_batch = client.get("/photos/batch?ids=2,0", headers=auth_headers).content
+
+    monkeypatch.setattr(photos, "FAST_JSON", True)
+    photo_response_cache.clear()
+    assert client.get("/photos/", headers=auth_headers).content == expected_list
+    assert client.get("/photos/batch?ids=2,0", headers=auth_headers).content == expected_batch
+    assert photo_fragment_cache.stats()["size"] == 3
@@ -19,3 +19,14 @@ def test_database_health_check(client):
     data = response.json()
     assert data["status"] == "healthy"
     assert data["database"] == "connected"
+
+
+def test_metrics(client):
+    """Test cache metrics endpoint."""
+    response = client.get("/health/metrics")
+    assert response.status_code == status.HTTP_200_OK
+    data = response.json()
+    assert "hits" in data["user_cache"]
+    assert "misses" in data["total_count_cache"]
+    assert "hit_ratio" in data["photo_response_cache"]
+    assert "bytes" in data["photo_response_cache"]
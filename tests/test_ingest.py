@@ -0,0 +1,153 @@
+"""
+Tests for the bulk ingest mode of scripts/ingest_photos.py.
+"""
+import csv
+from pathlib import Path
+import pytest
+from app.core.response_cache import photo_response_cache
+from app.models.photo import Photo
+from app.models.photographer_stats import PhotographerStats
+from scripts.ingest_photos import bulk_ingest, ingest_photos
+from tests.conftest import engine
+
+PHOTOS_CSV = str(Path(__file__).parent.parent / "photos.csv")
+
+
+def test_bulk_ingest_inserts_all_rows(db):
+    """Test that bulk ingest loads every row of the sample file."""
+    stats = bulk_ingest(PHOTOS_CSV, bind=engine, batch_size=3)
+
+    assert stats.rows_read == 10
+    assert stats.rows_written == 10
+    assert db.query(Photo).count() == 10
+    photo = db.query(Photo).filter(Photo.id == 21751820).first()
+    assert photo.src_original.endswith("pexels-photo-21751820.jpeg")
+    assert photo.created_at is not None
+
+
+def test_ingest_photos_skips_existing_rows(db):
+    """Test that the ORM ingest adds every photo once and summarizes its photographers."""
+    ingest_photos(PHOTOS_CSV, db, batch_size=3)
+    ingest_photos(PHOTOS_CSV, db, batch_size=3)
+
+    assert db.query(Photo).count() == 10
+    photographer_ids = {p.photographer_id for p in db.query(Photo)}
+    assert {s.photographer_id for s in db.query(PhotographerStats)} == photographer_ids
+
+
+def test_ingest_photos_failure_keeps_committed_summaries(db, tmp_path):
+    """Test that batches committed before a failure come with their summaries."""
+    rows = read_rows()
+    rows[5]["width"] = "not a number"
+    broken = tmp_path / "broken.csv"
+    write_rows(broken, rows)
+
+    with pytest.raises(ValueError):
+        ingest_photos(str(broken), db, batch_size=3)
+
+    db.expire_all()
+    assert db.query(Photo).count() == 3
+    photographer_ids = {p.photographer_id for p in db.query(Photo)}
+    assert {s.photographer_id for s in db.query(PhotographerStats)} == photographer_ids
+
+
+def test_bulk_ingest_invalidates_cached_lists(db):
+    """Test that an ingest run invalidates cached list responses."""
+    generation = photo_response_cache.stats()["generation"]
+    bulk_ingest(PHOTOS_CSV, bind=engine)
+    assert photo_response_cache.stats()["generation"] == generation + 1
+
+
+def read_rows():
+    with open(PHOTOS_CSV, encoding="utf-8", newline="") as src:
+        return list(csv.DictReader(src))
+
+
+def write_rows(path, rows):
+    with open(path, "w", encoding="utf-8", newline="") as dst:
+        writer = csv.DictWriter(dst, fieldnames=list(rows[0]))
+        writer.writeheader()
+        writer.writerows(rows)
+
+
+def test_bulk_ingest_on_conflict(db, tmp_path):
+    """Test that existing photos are skipped or overwritten as requested."""
+    bulk_ingest(PHOTOS_CSV, bind=engine)
+
+    changed = tmp_path / "changed.csv"
+    rows = read_rows()
+    rows[0]["alt"] = "Updated alt"
+    write_rows(changed, rows)
+
+    stats = bulk_ingest(str(changed), bind=engine, on_conflict="nothing")
+    assert stats.rows_written == 0
+    assert db.query(Photo).filter(Photo.id == int(rows[0]["id"])).one().alt != "Updated alt"
+
+    bulk_ingest(str(changed), bind=engine, on_conflict="update")
+    db.expire_all()
+    assert db.query(Photo).filter(Photo.id == int(rows[0]["id"])).one().alt == "Updated alt"
+    assert db.query(Photo).count() == 10
+
+
+def test_bulk_ingest_rejects_unexpected_header(db, tmp_path):
+    """Test that a file with the wrong columns is rejected before writing."""
+    bad = tmp_path / "bad.csv"
+    bad.write_text("id,width\n1,2\n", encoding="utf-8")
+    with pytest.raises(ValueError):
+        bulk_ingest(str(bad), bind=engine)
+
+
+def test_delta_ingest_applies_only_changed_rows(db, tmp_path):
+    """Test that delta mode rewrites changed rows only and can prune missing ones."""
+    bulk_ingest(PHOTOS_CSV, bind=engine)
+    untouched = db.query(Photo).filter(Photo.id == 21405575).one()
+    updated_at = untouched.updated_at
+
+    stats = bulk_ingest(PHOTOS_CSV, bind=engine, on_conflict="delta")
+    assert stats.rows_written == 0
+
+    rows = read_rows()
+    rows[0]["avg_color"] = "#FFFFFF"
+    removed = rows.pop()
+    snapshot = tmp_path / "snapshot.csv"
+    write_rows(snapshot, rows)
+
+    stats = bulk_ingest(str(snapshot), bind=engine, on_conflict="delta", delete_missing=True)
+    assert stats.rows_written == 1
+    assert stats.rows_deleted == 1
+
+    db.expire_all()
+    assert db.query(Photo).filter(Photo.id == int(rows[0]["id"])).one().avg_color == "#FFFFFF"
+    assert db.query(Photo).filter(Photo.id == int(removed["id"])).first() is None
+    assert db.query(Photo).filter(Photo.id == 21405575).one().updated_at == updated_at
+
+
+def refreshed_at(db):
+    db.expire_all()
+    return {s.photographer_id: s.refreshed_at for s in db.query(PhotographerStats)}
+
+
+def test_ingest_refreshes_only_written_photographers(db, tmp_path):
+    """Test that reruns refresh no summaries and a moved photo refreshes both owners."""
+    bulk_ingest(PHOTOS_CSV, bind=engine)
+    before = refreshed_at(db)
+
+    bulk_ingest(PHOTOS_CSV, bind=engine, on_conflict="nothing")
+    bulk_ingest(PHOTOS_CSV, bind=engine, on_conflict="delta")
+    assert refreshed_at(db) == before
+
+    rows = read_rows()
+    previous_owner = int(rows[0]["photographer_id"])
+    new_owner = int(rows[1]["photographer_id"])
+    rows[0]["photographer_id"] = rows[1]["photographer_id"]
+    moved = tmp_path / "moved.csv"
+    write_rows(moved, rows)
+
+    stats = bulk_ingest(str(moved), bind=engine, on_conflict="delta")
+    assert stats.rows_written == 1
+    after = refreshed_at(db)
+    assert previous_owner not in after
+    assert after[new_owner] != before[new_owner]
+    assert db.get(PhotographerStats, new_owner).photo_count == 2
+    unchanged = set(before) - {previous_owner, new_owner}
+    assert {i: after[i] for i in unchanged} == {i: before[i] for i in unchanged}
@@ -0,0 +1,61 @@
+"""
+Tests for the parallel, resumable ingestion pipeline.
+"""
+from pathlib import Path
+import pytest
+from app.models.ingest_checkpoint import IngestCheckpoint
+from app.models.photo import Photo
+from scripts import ingest_parallel
+from scripts.ingest_parallel import run_pipeline, split_chunks
+from tests.conftest import engine
+
+PHOTOS_CSV = str(Path(__file__).parent.parent / "photos.csv")
+
+
+def test_split_chunks_cover_every_line():
+    """Test that chunks are contiguous, line-aligned and cover the whole file."""
+    header, chunks = split_chunks(PHOTOS_CSV, chunk_size=2000)
+
+    assert header[0] == "id"
+    assert len(chunks) > 1
+    assert all(a[1] == b[0] for a, b in zip(chunks, chunks[1:]))
+    data = Path(PHOTOS_CSV).read_bytes()
+    assert chunks[-1][1] == len(data)
+    assert all(data[start - 1 : start] == b"\n" for start, _ in chunks)
+
+
+def test_pipeline_ingests_and_checkpoints(db):
+    """Test that every row is written and a rerun skips completed chunks."""
+    stats = run_pipeline(PHOTOS_CSV, bind=engine, workers=2, chunk_size=2000)
+
+    assert db.query(Photo).count() == 10
+    assert stats.rows_written == 10
+    assert db.query(IngestCheckpoint).count() == stats.chunks_total
+
+    stats = run_pipeline(PHOTOS_CSV, bind=engine, workers=2, chunk_size=2000)
+    assert stats.chunks_skipped == stats.chunks_total
+    assert stats.chunks_written == 0
+
+
+def test_pipeline_resumes_after_failure(db, monkeypatch):
+    """Test that a failed run keeps finished chunks and a rerun completes the rest."""
+    _, chunks = split_chunks(PHOTOS_CSV, chunk_size=2000)
+    failing_start = chunks[len(chunks) // 2][0]
+    write_chunk = ingest_parallel._write_chunk
+
+    def flaky_write_chunk(bind, source, chunk, on_conflict):
+        if chunk.start == failing_start:
+            raise RuntimeError("connection lost")
+        return write_chunk(bind, source, chunk, on_conflict)
+
+    monkeypatch.setattr(ingest_parallel, "_write_chunk", flaky_write_chunk)
+    with pytest.raises(RuntimeError):
+        run_pipeline(PHOTOS_CSV, bind=engine, workers=2, chunk_size=2000)
+    assert db.query(IngestCheckpoint).count() < len(chunks)
+
+    monkeypatch.setattr(ingest_parallel, "_write_chunk", write_chunk)
+    stats = run_pipeline(PHOTOS_CSV, bind=engine, workers=2, chunk_size=2000)
+
+    assert stats.chunks_skipped > 0
+    assert db.query(IngestCheckpoint).count() == len(chunks)
+    assert db.query(Photo).count() == 10
@@ -0,0 +1,256 @@
+"""
+Tests for photographer summaries and endpoints.
+"""
+import csv
+from fastapi import status
+from sqlalchemy import create_engine, inspect, text
+from app.models.photo import Photo
+from app.models.photographer import Photographer
+from app.models.photographer_stats import PhotographerStats
+from app.services import photographer_service
+from app.services.photographer_service import PhotographerService
+from scripts import migrate_schema
+from scripts.ingest_photos import bulk_ingest
+from tests.conftest import engine
+from tests.test_ingest import PHOTOS_CSV
+from tests.test_photos import make_photo
+
+PHOTO_DATA = {
+    "width": 1000,
+    "height": 500,
+    "url": "https://example.com/photo",
+    "photographer": "Ada",
+    "photographer_url": "https://example.com/ada",
+    "photographer_id": 1,
+    "avg_color": "#FFFFFF",
+    "src_original": "https://example.com/original.jpg",
+    "src_large2x": "https://example.com/large2x.jpg",
+    "src_large": "https://example.com/large.jpg",
+    "src_medium": "https://example.com/medium.jpg",
+    "src_small": "https://example.com/small.jpg",
+    "src_portrait": "https://example.com/portrait.jpg",
+    "src_landscape": "https://example.com/landscape.jpg",
+    "src_tiny": "https://example.com/tiny.jpg",
+    "alt": "Test photo",
+}
+
+
+def summaries(db):
+    """Current summaries keyed by photographer_id, without refreshed_at."""
+    db.expire_all()
+    return {
+        s.photographer_id: (s.photo_count, s.min_width, s.max_width, s.avg_width)
+        for s in db.query(PhotographerStats)
+    }
+
+
+def test_photographer_summaries_follow_writes(client, admin_headers, auth_headers, db):
+    """Test that creates, updates and deletes keep the summaries current."""
+    for i, width in enumerate([1000, 3000]):
+        response = client.post(
+            "/photos/",
+            json={**PHOTO_DATA, "id": i + 1, "width": width, "url": f"https://example.com/{i}"},
+            headers=admin_headers,
+        )
+        assert response.status_code == status.HTTP_201_CREATED
+
+    response = client.get("/photographers/1", headers=auth_headers)
+    assert response.status_code == status.HTTP_200_OK
+    data = response.json()
+    assert data["photographer"] == "Ada"
+    assert data["photo_count"] == 2
+    assert (data["min_width"], data["max_width"], data["avg_width"]) == (1000, 3000, 2000)
+
+    # A new photographer needs a name and URL
+    response = client.patch(
+        "/photos/2", json={"photographer_id": 2, "photographer": "Grace"}, headers=admin_headers
+    )
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+    # Moving a photo updates both photographers
+    client.patch(
+        "/photos/2",
+        json={
+            "photographer_id": 2,
+            "photographer": "Grace",
+            "photographer_url": "https://example.com/grace",
+        },
+        headers=admin_headers,
+    )
+    assert summaries(db) == {1: (1, 1000, 1000, 1000), 2: (1, 3000, 3000, 3000)}
+
+    # A photographer left without photos is removed
+    client.delete("/photos/2", headers=admin_headers)
+    assert client.get("/photographers/2", headers=auth_headers).status_code == (
+        status.HTTP_404_NOT_FOUND
+    )
+
+
+def test_list_photographers(client, auth_headers, db):
+    """Test sorting, filtering and paging the photographer list."""
+    db.add(Photographer(id=1, name="Ada", url="https://example.com/ada"))
+    db.add(Photographer(id=2, name="Grace", url="https://example.com/grace"))
+    db.add_all(
+        [make_photo(i, photographer_id=1) for i in range(3)]
+        + [make_photo(i, photographer_id=2) for i in range(3, 4)]
+    )
+    db.flush()
+    PhotographerService.refresh(db, [1, 2])
+    db.commit()
+
+    response = client.get("/photographers/", headers=auth_headers)
+    assert response.status_code == status.HTTP_200_OK
+    data = response.json()
+    assert data["total"] == 2
+    assert [p["photographer_id"] for p in data["photographers"]] == [1, 2]
+
+    response = client.get("/photographers/?sort=name&name=gra", headers=auth_headers)
+    assert [p["photographer"] for p in response.json()["photographers"]] == ["Grace"]
+
+    response = client.get("/photographers/?sort=bogus", headers=auth_headers)
+    assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+    assert client.get("/photographers/").status_code == status.HTTP_403_FORBIDDEN
+
+
+def test_bulk_writes_refresh_summaries(client, admin_headers, db):
+    """Test that the bulk routes refresh every photographer they touch."""
+    client.post(
+        "/photos/bulk",
+        json={
+            "items": [
+                {**PHOTO_DATA, "id": 1},
+                {**PHOTO_DATA, "id": 2, "photographer_id": 2},
+            ]
+        },
+        headers=admin_headers,
+    )
+    assert set(summaries(db)) == {1, 2}
+
+    client.patch(
+        "/photos/bulk", json={"items": [{"id": 2, "photographer_id": 1}]}, headers=admin_headers
+    )
+    assert summaries(db) == {1: (2, 1000, 1000, 1000)}
+
+    client.request("DELETE", "/photos/bulk", json={"ids": [1, 2]}, headers=admin_headers)
+    assert summaries(db) == {}
+
+
+def test_ingest_refreshes_and_rebuild_matches(db):
+    """Test that bulk ingest keeps summaries equal to a full rebuild."""
+    bulk_ingest(PHOTOS_CSV, bind=engine, batch_size=3)
+    incremental = summaries(db)
+    assert incremental
+
+    with engine.begin() as conn:
+        count = PhotographerService.rebuild(conn)
+    assert count == len(incremental)
+    assert summaries(db) == incremental
+
+
+def test_rename_applies_to_every_photo(client, admin_headers, auth_headers, db):
+    """Test that a rename through one photo shows on, and revalidates, all of them."""
+    for i in (1, 2):
+        client.post(
+            "/photos/",
+            json={**PHOTO_DATA, "id": i, "url": f"https://example.com/{i}"},
+            headers=admin_headers,
+        )
+    etag = client.get("/photos/1", headers=auth_headers).headers["etag"]
+
+    client.patch("/photos/2", json={"photographer": "Ada L."}, headers=admin_headers)
+
+    response = client.get("/photos/1", headers=auth_headers)
+    assert response.json()["photographer"] == "Ada L."
+    assert response.headers["etag"] != etag
+    response = client.get("/photos/?photographer=ada l", headers=auth_headers)
+    assert response.json()["total"] == 2
+    assert db.query(Photographer).count() == 1
+
+
+def test_create_does_not_rename(client, admin_headers, auth_headers, db):
+    """Test that creating photos never renames an existing photographer."""
+    client.post("/photos/", json={**PHOTO_DATA, "id": 1}, headers=admin_headers)
+    response = client.post(
+        "/photos/",
+        json={**PHOTO_DATA, "id": 2, "url": "https://example.com/2", "photographer": "Eve"},
+        headers=admin_headers,
+    )
+    assert response.status_code == status.HTTP_201_CREATED
+    response = client.post(
+        "/photos/bulk",
+        json={"items": [{**PHOTO_DATA, "id": 3, "photographer": "Eve"}]},
+        headers=admin_headers,
+    )
+    assert response.status_code == status.HTTP_200_OK
+
+    db.expire_all()
+    assert db.get(Photographer, 1).name == "Ada"
+    response = client.get("/photos/?photographer=eve", headers=auth_headers)
+    assert response.json()["total"] == 0
+
+
+def test_rename_touches_photos_in_batches(db, test_photographer, monkeypatch):
+    """Test that a rename bumps updated_at on every photo, a few at a time."""
+    monkeypatch.setattr(photographer_service, "TOUCH_BATCH_SIZE", 2)
+    db.add_all([make_photo(i) for i in range(5)] + [make_photo(5, photographer_id=7)])
+    db.add(Photographer(id=7, name="Other", url="https://example.com/other"))
+    db.commit()
+    before = {p.id: p.updated_at for p in db.query(Photo)}
+
+    renamed = PhotographerService.save(db, {123: ("Renamed", "https://example.com/renamed")})
+    db.commit()
+
+    assert renamed == {123}
+    db.expire_all()
+    after = {p.id: p.updated_at for p in db.query(Photo)}
+    changed = {i for i in after if after[i] != before[i]}
+    assert changed == {p.id for p in db.query(Photo).filter(Photo.photographer_id == 123)}
+
+
+def test_ingest_writes_photographers_once(db):
+    """Test that ingest stores each photographer once, outside photos."""
+    bulk_ingest(PHOTOS_CSV, bind=engine, batch_size=3)
+
+    assert "photographer" not in Photo.__table__.c
+    with open(PHOTOS_CSV, encoding="utf-8", newline="") as src:
+        expected = {int(r["photographer_id"]): r["photographer"] for r in csv.DictReader(src)}
+    assert {p.id: p.name for p in db.query(Photographer)} == expected
+    assert {p.photographer_id: p.photographer for p in db.query(Photo)} == expected
+
+
+def test_migration_moves_legacy_photographer_columns(tmp_path, monkeypatch):
+    """Test the SQLite migration from photographer columns on photos."""
+    legacy = create_engine(f"sqlite:///{tmp_path / 'legacy.db'}")
+    with legacy.begin() as conn:
+        conn.execute(
+            text(
+                "CREATE TABLE photos (id INTEGER PRIMARY KEY, width INTEGER, height INTEGER, "
+                "photographer VARCHAR NOT NULL, photographer_url VARCHAR NOT NULL, "
+                "photographer_id INTEGER NOT NULL, avg_color VARCHAR, created_at DATETIME)"
+            )
+        )
+        conn.execute(text("CREATE INDEX ix_photos_photographer ON photos (photographer)"))
+        conn.execute(
+            text(
+                "INSERT INTO photos VALUES "
+                "(1, 10, 10, 'Old name', 'u1', 1, NULL, NULL), "
+                "(2, 10, 10, 'Ada', 'u1', 1, NULL, NULL), "
+                "(3, 30, 10, 'Grace', 'u2', 2, NULL, NULL)"
+            )
+        )
+    monkeypatch.setattr(migrate_schema, "engine", legacy)
+    monkeypatch.setattr(migrate_schema, "BACKFILL_BATCH_SIZE", 1)
+
+    migrate_schema.migrate()
+    migrate_schema.migrate()
+
+    with legacy.connect() as conn:
+        assert conn.execute(text("SELECT id, name, url FROM photographers")).all() == [
+            (1, "Ada", "u1"),
+            (2, "Grace", "u2"),
+        ]
+        columns = {c["name"] for c in inspect(conn).get_columns("photos")}
+        assert "photographer" not in columns and "photographer_url" not in columns
+        # Generated columns added to the old table compute from existing rows
+        assert conn.execute(text("SELECT aspect_ratio FROM photos WHERE id = 3")).scalar() == 3.0
+    legacy.dispose()
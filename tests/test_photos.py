@@ -1,21 +1,33 @@
 """
 Tests for photo endpoints.
 """
+import contextlib
+import csv
+import io
+import json
+from pathlib import Path
+from types import SimpleNamespace
 import pytest
 from fastapi import status
+from sqlalchemy import event, func, select, text
+from sqlalchemy.dialects.postgresql import asyncpg as asyncpg_dialect
+from app.core.config import settings
 from app.models.photo import Photo
+from app.models.photographer import Photographer
+from app.schemas.photo import PhotoFilter, PhotoResponse
+from app.services.count_service import CountService
+from app.services.photo_service import PhotoService
+from tests.conftest import engine
 
 
 @pytest.fixture
-def test_photo(db):
+def test_photo(db, test_photographer):
     """Create a test photo."""
     photo = Photo(
         id=1,
         width=1920,
         height=1080,
         url="https://example.com/photo",
-        photographer="Test Photographer",
-        photographer_url="https://example.com/photographer",
         photographer_id=123,
         avg_color="#FFFFFF",
         src_original="https://example.com/original.jpg",
@@ -51,7 +63,19 @@ def test_list_photos_authenticated(client, test_photo, auth_headers):
     assert data["photos"][0]["id"] == test_photo.id
 
 
-def test_list_photos_pagination(client, auth_headers, db):
+def test_list_and_batch_match_photo_response(client, test_photo, auth_headers):
+    """Test that rows encoded straight from Core selects match PhotoResponse."""
+    expected = json.loads(PhotoResponse.model_validate(test_photo).model_dump_json())
+
+    response = client.get("/photos/", headers=auth_headers)
+    assert response.json()["photos"] == [expected]
+    assert list(response.json()["photos"][0]) == list(PhotoResponse.model_fields)
+
+    response = client.get(f"/photos/batch?ids={test_photo.id}", headers=auth_headers)
+    assert response.json()["results"][0]["photo"] == expected
+
+
+def test_list_photos_pagination(client, auth_headers, db, test_photographer):
     """Test photo listing pagination."""
     # Create multiple photos
     for i in range(25):
@@ -59,8 +83,6 @@ def test_list_photos_pagination(client, auth_headers, db):
             width=1920,
             height=1080,
             url=f"https://example.com/photo{i}",
-            photographer="Test Photographer",
-            photographer_url="https://example.com/photographer",
             photographer_id=123,
             avg_color="#FFFFFF",
             src_original=f"https://example.com/original{i}.jpg",
@@ -202,12 +224,12 @@ def test_delete_photo_as_admin(client, test_photo, admin_headers):
 def test_filter_photos_by_photographer(client, auth_headers, db):
     """Test filtering photos by photographer."""
     # Create photos with different photographers
+    db.add(Photographer(id=1, name="John Doe", url="https://example.com/john"))
+    db.add(Photographer(id=2, name="Jane Smith", url="https://example.com/jane"))
     photo1 = Photo(
         width=1920,
         height=1080,
         url="https://example.com/photo1",
-        photographer="John Doe",
-        photographer_url="https://example.com/john",
         photographer_id=1,
         src_original="https://example.com/original1.jpg",
         src_large2x="https://example.com/large2x1.jpg",
@@ -222,8 +244,6 @@ def test_filter_photos_by_photographer(client, auth_headers, db):
         width=1920,
         height=1080,
         url="https://example.com/photo2",
-        photographer="Jane Smith",
-        photographer_url="https://example.com/jane",
         photographer_id=2,
         src_original="https://example.com/original2.jpg",
         src_large2x="https://example.com/large2x2.jpg",
@@ -243,3 +263,582 @@ def test_filter_photos_by_photographer(client, auth_headers, db):
     data = response.json()
     assert data["total"] == 1
     assert data["photos"][0]["photographer"] == "John Doe"
+
+
+def make_photo(i, **overrides):
+    """Build a Photo with unique URLs for index i, by test_photographer by default."""
+    fields = dict(
+        width=1920,
+        height=1080,
+        url=f"https://example.com/photo{i}",
+        photographer_id=123,
+        avg_color="#FFFFFF",
+        src_original=f"https://example.com/original{i}.jpg",
+        src_large2x=f"https://example.com/large2x{i}.jpg",
+        src_large=f"https://example.com/large{i}.jpg",
+        src_medium=f"https://example.com/medium{i}.jpg",
+        src_small=f"https://example.com/small{i}.jpg",
+        src_portrait=f"https://example.com/portrait{i}.jpg",
+        src_landscape=f"https://example.com/landscape{i}.jpg",
+        src_tiny=f"https://example.com/tiny{i}.jpg",
+        alt=f"Test photo {i}",
+    )
+    fields.update(overrides)
+    return Photo(**fields)
+
+
+def test_list_photos_cursor_pagination(client, auth_headers, db, test_photographer):
+    """Test walking the photo list with keyset cursors."""
+    db.add_all([make_photo(i) for i in range(25)])
+    db.commit()
+
+    seen = []
+    response = client.get("/photos/?page_size=10", headers=auth_headers)
+    data = response.json()
+    seen.extend(p["id"] for p in data["photos"])
+
+    while data["next_cursor"]:
+        response = client.get(
+            f"/photos/?page_size=10&cursor={data['next_cursor']}", headers=auth_headers
+        )
+        assert response.status_code == status.HTTP_200_OK
+        data = response.json()
+        assert data["page"] is None
+        seen.extend(p["id"] for p in data["photos"])
+
+    assert len(seen) == 25
+    assert len(set(seen)) == 25
+    assert len(data["photos"]) == 5
+
+
+def test_photographer_cursor_pagination(client, auth_headers, db, test_photographer):
+    """Test cursor pagination on the photographer endpoint."""
+    db.add_all([make_photo(i) for i in range(3)])
+    db.add(Photographer(id=456, name="Other", url="https://example.com/other"))
+    db.add(make_photo(99, photographer_id=456))
+    db.commit()
+
+    response = client.get("/photos/photographer/123?page_size=2", headers=auth_headers)
+    first = response.json()
+    assert len(first["photos"]) == 2
+    assert first["next_cursor"] is not None
+
+    response = client.get(
+        f"/photos/photographer/123?page_size=2&cursor={first['next_cursor']}",
+        headers=auth_headers,
+    )
+    second = response.json()
+    assert len(second["photos"]) == 1
+    assert second["next_cursor"] is None
+
+
+def test_list_photos_invalid_cursor(client, auth_headers):
+    """Test that a malformed cursor is rejected."""
+    response = client.get("/photos/?cursor=not-a-cursor", headers=auth_headers)
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+
+def test_list_photos_without_total(client, test_photo, auth_headers):
+    """Test that include_total=false skips the count."""
+    response = client.get("/photos/?include_total=false", headers=auth_headers)
+    assert response.status_code == status.HTTP_200_OK
+    data = response.json()
+    assert data["total"] is None
+    assert data["total_is_estimate"] is False
+    assert len(data["photos"]) == 1
+
+
+def test_list_photos_total_invalidated_on_write(client, test_photo, auth_headers, admin_headers):
+    """Test that cached totals are dropped when a photo is deleted."""
+    response = client.get("/photos/", headers=auth_headers)
+    assert response.json()["total"] == 1
+
+    client.delete(f"/photos/{test_photo.id}", headers=admin_headers)
+
+    response = client.get("/photos/", headers=auth_headers)
+    assert response.json()["total"] == 0
+
+
+class ExplainingSession:
+    """
+    Stand-in for a PostgreSQL session that answers EXPLAIN with a canned plan.
+
+    Statements are compiled for asyncpg, whose positional $n placeholders
+    are the paramstyle the estimate has to work with.
+    """
+
+    def __init__(self, plan_rows):
+        self.plan_rows = plan_rows
+        self.dialect = asyncpg_dialect.dialect()
+        self.executed = []
+
+    def get_bind(self):
+        return self
+
+    def begin_nested(self):
+        return contextlib.nullcontext()
+
+    def execute(self, stmt):
+        compiled = stmt.compile(dialect=self.dialect)
+        self.executed.append((str(compiled), compiled.construct_params()))
+        return SimpleNamespace(scalar=lambda: json.dumps([{"Plan": {"Plan Rows": self.plan_rows}}]))
+
+
+def test_filtered_total_estimate(db, monkeypatch):
+    """Test that filtered totals come from EXPLAIN with driver-style bound parameters."""
+    monkeypatch.setattr(settings, "TOTAL_COUNT_STRATEGY", "estimate")
+    CountService.invalidate()
+    filters = PhotoFilter(photographer="ada", min_width=1000)
+    query = db.query(Photo).filter(*PhotoService.filter_conditions(filters))
+    session = ExplainingSession(plan_rows=12345)
+
+    assert CountService.get_total(session, query, filters.cache_key()) == (12345, True)
+    [(sql, params)] = session.executed
+    assert sql.startswith("EXPLAIN (FORMAT JSON) SELECT")
+    assert "$1" in sql and "%(" not in sql
+    assert sorted(map(str, params.values())) == ["%ada%", "1000"]
+    CountService.invalidate()
+
+
+def test_search_sorted_by_relevance(client, auth_headers, db, test_photographer):
+    """Test ordering search results by relevance."""
+    db.add_all(
+        [
+            Photographer(id=7, name="Beach", url="https://example.com/beach"),
+            make_photo(1, alt="A walk on the beach"),
+            make_photo(2, alt="Beach at dawn"),
+            make_photo(3, alt="Mountains", photographer_id=7),
+            make_photo(4, alt="Forest"),
+        ]
+    )
+    db.commit()
+
+    response = client.get("/photos/?search=beach&sort=relevance", headers=auth_headers)
+    assert response.status_code == status.HTTP_200_OK
+    data = response.json()
+    assert data["total"] == 3
+    assert [p["alt"] for p in data["photos"]] == [
+        "Mountains",
+        "Beach at dawn",
+        "A walk on the beach",
+    ]
+
+    # Ranked on the joined photographers row, not a per-row name subquery
+    for name in ("sqlite", "postgresql"):
+        bind = SimpleNamespace(dialect=SimpleNamespace(name=name))
+        session = SimpleNamespace(get_bind=lambda: bind)
+        assert "SELECT" not in str(PhotoService._search_rank(session, "beach"))
+
+
+def test_filter_photos_by_shape(client, auth_headers, db, test_photographer):
+    """Test orientation, aspect ratio and megapixel filters."""
+    sizes = {1: (1920, 1080), 2: (1080, 1920), 3: (2000, 2000), 4: (4000, 3000)}
+    db.add_all([make_photo(i, width=w, height=h) for i, (w, h) in sizes.items()])
+    db.commit()
+
+    def ids(query):
+        response = client.get(f"/photos/?{query}", headers=auth_headers)
+        assert response.status_code == status.HTTP_200_OK
+        return sorted(p["id"] for p in response.json()["photos"])
+
+    assert ids("orientation=landscape") == [1, 4]
+    assert ids("orientation=portrait") == [2]
+    assert ids("orientation=square") == [3]
+    assert ids("aspect_ratio=16:9") == ids("aspect_ratio=1.78") == [1]
+    assert ids("min_ratio=1.2&max_ratio=1.5") == [4]
+    assert ids("min_megapixels=4&max_megapixels=10") == [3]
+
+    response = client.get("/photos/?aspect_ratio=16:0", headers=auth_headers)
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+    response = client.get("/photos/?orientation=diagonal", headers=auth_headers)
+    assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+
+
+def test_shape_filters_use_indexes(db):
+    """Test that ratio and size filters are index searches, not table scans."""
+    for filters, index in [
+        (PhotoFilter(orientation="square"), "idx_aspect_ratio"),
+        (PhotoFilter(min_ratio=1.7, max_ratio=1.8), "idx_aspect_ratio"),
+        (PhotoFilter(min_megapixels=20), "idx_megapixels"),
+    ]:
+        stmt = select(func.count()).select_from(Photo).where(
+            *PhotoService.filter_conditions(filters)
+        )
+        sql = str(stmt.compile(compile_kwargs={"literal_binds": True}))
+        plan = " ".join(row[-1] for row in db.execute(text(f"EXPLAIN QUERY PLAN {sql}")))
+        assert plan.startswith("SEARCH photos") and f"INDEX {index}" in plan
+
+
+def create_sized_photos(db):
+    """Photos with repeated widths and heights, so sorts need the id tiebreaker."""
+    sizes = [(1000, 500), (3000, 2000), (1000, 800), (2000, 2000), (3000, 1000), (500, 500)]
+    db.add_all([make_photo(i, width=w, height=h) for i, (w, h) in enumerate(sizes)])
+    db.commit()
+    return {p.id: p for p in db.query(Photo)}
+
+
+@pytest.mark.parametrize("sort", ["created_at", "id", "width", "height", "megapixels"])
+@pytest.mark.parametrize("order", ["asc", "desc"])
+def test_sorted_cursor_pagination(client, auth_headers, db, test_photographer, sort, order):
+    """Test that every sort pages through all photos in (column, id) order."""
+    photos = create_sized_photos(db)
+    expected = sorted(photos, key=lambda i: (getattr(photos[i], sort), i), reverse=order == "desc")
+
+    url = f"/photos/?sort={sort}&order={order}&page_size=4&fields=id"
+    data = client.get(url, headers=auth_headers).json()
+    seen = [p["id"] for p in data["photos"]]
+    while data["next_cursor"]:
+        response = client.get(f"{url}&cursor={data['next_cursor']}", headers=auth_headers)
+        assert response.status_code == status.HTTP_200_OK
+        data = response.json()
+        seen.extend(p["id"] for p in data["photos"])
+    assert seen == expected
+
+    # Offset pages follow the same order
+    response = client.get(f"{url}&page=2", headers=auth_headers)
+    assert [p["id"] for p in response.json()["photos"]] == expected[4:]
+
+
+def test_cursor_must_match_sort(client, auth_headers, db, test_photographer):
+    """Test that a cursor is only accepted for the sort and order it came from."""
+    create_sized_photos(db)
+    cursor = client.get("/photos/?sort=width&page_size=2", headers=auth_headers).json()[
+        "next_cursor"
+    ]
+
+    for query in ("sort=height", "sort=width&order=asc", ""):
+        response = client.get(f"/photos/?{query}&cursor={cursor}", headers=auth_headers)
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+    response = client.get(f"/photos/?sort=width&cursor={cursor}", headers=auth_headers)
+    assert response.status_code == status.HTTP_200_OK
+
+    response = client.get("/photos/?order=sideways", headers=auth_headers)
+    assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+
+
+def test_sorts_read_indexes_in_order(client, auth_headers, db, test_photographer):
+    """Test that sorted pages and cursor seeks walk an index instead of sorting."""
+    create_sized_photos(db)
+    statements = []
+
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        if "ORDER BY" in statement and "LIMIT" in statement:
+            statements.append((statement, parameters))
+
+    event.listen(engine, "before_cursor_execute", capture)
+    try:
+        for sort in ("created_at", "id", "width", "height", "megapixels"):
+            for order in ("asc", "desc"):
+                url = f"/photos/?sort={sort}&order={order}&page_size=2&include_total=false"
+                cursor = client.get(url, headers=auth_headers).json()["next_cursor"]
+                client.get(f"{url}&cursor={cursor}", headers=auth_headers)
+    finally:
+        event.remove(engine, "before_cursor_execute", capture)
+
+    assert len(statements) == 20
+    with engine.connect() as conn:
+        for statement, parameters in statements:
+            plan = " ".join(
+                row[-1] for row in conn.exec_driver_sql(f"EXPLAIN QUERY PLAN {statement}", parameters)
+            )
+            assert "TEMP B-TREE" not in plan, (statement, plan)
+
+
+def test_relevance_sort_requires_search(client, auth_headers):
+    """Test that relevance sorting without a search term is rejected."""
+    response = client.get("/photos/?sort=relevance", headers=auth_headers)
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+    response = client.get("/photos/?sort=popularity", headers=auth_headers)
+    assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+
+
+def test_get_photo_conditional_requests(client, test_photo, auth_headers, admin_headers):
+    """Test ETag / Last-Modified revalidation of a single photo."""
+    response = client.get(f"/photos/{test_photo.id}", headers=auth_headers)
+    etag = response.headers["ETag"]
+    assert response.headers["Cache-Control"].startswith("private")
+    assert "Last-Modified" in response.headers
+
+    response = client.get(
+        f"/photos/{test_photo.id}", headers={**auth_headers, "If-None-Match": etag}
+    )
+    assert response.status_code == status.HTTP_304_NOT_MODIFIED
+    assert response.content == b""
+    assert response.headers["ETag"] == etag
+
+    response = client.get(
+        f"/photos/{test_photo.id}",
+        headers={**auth_headers, "If-Modified-Since": response.headers["Last-Modified"]},
+    )
+    assert response.status_code == status.HTTP_304_NOT_MODIFIED
+
+    client.patch(f"/photos/{test_photo.id}", json={"alt": "Changed"}, headers=admin_headers)
+
+    response = client.get(
+        f"/photos/{test_photo.id}", headers={**auth_headers, "If-None-Match": etag}
+    )
+    assert response.status_code == status.HTTP_200_OK
+    assert response.headers["ETag"] != etag
+
+
+def test_list_photos_conditional_requests(client, test_photo, auth_headers, admin_headers):
+    """Test that list ETags change with the query and the rows."""
+    response = client.get("/photos/?page_size=10", headers=auth_headers)
+    etag = response.headers["ETag"]
+
+    response = client.get(
+        "/photos/?page_size=10", headers={**auth_headers, "If-None-Match": etag}
+    )
+    assert response.status_code == status.HTTP_304_NOT_MODIFIED
+
+    response = client.get(
+        "/photos/?page_size=5", headers={**auth_headers, "If-None-Match": etag}
+    )
+    assert response.status_code == status.HTTP_200_OK
+
+    client.patch(f"/photos/{test_photo.id}", json={"alt": "Changed"}, headers=admin_headers)
+
+    response = client.get(
+        "/photos/?page_size=10", headers={**auth_headers, "If-None-Match": etag}
+    )
+    assert response.status_code == status.HTTP_200_OK
+
+
+def test_list_photos_ignore_if_modified_since(
+    client, auth_headers, admin_headers, db, test_photographer
+):
+    """Test that deleting a listed photo is never answered with 304."""
+    db.add_all([make_photo(i) for i in range(3)])
+    db.commit()
+
+    response = client.get("/photos/?page_size=2", headers=auth_headers)
+    assert "Last-Modified" not in response.headers
+    second = response.json()["photos"][1]["id"]
+
+    client.delete(f"/photos/{second}", headers=admin_headers)
+
+    # Later than every updated_at on the page, before and after the delete
+    response = client.get(
+        "/photos/?page_size=2",
+        headers={**auth_headers, "If-Modified-Since": "Fri, 01 Jan 2100 00:00:00 GMT"},
+    )
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json()["total"] == 2
+    assert second not in [p["id"] for p in response.json()["photos"]]
+
+
+def test_list_photos_served_from_response_cache(client, test_photo, auth_headers, admin_headers, db):
+    """Test that list responses are cached until an admin write invalidates them."""
+    response = client.get("/photos/", headers=auth_headers)
+    assert response.json()["total"] == 1
+
+    # Rows written behind the service's back are not seen until invalidation
+    db.add(make_photo(100))
+    db.commit()
+    response = client.get("/photos/", headers=auth_headers)
+    assert response.json()["total"] == 1
+    assert response.headers["Cache-Control"] == "private, no-cache"
+
+    client.patch(f"/photos/{test_photo.id}", json={"alt": "Changed"}, headers=admin_headers)
+
+    response = client.get("/photos/", headers=auth_headers)
+    data = response.json()
+    assert data["total"] == 2
+    assert any(p["alt"] == "Changed" for p in data["photos"])
+
+
+def test_export_photos_ndjson(client, auth_headers, db):
+    """Test streaming the filtered catalogue as NDJSON."""
+    db.add(Photographer(id=1, name="Ana", url="https://example.com/ana"))
+    db.add(Photographer(id=2, name="Bo", url="https://example.com/bo"))
+    db.add_all([make_photo(i, id=i, photographer_id=1 if i % 2 else 2) for i in range(1, 8)])
+    db.commit()
+
+    response = client.get("/photos/export?photographer=ana", headers=auth_headers)
+    assert response.status_code == status.HTTP_200_OK
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+
+    records = [json.loads(line) for line in response.text.splitlines()]
+    assert [r["id"] for r in records] == [1, 3, 5, 7]
+    assert records[0]["photographer"] == "Ana"
+    assert "created_at" in records[0]
+
+
+def test_export_photos_csv_matches_ingest_layout(client, auth_headers, db, test_photographer):
+    """Test that the CSV export uses the photos.csv header and can be re-ingested."""
+    db.add_all([make_photo(i, id=i) for i in range(1, 4)])
+    db.commit()
+
+    response = client.get("/photos/export?format=csv", headers=auth_headers)
+    assert response.status_code == status.HTTP_200_OK
+    assert response.headers["content-type"].startswith("text/csv")
+
+    rows = list(csv.DictReader(io.StringIO(response.text)))
+    with open(Path(__file__).parent.parent / "photos.csv", encoding="utf-8") as f:
+        assert list(rows[0]) == next(csv.reader(f))
+    assert [int(r["id"]) for r in rows] == [1, 2, 3]
+
+
+def test_export_requires_authentication(client):
+    """Test that exports are not public."""
+    response = client.get("/photos/export")
+    assert response.status_code == status.HTTP_403_FORBIDDEN
+
+
+def test_get_photos_batch(client, auth_headers, db, test_photographer):
+    """Test that a batch lookup returns results in request order with not-found markers."""
+    db.add_all([make_photo(i, id=i) for i in range(1, 4)])
+    db.commit()
+
+    response = client.get("/photos/batch?ids=3,99,1,3", headers=auth_headers)
+    assert response.status_code == status.HTTP_200_OK
+    results = response.json()["results"]
+    assert [r["id"] for r in results] == [3, 99, 1, 3]
+    assert [r["found"] for r in results] == [True, False, True, True]
+    assert results[0]["photo"]["url"] == "https://example.com/photo3"
+    assert results[1]["photo"] is None
+
+
+def test_get_photos_batch_validation(client, auth_headers, monkeypatch):
+    """Test that malformed, empty and oversized id lists are rejected."""
+    assert client.get("/photos/batch?ids=1,x", headers=auth_headers).status_code == 400
+    assert client.get("/photos/batch?ids=", headers=auth_headers).status_code == 400
+
+    monkeypatch.setattr(settings, "MAX_BATCH_IDS", 2)
+    assert client.get("/photos/batch?ids=1,2,3", headers=auth_headers).status_code == 400
+
+
+def photo_payload(i, **overrides):
+    """JSON body for creating the photo make_photo(i) would build."""
+    photo = make_photo(i, **overrides)
+    columns = (c.name for c in Photo.__table__.columns)
+    return {
+        **{c: getattr(photo, c) for c in columns if getattr(photo, c) is not None},
+        "photographer": "Test Photographer",
+        "photographer_url": "https://example.com/photographer",
+    }
+
+
+def test_bulk_create_and_upsert(client, admin_headers, db):
+    """Test bulk creation, id conflicts and upserts."""
+    response = client.post(
+        "/photos/bulk",
+        json={"items": [photo_payload(1), photo_payload(2, id=500)]},
+        headers=admin_headers,
+    )
+    assert response.status_code == status.HTTP_200_OK
+    data = response.json()
+    assert data["applied"] and data["succeeded"] == 2
+    assert [r["status"] for r in data["results"]] == ["created", "created"]
+    assert data["results"][1]["id"] == 500
+    created_id = data["results"][0]["id"]
+    assert db.query(Photo).filter(Photo.id == created_id).one().url == "https://example.com/photo1"
+
+    # Atomic by default: the conflict on 500 blocks the new photo too
+    response = client.post(
+        "/photos/bulk",
+        json={"items": [photo_payload(3), photo_payload(4, id=500)]},
+        headers=admin_headers,
+    )
+    assert response.status_code == status.HTTP_409_CONFLICT
+    assert [r["status"] for r in response.json()["results"]] == ["skipped", "conflict"]
+    assert db.query(Photo).count() == 2
+
+    response = client.post(
+        "/photos/bulk",
+        json={
+            "items": [photo_payload(3), photo_payload(4, id=500, alt="Upserted")],
+            "on_conflict": "update",
+        },
+        headers=admin_headers,
+    )
+    assert [r["status"] for r in response.json()["results"]] == ["created", "updated"]
+    db.expire_all()
+    assert db.query(Photo).filter(Photo.id == 500).one().alt == "Upserted"
+    assert db.query(Photo).count() == 3
+
+
+def test_bulk_update_partial(client, admin_headers, db, test_photographer):
+    """Test that partial mode applies valid items and reports the rest."""
+    db.add_all([make_photo(i, id=i) for i in range(1, 3)])
+    db.commit()
+
+    response = client.patch(
+        "/photos/bulk",
+        json={
+            "items": [
+                {"id": 1, "alt": "One"},
+                {"id": 99, "alt": "Missing"},
+                {"id": 1, "alt": "Dup"},
+            ],
+            "mode": "partial",
+        },
+        headers=admin_headers,
+    )
+    assert response.status_code == status.HTTP_200_OK
+    data = response.json()
+    assert [r["status"] for r in data["results"]] == ["updated", "not_found", "duplicate"]
+    assert data["succeeded"] == 1 and data["failed"] == 2
+    db.expire_all()
+    assert db.query(Photo).filter(Photo.id == 1).one().alt == "One"
+    assert db.query(Photo).filter(Photo.id == 2).one().alt == "Test photo 2"
+
+
+def test_bulk_delete(client, admin_headers, auth_headers, db, test_photographer):
+    """Test bulk deletes, atomic failure and admin-only access."""
+    db.add_all([make_photo(i, id=i) for i in range(1, 4)])
+    db.commit()
+
+    body = {"ids": [1, 2]}
+    response = client.request("DELETE", "/photos/bulk", json=body, headers=auth_headers)
+    assert response.status_code == status.HTTP_403_FORBIDDEN
+
+    response = client.request(
+        "DELETE", "/photos/bulk", json={"ids": [1, 42]}, headers=admin_headers
+    )
+    assert response.status_code == status.HTTP_409_CONFLICT
+    assert db.query(Photo).count() == 3
+
+    response = client.request("DELETE", "/photos/bulk", json=body, headers=admin_headers)
+    assert response.status_code == status.HTTP_200_OK
+    assert [r["status"] for r in response.json()["results"]] == ["deleted", "deleted"]
+    assert [p.id for p in db.query(Photo).all()] == [3]
+
+
+def test_sparse_fieldsets(client, test_photo, auth_headers):
+    """Test that ?fields= trims list, detail and photographer responses."""
+    response = client.get("/photos/?fields=src_medium,alt", headers=auth_headers)
+    assert response.status_code == status.HTTP_200_OK
+    data = response.json()
+    assert data["total"] == 1
+    assert data["photos"] == [
+        {"id": test_photo.id, "src_medium": test_photo.src_medium, "alt": test_photo.alt}
+    ]
+
+    response = client.get(f"/photos/{test_photo.id}?fields=width,height", headers=auth_headers)
+    assert response.json() == {"id": test_photo.id, "width": 1920, "height": 1080}
+    etag = response.headers["etag"]
+    response = client.get(
+        f"/photos/{test_photo.id}?fields=width",
+        headers={**auth_headers, "If-None-Match": etag},
+    )
+    assert response.status_code == status.HTTP_304_NOT_MODIFIED
+
+    response = client.get(
+        f"/photos/photographer/{test_photo.photographer_id}?fields=photographer",
+        headers=auth_headers,
+    )
+    assert response.json()["photos"] == [
+        {"id": test_photo.id, "photographer": test_photo.photographer}
+    ]
+
+    # Full responses are cached separately from projected ones
+    assert "url" in client.get("/photos/", headers=auth_headers).json()["photos"][0]
+
+
+def test_sparse_fieldsets_unknown_field(client, auth_headers):
+    """Test that unknown field names are rejected."""
+    response = client.get("/photos/?fields=id,secret", headers=auth_headers)
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+    assert "secret" in response.json()["detail"]
@@ -0,0 +1,52 @@
+"""
+Tests for the rate limiting middleware.
+"""
+import pytest
+from fastapi import status
+from app.core.rate_limit import rate_limiter
+
+
+@pytest.fixture
+def low_limit(monkeypatch):
+    """Lower the rate limit to 3 requests per minute."""
+    monkeypatch.setattr(rate_limiter, "limit", 3)
+
+
+def test_rate_limit_headers(client, auth_headers):
+    """Test that responses advertise the remaining quota."""
+    response = client.get("/photos/", headers=auth_headers)
+    assert response.status_code == status.HTTP_200_OK
+    assert response.headers["RateLimit-Limit"] == str(rate_limiter.limit)
+    remaining = int(response.headers["RateLimit-Remaining"])
+
+    response = client.get("/photos/", headers=auth_headers)
+    assert int(response.headers["RateLimit-Remaining"]) == remaining - 1
+
+
+def test_rate_limit_exceeded(client, auth_headers, low_limit):
+    """Test that requests over the limit get 429 with Retry-After."""
+    for _ in range(3):
+        response = client.get("/photos/", headers=auth_headers)
+        assert response.status_code == status.HTTP_200_OK
+
+    response = client.get("/photos/", headers=auth_headers)
+    assert response.status_code == status.HTTP_429_TOO_MANY_REQUESTS
+    assert int(response.headers["Retry-After"]) >= 1
+    assert response.headers["RateLimit-Remaining"] == "0"
+
+
+def test_rate_limit_is_per_user(client, auth_headers, admin_headers, low_limit):
+    """Test that each user has their own bucket."""
+    for _ in range(4):
+        client.get("/photos/", headers=auth_headers)
+
+    response = client.get("/photos/", headers=admin_headers)
+    assert response.status_code == status.HTTP_200_OK
+
+
+def test_health_is_not_rate_limited(client, low_limit):
+    """Test that health checks are exempt."""
+    for _ in range(5):
+        response = client.get("/health/")
+        assert response.status_code == status.HTTP_200_OK
+        assert "RateLimit-Limit" not in response.headers
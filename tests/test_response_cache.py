@@ -0,0 +1,66 @@
+"""
+Tests for the read-through response cache.
+"""
+import threading
+import time
+from app.core.response_cache import CachedResponse, ResponseCache
+
+
+def make_response(body: bytes = b"{}") -> CachedResponse:
+    return CachedResponse(body=body, etag='"tag"')
+
+
+def test_concurrent_misses_compute_once():
+    """Test that concurrent requests for one key share a single computation."""
+    cache = ResponseCache(maxsize=16, ttl=60)
+    calls = []
+
+    def compute():
+        calls.append(1)
+        time.sleep(0.1)
+        return make_response()
+
+    threads = [
+        threading.Thread(target=cache.get_or_compute, args=("key", compute)) for _ in range(8)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(calls) == 1
+    stats = cache.stats()
+    assert stats["misses"] == 1
+    assert stats["local_hits"] + stats["coalesced"] == 7
+
+
+def test_invalidate_bumps_generation():
+    """Test that invalidation makes existing entries unreachable."""
+    cache = ResponseCache(maxsize=16, ttl=60)
+    cache.get_or_compute("key", lambda: make_response(b"old"))
+
+    cache.invalidate()
+    value = cache.get_or_compute("key", lambda: make_response(b"new"))
+
+    assert value.body == b"new"
+    assert cache.stats()["generation"] == 1
+
+
+def test_stats_report_memory_and_hit_ratio():
+    """Test that stats include the bytes held and the hit ratio."""
+    cache = ResponseCache(maxsize=16, ttl=60)
+    cache.get_or_compute("key", lambda: make_response(b"x" * 100))
+    cache.get_or_compute("key", lambda: make_response(b"unused"))
+
+    stats = cache.stats()
+    assert stats["entries"] == 1
+    assert stats["bytes"] >= 100
+    assert stats["hit_ratio"] == 0.5
+
+
+def test_disabled_cache_always_computes():
+    """Test that a zero-sized cache passes straight through."""
+    cache = ResponseCache(maxsize=0, ttl=60)
+    cache.get_or_compute("key", lambda: make_response(b"a"))
+    value = cache.get_or_compute("key", lambda: make_response(b"b"))
+    assert value.body == b"b"